@@ -6,49 +6,211 @@ These endpoints provide advanced resume optimization features:
 - Bullet point ranking by relevance
 - Accuracy verification of tailored content
 """
+from contextlib import aclosing
 from fastapi import APIRouter, HTTPException, status, Depends
-from app.models.resume import TailorRequest, ResumeData
-from app.services.ai_settings_service import ai_settings_service
-from app.services.ai_service_factory import AIServiceFactory
+from app.models.resume import (
+    TailorRequest,
+    ResumeData,
+    RankBulletsRequest,
+    BatchATSScoreRequest,
+    VerifyAccuracyRequest,
+    AccuracyReport
+)
+from app.api.deps import (
+    get_ai_service_for_user,
+    llm_cache_bypass,
+    tailoring_response
+)
+from app.core.config import settings
+from app.core.deadline import Deadline, batch_request_deadline
+from app.core.process_pool import cpu_pool
+from app.core.sse import sse_response
+from app.services import cpu_tasks
+from app.services.batch_tailoring import batch_tailoring_service
+from app.services.ats_batch import batch_ats_scorer
+from app.services.tailoring_service import SECTIONS
 from app.core.auth_middleware import get_current_user
 from typing import Dict, Any, List
 import asyncio
+import json
 
 router = APIRouter()
 
 
+def validate_batch(requests: List[TailorRequest]) -> None:
+    if not requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one job description is required"
+        )
+    if len(requests) > settings.BATCH_TAILOR_MAX_JDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {settings.BATCH_TAILOR_MAX_JDS} job descriptions allowed for batch processing"
+        )
+
+
 @router.post("/ai/batch-tailor")
 async def batch_tailor(
     requests: List[TailorRequest],
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(batch_request_deadline)
 ):
     """
     Tailor resume for multiple job descriptions in parallel.
 
-    Accepts up to 5 job descriptions and tailors the resume for each
-    simultaneously using asyncio.gather().
+    Accepts up to BATCH_TAILOR_MAX_JDS job descriptions. All sections of
+    all jobs share the user's provider slots (AI_MAX_INFLIGHT_PER_KEY), so
+    the batch runs as fast as the provider allows rather than one
+    tailor-resume at a time. Duplicate job descriptions are tailored once.
+
+    Returns one tailor-resume response per request, in request order.
+    """
+    validate_batch(requests)
+
+    try:
+        ai_service = await get_ai_service_for_user(current_user["user_id"], bypass_cache)
+        results = await batch_tailoring_service.tailor_all(ai_service, requests, deadline)
+        # Diff and verification are local CPU work: keep them off the event loop
+        return {
+            "results": await asyncio.gather(*(
+                asyncio.to_thread(tailoring_response, result, request.profileData, request.jobDescription)
+                for request, result in zip(requests, results)
+            ))
+        }
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post("/ai/batch-tailor/stream")
+async def batch_tailor_stream(
+    requests: List[TailorRequest],
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(batch_request_deadline)
+):
+    """
+    Streaming variant of /ai/batch-tailor (Server-Sent Events).
+
+    Reports progress per section and sends each job's result as soon as
+    its last section is done:
 
-    TODO: Implement batch processing:
-    1. Validate max 5 requests
-    2. Get AI service for user
-    3. Run tailor_resume for each JD in parallel
-    4. Return list of tailored resumes
+        data: {"type": "progress", "indices": [0], "section": "skills", "status": "tailored", "completedSections": 3, "totalSections": 5, "completedJobs": 0, "totalJobs": 12}
+        data: {"type": "result", "index": 0, "tailoredResume": {...}, ...}
+        data: {"type": "done", "completedJobs": 12, "totalJobs": 12}
+        data: {"type": "error", "message": "..."}
+
+    `indices` lists every request position a job answers (identical job
+    descriptions are tailored once); a "result" event is sent for each.
     """
-    if len(requests) > 5:
+    validate_batch(requests)
+    ai_service = await get_ai_service_for_user(current_user["user_id"], bypass_cache)
+
+    async def events():
+        try:
+            completed_jobs = total_jobs = 0
+            async with aclosing(batch_tailoring_service.iter_progress(ai_service, requests, deadline)) as progresses:
+                async for progress in progresses:
+                    completed_jobs, total_jobs = progress.completed_jobs, progress.total_jobs
+                    yield {
+                        "type": "progress",
+                        "indices": progress.indices,
+                        "section": progress.outcome.section,
+                        "status": progress.outcome.status,
+                        "completedSections": progress.completed_sections,
+                        "totalSections": len(SECTIONS),
+                        "completedJobs": progress.completed_jobs,
+                        "totalJobs": progress.total_jobs
+                    }
+                    if progress.result is not None:
+                        for index in progress.indices:
+                            request = requests[index]
+                            yield {
+                                "type": "result",
+                                "index": index,
+                                **await asyncio.to_thread(
+                                    tailoring_response, progress.result, request.profileData, request.jobDescription
+                                )
+                            }
+            yield {"type": "done", "completedJobs": completed_jobs, "totalJobs": total_jobs}
+        except Exception as e:
+            yield {"type": "error", "message": str(e)}
+
+    return sse_response(events())
+
+
+@router.post("/ai/ats-score/batch")
+async def batch_ats_score(
+    request: BatchATSScoreRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user)
+):
+    """
+    Heuristic ATS scores for many pairs, streamed (Server-Sent Events).
+
+    Send either `resumes` with one `jobDescription` (screening), or one
+    `resume` with `jobDescriptions` (triage). Scores match /ai/ats-score;
+    each pair reports its top missing keywords:
+
+        data: {"type": "scores", "results": [{"resumeIndex": 0, "jobIndex": 0, "score": 82, "breakdown": {...}, "missingKeywords": [...]}, ...]}
+        data: {"type": "done", "pairs": 1200}
+        data: {"type": "error", "message": "..."}
+    """
+    if request.jobDescription is not None and request.resumes and request.resume is None and not request.jobDescriptions:
+        resumes, job_descriptions = request.resumes, [request.jobDescription]
+    elif request.resume is not None and request.jobDescriptions and request.jobDescription is None and not request.resumes:
+        resumes, job_descriptions = [request.resume], request.jobDescriptions
+    else:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Maximum 5 job descriptions allowed for batch processing"
+            detail="Send either resumes with one jobDescription, or one resume with jobDescriptions"
         )
 
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Batch tailoring not yet implemented."
-    )
+    pairs = len(resumes) * len(job_descriptions)
+    if pairs > settings.ATS_BATCH_MAX_PAIRS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {settings.ATS_BATCH_MAX_PAIRS} pairs allowed per batch"
+        )
+
+    async def events():
+        # Every chunk is submitted up front so the CPU pool scores them in
+        # parallel; results are still sent in chunk order
+        pending = [
+            asyncio.ensure_future(cpu_pool.run(
+                cpu_tasks.ats_score_batch,
+                cpu_tasks.ATSBatchChunk(
+                    resumes=chunk_resumes,
+                    jobDescriptions=chunk_jobs,
+                    resumeOffset=resume_offset,
+                    jobOffset=job_offset
+                ).model_dump_json().encode(),
+                # Chunk cost is pairs scored, not bytes: never on the event loop
+                inline=False
+            ))
+            for chunk_resumes, chunk_jobs, resume_offset, job_offset
+            in batch_ats_scorer.chunks(resumes, job_descriptions, settings.ATS_BATCH_CHUNK_SIZE)
+        ]
+        try:
+            for future in pending:
+                yield {"type": "scores", "results": json.loads(await future)}
+            yield {"type": "done", "pairs": pairs}
+        except Exception as e:
+            yield {"type": "error", "message": str(e)}
+        finally:
+            for future in pending:
+                future.cancel()
+
+    return sse_response(events())
 
 
 @router.post("/ai/rank-bullets")
 async def rank_bullets(
-    data: dict,
+    request: RankBulletsRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
@@ -57,34 +219,34 @@ async def rank_bullets(
     Returns bullets sorted by relevance score, allowing the user to
     select the most impactful ones for a specific application.
 
-    TODO: Implement bullet ranking:
-    1. Extract all bullets from experience
-    2. Score each bullet against the job description
-    3. Return sorted list with relevance scores
+    Scoring is local BM25 over the profile's experience and project
+    bullets (no AI provider call), fast enough to re-rank on every JD edit;
+    very large profiles are ranked in the CPU pool. Each bullet lists the
+    JD terms it matched.
     """
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Bullet ranking not yet implemented."
-    )
+    if request.limit is not None and request.limit < 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="limit must be a positive integer"
+        )
 
+    ranked = await cpu_pool.run(cpu_tasks.rank_bullets, request.model_dump_json().encode())
+    return {"bullets": json.loads(ranked)}
 
-@router.post("/ai/verify-accuracy")
+
+@router.post("/ai/verify-accuracy", response_model=AccuracyReport)
 async def verify_accuracy(
-    data: dict,
+    request: VerifyAccuracyRequest,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
     Verify tailored resume for fabricated facts (hallucination detection).
 
-    Compares tailored resume against original to flag any content
-    that was invented rather than derived from the original.
-
-    TODO: Implement hallucination detection:
-    1. Compare original vs tailored for each field
-    2. Flag content that doesn't derive from original
-    3. Return list of potential fabrications with confidence scores
+    Compares the tailored resume against the original and flags numbers,
+    dates, employers, roles, technologies, degrees and certifications that
+    the original doesn't contain, each with the field path and character
+    span where it appears. Local checks only (no AI provider call); every
+    tailoring response already includes this report as `accuracy`.
     """
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Accuracy verification not yet implemented."
-    )
+    report = await cpu_pool.run(cpu_tasks.verify_accuracy, request.model_dump_json().encode())
+    return AccuracyReport.model_validate_json(report)
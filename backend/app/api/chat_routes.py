@@ -5,12 +5,19 @@ Provides a Server-Sent Events (SSE) streaming endpoint for the in-app
 chat assistant. The chat is context-aware — it knows about the user's
 resume, job description, ATS score, and current page.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import ValidationError
 from app.models.chat import ChatRequest, ChatHistoryResponse
 from app.services.chat_service import chat_service
+from app.services.chat_history import chat_history, InvalidCursorError
+from app.services.chat_sessions import chat_sessions
+from app.api.deps import get_ai_service_for_user
 from app.core.auth_middleware import get_current_user
-from typing import Dict, Any
+from app.core.config import settings
+from app.core.json_patch import JSONPatchError
+from app.core.sse import sse_response
+from typing import Dict, Any, Optional
+from uuid import UUID
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
@@ -27,9 +34,14 @@ async def chat_completions(
     tokens as they're generated. Each event is a JSON object:
 
         data: {"type": "chunk", "content": "token"}
-        data: {"type": "done"}
+        data: {"type": "done", "usage": {"promptTokens": 812, "completionTokens": 164, "totalTokens": 976}, "contextFingerprint": "..."}
         data: {"type": "error", "message": "..."}
 
+    The context is kept per session_id: after the first message, send
+    context_fingerprint (from the last "done" event) instead of
+    context_data, plus a context_patch (JSON Patch) if the context changed.
+    409 means the server no longer has that version; resend context_data.
+
     Context (request.context_data) includes:
         - page: 'ai_build' | 'cover_letter' | 'proposal'
         - profile: User's resume data
@@ -37,48 +49,61 @@ async def chat_completions(
         - tailored_resume: Tailored resume (if available)
         - ats_score: ATS score (if available)
         - cover_letter: Generated cover letter (if available)
-
-    TODO: chat_service.stream_chat() must be implemented to yield SSE events.
     """
     user_id = current_user["user_id"]
+    if request.context_data is None and request.context_fingerprint is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Send context_data, or context_fingerprint with a session_id"
+        )
+    try:
+        session = chat_sessions.resolve(user_id, request)
+    except (JSONPatchError, ValidationError) as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Invalid context_patch: {e}")
+    if session is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Unknown chat context version; resend context_data"
+        )
 
-    return StreamingResponse(
-        chat_service.stream_chat(request, user_id),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",  # Disable Nginx buffering
-        }
-    )
+    ai_service = await get_ai_service_for_user(user_id)
+    return sse_response(chat_service.stream_chat(request, user_id, ai_service, session))
 
 
-@router.get("/history/{session_id}")
+@router.get("/history/{session_id}", response_model=ChatHistoryResponse)
 async def get_chat_history(
-    session_id: str,
+    session_id: UUID,
+    limit: int = Query(settings.CHAT_HISTORY_PAGE_SIZE, ge=1, le=settings.CHAT_HISTORY_MAX_PAGE_SIZE),
+    before: Optional[str] = None,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Retrieve chat history for a session.
+    Retrieve chat history for a session, a page at a time.
 
-    TODO: Implement chat history persistence:
-    1. Create a 'chat_history' table in Supabase
-    2. Store messages with user_id, session_id, role, content, page_context
-    3. Query and return messages for the given session_id
+    Returns the latest `limit` messages, oldest first. To load older
+    messages, pass the response's `next_cursor` as `before`; it is null
+    once the page reaches the start of the session.
     """
-    # TODO: Implement chat history retrieval
-    return {"messages": [], "session_id": session_id}
+    try:
+        return await chat_history.get_page(current_user["user_id"], session_id, limit, before)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to load chat history: {e}")
 
 
 @router.delete("/history/{session_id}")
 async def clear_chat_history(
-    session_id: str,
+    session_id: UUID,
     current_user: Dict[str, Any] = Depends(get_current_user)
 ):
     """
-    Clear chat history for a session.
-
-    TODO: Implement deletion of chat messages for this session_id
+    Clear chat history for a session, and its server-side context.
     """
-    # TODO: Implement chat history deletion
+    user_id = current_user["user_id"]
+    chat_sessions.drop(user_id, session_id)
+    try:
+        await chat_history.delete_session(user_id, session_id)
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Failed to clear chat history: {e}")
     return {"message": "Chat history cleared", "session_id": session_id}
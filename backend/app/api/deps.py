@@ -0,0 +1,91 @@
+"""
+Shared API Dependencies
+
+Helpers used by more than one router: the per-user AI service, the
+cache-bypass header check, and the response body shared by the
+tailor-resume endpoints (single, streamed and batch).
+"""
+from fastapi import HTTPException, Request, status
+from app.models.resume import ResumeData
+from app.services.ai_settings_service import ai_settings_service
+from app.services.ai_client_pool import ai_client_pool
+from app.services.llm_cache import llm_cache, CachedAIService
+from app.services.job_description import parsed_job_descriptions
+from app.services.accuracy_verifier import accuracy_verifier
+from app.services.resume_diff import diff_resumes
+from app.services.base_ai_service import BaseAIService
+from app.services.enhanced_ats_scorer import EnhancedATSScorer
+from app.services.tailoring_service import TailoringResult
+from app.core.config import settings
+from typing import Optional
+
+
+def llm_cache_bypass(request: Request) -> bool:
+    """
+    True when the client asked for a fresh generation, via
+    `X-Cache-Bypass: 1` or `Cache-Control: no-cache`.
+    """
+    if request.headers.get("X-Cache-Bypass", "").lower() in ("1", "true", "yes"):
+        return True
+    return "no-cache" in request.headers.get("Cache-Control", "").lower()
+
+
+async def get_ai_service_for_user(
+    user_id: Optional[str] = None,
+    bypass_cache: bool = False
+) -> BaseAIService:
+    """
+    Get AI service instance based on user preferences.
+
+    The pooled provider service is wrapped in CachedAIService, which
+    compacts job descriptions and serves the LLM response cache (unless
+    caching is disabled in settings).
+    """
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User authentication required for AI operations"
+        )
+
+    user_config = await ai_settings_service.get_user_settings(user_id)
+    if not user_config:
+        raise HTTPException(
+            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
+            detail="AI provider not configured. Please configure your AI settings in the Settings page."
+        )
+
+    service = await ai_client_pool.acquire(user_config)
+    cache = llm_cache if settings.LLM_CACHE_ENABLED else None
+    return CachedAIService(service, cache, bypass=bypass_cache)
+
+
+def keyword_analysis_for(profile: ResumeData, job_description: str) -> dict:
+    """Keyword coverage of the profile against the job description"""
+    scorer = EnhancedATSScorer()
+    keyword_score, missing_keywords = scorer.calculate_keyword_match(
+        profile, job_description
+    )
+    return {"matched_percentage": keyword_score, "missing_keywords": missing_keywords}
+
+
+def jd_compaction_for(job_description: str) -> Optional[dict]:
+    """Prompt-token reduction from stripping the JD's boilerplate"""
+    compaction = parsed_job_descriptions.get(job_description).compaction
+    return compaction.model_dump() if compaction is not None else None
+
+
+def tailoring_response(result: TailoringResult, profile: ResumeData, job_description: str) -> dict:
+    return {
+        "tailoredResume": result.tailored.model_dump(),
+        "changes": [
+            change.model_dump()
+            for change in diff_resumes(profile, result.tailored, parsed_job_descriptions.get(job_description))
+        ],
+        "keywordAnalysis": keyword_analysis_for(profile, job_description),
+        "accuracy": accuracy_verifier.verify(profile, result.tailored).model_dump(),
+        "jdCompaction": jd_compaction_for(job_description),
+        "sectionFingerprints": result.fingerprints,
+        "reusedSections": result.reused_sections,
+        "fallbackSections": result.fallback_sections,
+        "timedOutSections": result.timed_out_sections
+    }
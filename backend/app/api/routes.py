@@ -4,53 +4,75 @@ Core API Routes
 Handles profile CRUD and all AI feature endpoints.
 AI endpoints require authentication and a configured AI provider.
 """
+from contextlib import aclosing
 from fastapi import APIRouter, HTTPException, status, Depends
 from app.models.resume import (
     ResumeProfile,
-    ResumeData,
     TailoredResumeData,
     TailorRequest,
+    TailorResumeRequest,
     CoverLetterRequest,
     ATSScoreResponse,
+    ATSScoreBreakdown,
     ChangeDetail,
     TailoredResumeResponse
 )
 from app.services.supabase_service import supabase_service
 from app.services.ai_settings_service import ai_settings_service
-from app.services.ai_service_factory import AIServiceFactory
-from app.services.base_ai_service import BaseAIService
-from app.services.enhanced_ats_scorer import EnhancedATSScorer
+from app.services.ai_client_pool import ai_client_pool
+from app.services.llm_cache import llm_cache
+from app.services.provider_limiter import provider_limiter
+from app.services.bullet_ranker import bullet_ranker
+from app.services.job_description import parsed_job_descriptions
+from app.services.jd_compactor import compaction_stats
+from app.services.chat_sessions import chat_sessions
+from app.services.chat_history import chat_history
+from app.core.cache import to_jsonable
+from app.core.deadline import Deadline, request_deadline
+from app.core.process_pool import cpu_pool
+from app.core.sse import sse_response, stream_stats
+from app.services import cpu_tasks
+from app.services.tailoring_service import tailoring_service, section_fingerprints
+from app.services.auth_service import get_auth_service
 from app.core.auth_middleware import get_current_user
-from typing import Optional, Dict, Any, List
+from app.api.deps import (
+    get_ai_service_for_user,
+    jd_compaction_for,
+    llm_cache_bypass,
+    tailoring_response
+)
+from typing import Dict, Any, List
 import asyncio
+import json
 
 router = APIRouter()
 
 
-async def get_ai_service_for_user(user_id: Optional[str] = None) -> BaseAIService:
-    """Get AI service instance based on user preferences"""
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User authentication required for AI operations"
-        )
-
-    user_config = await ai_settings_service.get_user_settings(user_id)
-    if not user_config:
-        raise HTTPException(
-            status_code=status.HTTP_428_PRECONDITION_REQUIRED,
-            detail="AI provider not configured. Please configure your AI settings in the Settings page."
-        )
-
-    return AIServiceFactory.create_service(user_config)
-
-
 # Health check
 @router.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "resumyx-api"}
 
 
+@router.get("/metrics")
+async def metrics():
+    """In-process cache and pool counters for this worker"""
+    return {
+        "auth_token_cache": get_auth_service().token_cache.stats(),
+        "ai_settings_cache": ai_settings_service.cache_stats(),
+        "ai_client_pool": ai_client_pool.stats(),
+        "llm_cache": llm_cache.stats(),
+        "provider_limiter": provider_limiter.stats(),
+        "bullet_index_cache": bullet_ranker.cache_stats(),
+        "parsed_jd_cache": parsed_job_descriptions.stats(),
+        "jd_compaction": compaction_stats.stats(),
+        "cpu_pool": cpu_pool.stats(),
+        "sse_streams": stream_stats.stats(),
+        "chat_sessions": chat_sessions.stats(),
+        "chat_history": chat_history.stats()
+    }
+
+
 # --- Profile Endpoints ---
 
 @router.get("/profile/{user_id}")
@@ -98,7 +120,8 @@ async def delete_profile(user_id: str):
 @router.post("/ai/generate-summary")
 async def generate_summary(
     data: dict,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Generate professional summary from experience"""
     experience = data.get("experience", "")
@@ -112,26 +135,35 @@ async def generate_summary(
 
     ai_service = await get_ai_service_for_user(user_id)
     # TODO: ai_service.generate_summary() must be implemented in the AI service
-    summary = await ai_service.generate_summary(experience)
+    try:
+        summary = await deadline.run(ai_service.generate_summary(experience))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     return {"summary": summary}
 
 
 @router.post("/ai/tailor-summary")
 async def tailor_summary_endpoint(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Tailor professional summary for specific job"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        summary = await ai_service.tailor_summary(
-            request.profileData.additionalInfo,
-            request.profileData.skills,
-            request.profileData.experience,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        summary = await deadline.run(
+            ai_service.tailor_summary(
+                request.profileData.additionalInfo,
+                request.profileData.skills,
+                request.profileData.experience,
+                request.jobDescription
+            )
         )
         return {"summary": summary}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -139,17 +171,23 @@ async def tailor_summary_endpoint(
 @router.post("/ai/tailor-experience")
 async def tailor_experience_endpoint(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Tailor work experience for specific job"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        experience = await ai_service.tailor_experience(
-            request.profileData.experience,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        experience = await deadline.run(
+            ai_service.tailor_experience(
+                request.profileData.experience,
+                request.jobDescription
+            )
         )
         return {"experience": [exp.model_dump() for exp in experience]}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -157,17 +195,23 @@ async def tailor_experience_endpoint(
 @router.post("/ai/tailor-skills")
 async def tailor_skills_endpoint(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Tailor skills for specific job"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        skills = await ai_service.tailor_skills(
-            request.profileData.skills,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        skills = await deadline.run(
+            ai_service.tailor_skills(
+                request.profileData.skills,
+                request.jobDescription
+            )
         )
         return {"skills": skills}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -175,17 +219,23 @@ async def tailor_skills_endpoint(
 @router.post("/ai/tailor-projects")
 async def tailor_projects_endpoint(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Tailor projects for specific job"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        projects = await ai_service.tailor_projects(
-            request.profileData.projects,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        projects = await deadline.run(
+            ai_service.tailor_projects(
+                request.profileData.projects,
+                request.jobDescription
+            )
         )
         return {"projects": [proj.model_dump() for proj in projects]}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
@@ -193,105 +243,129 @@ async def tailor_projects_endpoint(
 @router.post("/ai/tailor-education")
 async def tailor_education_endpoint(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Tailor education for specific job"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        education = await ai_service.tailor_education(
-            request.profileData.education,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        education = await deadline.run(
+            ai_service.tailor_education(
+                request.profileData.education,
+                request.jobDescription
+            )
         )
         return {"education": [edu.model_dump() for edu in education]}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
 @router.post("/ai/tailor-resume")
 async def tailor_resume(
-    request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    request: TailorResumeRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """
     Tailor complete resume with parallel AI processing.
 
-    Runs all section tailoring agents simultaneously using asyncio.gather(),
-    then combines results into a TailoredResumeData object.
+    Runs all section tailoring agents simultaneously, then combines
+    results into a TailoredResumeData object.
+
+    Sections whose inputs are unchanged since the previous run (sent as
+    `previousResult`, or remembered server-side for this user) are reused
+    rather than regenerated. Send the returned `sectionFingerprints` with
+    `tailoredResume` as `previousResult` on the next call.
+
+    The `accuracy` report flags facts the tailored resume adds to the
+    original (see /ai/verify-accuracy).
     """
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
 
-        # PARALLEL PROCESSING: Tailor all sections simultaneously
-        results = await asyncio.gather(
-            ai_service.tailor_summary(
-                request.profileData.additionalInfo,
-                request.profileData.skills,
-                request.profileData.experience,
-                request.jobDescription
-            ),
-            ai_service.tailor_experience(
-                request.profileData.experience,
-                request.jobDescription
-            ),
-            ai_service.tailor_skills(
-                request.profileData.skills,
-                request.jobDescription
-            ),
-            ai_service.tailor_projects(
-                request.profileData.projects,
-                request.jobDescription
-            ),
-            ai_service.tailor_education(
-                request.profileData.education,
-                request.jobDescription
-            ),
-            return_exceptions=True
-        )
-
-        tailored_summary, tailored_experience, tailored_skills, tailored_projects, tailored_education = results
-
-        # Handle exceptions in individual results - fall back to original
-        if isinstance(tailored_summary, Exception):
-            tailored_summary = request.profileData.additionalInfo
-        if isinstance(tailored_experience, Exception):
-            tailored_experience = request.profileData.experience
-        if isinstance(tailored_skills, Exception):
-            tailored_skills = request.profileData.skills
-        if isinstance(tailored_projects, Exception):
-            tailored_projects = request.profileData.projects
-        if isinstance(tailored_education, Exception):
-            tailored_education = request.profileData.education
-
-        tailored_data = TailoredResumeData(
-            personalInfo=request.profileData.personalInfo,
-            summary=tailored_summary,
-            coverLetter=request.profileData.coverLetter,
-            skills=tailored_skills,
-            experience=tailored_experience if isinstance(tailored_experience, list) else request.profileData.experience,
-            education=tailored_education if isinstance(tailored_education, list) else request.profileData.education,
-            projects=tailored_projects if isinstance(tailored_projects, list) else request.profileData.projects,
-            certifications=request.profileData.certifications
+        previous = None if bypass_cache else tailoring_service.previous_for(user_id, request.previousResult)
+        result = await tailoring_service.tailor(
+            ai_service,
+            request.profileData,
+            request.jobDescription,
+            previous,
+            deadline
         )
+        tailoring_service.remember(user_id, result)
 
-        # TODO: Uncomment after implementing EnhancedATSScorer.calculate_keyword_match()
-        # scorer = EnhancedATSScorer()
-        # keyword_score, missing_keywords = scorer.calculate_keyword_match(
-        #     request.profileData, request.jobDescription
-        # )
-        keyword_analysis = {"matched_percentage": 0, "missing_keywords": []}
-
-        return {
-            "tailoredResume": tailored_data.model_dump(),
-            "changes": [],
-            "keywordAnalysis": keyword_analysis
-        }
+        # Diff and verification are local CPU work: keep them off the event loop
+        return await asyncio.to_thread(tailoring_response, result, request.profileData, request.jobDescription)
 
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/ai/tailor-resume/stream")
+async def tailor_resume_stream(
+    request: TailorResumeRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
+):
+    """
+    Streaming variant of /ai/tailor-resume (Server-Sent Events).
+
+    Each section is sent as soon as it is ready, so the first section
+    arrives after the fastest agent rather than the slowest:
+
+        data: {"type": "section", "section": "skills", "status": "tailored", "fallback": false, "content": {...}}
+        data: {"type": "done", "tailoredResume": {...}, "keywordAnalysis": {...}, ...}
+        data: {"type": "error", "message": "..."}
+
+    `status` is "tailored", "reused" (unchanged since the previous run),
+    "fallback" (the agent failed) or "timeout" (the agent exceeded its
+    share of the request deadline); the last two keep the original content.
+    """
+    user_id = current_user["user_id"]
+    ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+    previous = None if bypass_cache else tailoring_service.previous_for(user_id, request.previousResult)
+    profile = request.profileData
+    job_description = request.jobDescription
+
+    async def events():
+        try:
+            fingerprints = section_fingerprints(ai_service, profile, job_description)
+            outcomes = {}
+            sections = tailoring_service.iter_sections(
+                ai_service, profile, job_description, fingerprints, previous, deadline
+            )
+            # Closed explicitly so a client disconnect cancels the running sections
+            async with aclosing(sections):
+                async for outcome in sections:
+                    outcomes[outcome.section] = outcome
+                    yield {
+                        "type": "section",
+                        "section": outcome.section,
+                        "status": outcome.status,
+                        "fallback": outcome.status in ("fallback", "timeout"),
+                        "content": to_jsonable(outcome.content)
+                    }
+
+            result = tailoring_service.build_result(profile, fingerprints, outcomes)
+            tailoring_service.remember(user_id, result)
+            yield {
+                "type": "done",
+                **await asyncio.to_thread(tailoring_response, result, profile, job_description)
+            }
+        except Exception as e:
+            yield {"type": "error", "message": str(e)}
+
+    return sse_response(events())
+
+
 @router.post("/ai/ats-score", response_model=ATSScoreResponse)
 async def calculate_ats_score(
     request: TailorRequest,
@@ -300,11 +374,18 @@ async def calculate_ats_score(
     """
     Calculate ATS compatibility score.
 
-    TODO: Uncomment and implement after EnhancedATSScorer is implemented.
+    Heuristic scoring with EnhancedATSScorer (no AI provider call), in the
+    CPU pool for large inputs. For many resumes or many JDs at once, use
+    /ai/ats-score/batch.
     """
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="ATS scoring not yet implemented. Implement EnhancedATSScorer first."
+    result = json.loads(await cpu_pool.run(cpu_tasks.ats_score, request.model_dump_json().encode()))
+    return ATSScoreResponse(
+        score=result["score"],
+        feedback=result["feedback"],
+        breakdown=ATSScoreBreakdown(**result["breakdown"]),
+        missing_keywords=result["missing_keywords"],
+        strengths=result["strengths"],
+        improvements=result["improvements"]
     )
 
 
@@ -327,35 +408,104 @@ async def calculate_ats_score_llm(
 @router.post("/ai/generate-cover-letter")
 async def generate_cover_letter(
     request: CoverLetterRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Generate personalized cover letter"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        cover_letter = await ai_service.generate_cover_letter(
-            request.profileData,
-            request.jobDescription,
-            request.instructions or ""
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        cover_letter = await deadline.run(
+            ai_service.generate_cover_letter(
+                request.profileData,
+                request.jobDescription,
+                request.instructions or ""
+            )
         )
-        return {"coverLetter": cover_letter}
+        return {"coverLetter": cover_letter, "jdCompaction": jd_compaction_for(request.jobDescription)}
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 
+@router.post("/ai/generate-cover-letter/stream")
+async def generate_cover_letter_stream(
+    request: CoverLetterRequest,
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
+):
+    """
+    Streaming variant of /ai/generate-cover-letter (Server-Sent Events).
+
+    Tokens are sent as the provider generates them:
+
+        data: {"type": "chunk", "content": "..."}
+        data: {"type": "done", "coverLetter": "...", "usage": {...}, "jdCompaction": {...}}
+        data: {"type": "error", "message": "..."}
+
+    `coverLetter` is the cleaned body (greeting and closing removed) and
+    replaces the streamed text. Each chunk must arrive before the request
+    deadline, so a stalled provider cannot hold its limiter slot.
+    """
+    ai_service = await get_ai_service_for_user(current_user["user_id"], bypass_cache)
+    messages = ai_service.cover_letter_messages(
+        request.profileData,
+        request.jobDescription,
+        request.instructions or ""
+    )
+
+    async def events():
+        parts: List[str] = []
+        usage = None
+        try:
+            async with provider_limiter.slot(ai_service.api_key, deadline):
+                async with aclosing(ai_service.stream_completion(messages)) as stream:
+                    while True:
+                        try:
+                            chunk = await deadline.run(anext(stream))
+                        except StopAsyncIteration:
+                            break
+                        if chunk.delta:
+                            parts.append(chunk.delta)
+                            yield {"type": "chunk", "content": chunk.delta}
+                        elif chunk.usage is not None:
+                            usage = chunk.usage.model_dump()
+            yield {
+                "type": "done",
+                "coverLetter": ai_service.clean_cover_letter("".join(parts), request.profileData.personalInfo.fullName),
+                "usage": usage,
+                "jdCompaction": jd_compaction_for(request.jobDescription)
+            }
+        except asyncio.TimeoutError:
+            yield {"type": "error", "message": "AI provider did not respond before the request deadline"}
+        except Exception as e:
+            yield {"type": "error", "message": str(e)}
+
+    return sse_response(events())
+
+
 @router.post("/ai/generate-proposal")
 async def generate_proposal(
     request: TailorRequest,
-    current_user: Dict[str, Any] = Depends(get_current_user)
+    current_user: Dict[str, Any] = Depends(get_current_user),
+    bypass_cache: bool = Depends(llm_cache_bypass),
+    deadline: Deadline = Depends(request_deadline)
 ):
     """Generate freelance job proposal with suggested experience and projects"""
     try:
         user_id = current_user["user_id"]
-        ai_service = await get_ai_service_for_user(user_id)
-        result = await ai_service.generate_proposal(
-            request.profileData,
-            request.jobDescription
+        ai_service = await get_ai_service_for_user(user_id, bypass_cache)
+        result = await deadline.run(
+            ai_service.generate_proposal(
+                request.profileData,
+                request.jobDescription
+            )
         )
         return result
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="AI provider did not respond before the request deadline")
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -1,6 +1,7 @@
 """
 Authentication middleware for FastAPI.
-Validates JWT tokens and attaches user info to requests.
+Validates JWT tokens locally (see app.core.jwt_verifier) and attaches
+user info to requests.
 """
 from fastapi import Request, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -15,6 +15,78 @@ class Settings(BaseSettings):
     SUPABASE_SERVICE_KEY: str
     SUPABASE_JWT_SECRET: str
 
+    # Auth token verification
+    SUPABASE_JWKS_URL: str = ""  # Defaults to the project's /auth/v1/.well-known/jwks.json
+    JWKS_REFRESH_INTERVAL_SECONDS: int = 600
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # AI settings cache
+    AI_SETTINGS_CACHE_TTL_SECONDS: int = 300
+    AI_SETTINGS_CACHE_MAX_ENTRIES: int = 5000
+
+    # AI provider client pool
+    AI_CLIENT_POOL_MAX_SIZE: int = 256
+    AI_CLIENT_CLOSE_GRACE_SECONDS: float = 120.0
+    AI_MAX_CONNECTIONS_PER_HOST: int = 20
+    AI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    AI_HTTP_TIMEOUT_SECONDS: float = 120.0
+    AI_HTTP2_ENABLED: bool = True
+    AI_MAX_INFLIGHT_PER_KEY: int = 8  # Concurrent provider calls per API key, across requests
+
+    # LLM response cache
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 2000
+    LLM_CACHE_TTL_SECONDS: int = 86400  # Upper bound; methods may use shorter TTLs
+    LLM_CACHE_SQLITE_PATH: str = ""  # Set to a file path to keep the cache across restarts
+
+    # AI request deadlines (overridable per request with X-Request-Timeout)
+    AI_REQUEST_DEADLINE_SECONDS: float = 90.0
+    AI_REQUEST_DEADLINE_MAX_SECONDS: float = 300.0
+
+    # Incremental tailoring (last result kept per user)
+    TAILORING_SNAPSHOT_MAX_ENTRIES: int = 5000
+    TAILORING_SNAPSHOT_TTL_SECONDS: int = 21600
+
+    # Batch tailoring
+    BATCH_TAILOR_MAX_JDS: int = 30
+    BATCH_TAILOR_DEADLINE_SECONDS: float = 240.0
+
+    # Bullet ranking (BM25 index per profile)
+    BULLET_INDEX_CACHE_MAX_ENTRIES: int = 1000
+    BULLET_INDEX_CACHE_TTL_SECONDS: int = 3600
+
+    # Parsed job descriptions (per JD hash, shared by all endpoints)
+    JD_COMPACTION_ENABLED: bool = True  # Strip EEO/benefits/company boilerplate before prompts
+    PARSED_JD_CACHE_MAX_ENTRIES: int = 500
+    PARSED_JD_CACHE_TTL_SECONDS: int = 3600
+
+    # Batch ATS scoring
+    ATS_BATCH_MAX_PAIRS: int = 5000
+    ATS_BATCH_CHUNK_SIZE: int = 250  # Pairs per streamed event
+
+    # CPU process pool (ATS scoring, bullet ranking, accuracy verification)
+    CPU_POOL_ENABLED: bool = True
+    CPU_POOL_WORKERS: int = 0  # 0 = one per CPU core; divide by uvicorn workers when running several
+    CPU_POOL_INLINE_MAX_BYTES: int = 32768  # Smaller payloads are processed on the event loop
+
+    # Server-Sent Events
+    SSE_COALESCE_MS: int = 20  # Token chunks are merged into one event for up to this long...
+    SSE_COALESCE_BYTES: int = 256  # ...or until this much text is buffered
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # Comment line sent when a stream is otherwise idle
+    SSE_RETRY_MS: int = 3000  # Client reconnection delay
+
+    # Chat sessions (context kept server-side per session_id)
+    CHAT_SESSION_MAX_ENTRIES: int = 5000
+    CHAT_SESSION_TTL_SECONDS: int = 7200
+
+    # Chat history (write-behind batches to the chat_history table)
+    CHAT_HISTORY_BATCH_SIZE: int = 200
+    CHAT_HISTORY_FLUSH_SECONDS: float = 1.0
+    CHAT_HISTORY_MAX_BUFFER: int = 10000  # Oldest unsaved messages are dropped beyond this
+    CHAT_HISTORY_PAGE_SIZE: int = 50
+    CHAT_HISTORY_MAX_PAGE_SIZE: int = 200
+
     # CORS
     CORS_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
 
@@ -22,6 +94,12 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def jwks_url(self) -> str:
+        if self.SUPABASE_JWKS_URL:
+            return self.SUPABASE_JWKS_URL
+        return f"{self.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,85 @@
+"""
+Request deadlines for AI calls.
+
+Each AI request gets an absolute deadline, taken from the
+`X-Request-Timeout` header (seconds) or AI_REQUEST_DEADLINE_SECONDS. Calls
+made through `Deadline.run` are cancelled when their budget runs out, and
+the time left is published in a context variable so provider code can
+pass it on as an HTTP timeout (see BaseAIService._request_timeout).
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Awaitable, Optional, TypeVar
+
+from fastapi import Request
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# Absolute time.monotonic() deadline of the AI call running in this context
+_current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left for the AI call running in this context, or `default`"""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    return max(0.0, deadline - time.monotonic())
+
+
+class Deadline:
+    """An absolute deadline shared by all AI calls of one request"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    async def run(self, awaitable: Awaitable[T], budget: Optional[float] = None) -> T:
+        """
+        Await `awaitable` within `budget` seconds (never past the deadline).
+
+        Raises:
+            asyncio.TimeoutError: If the budget runs out; the call is cancelled
+        """
+        timeout = self.remaining() if budget is None else min(budget, self.remaining())
+        if timeout <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise asyncio.TimeoutError()
+
+        async def scoped() -> T:
+            _current_deadline.set(time.monotonic() + timeout)
+            return await awaitable
+
+        # scoped() runs in its own task (and context) so the context variable
+        # only applies to this call; from Python 3.12 wait_for would await a
+        # bare coroutine in the caller's task
+        return await asyncio.wait_for(asyncio.create_task(scoped()), timeout)
+
+
+def deadline_from_request(request: Request, default: float) -> Deadline:
+    """Deadline from the `X-Request-Timeout` header, else `default` seconds"""
+    seconds = default
+    header = request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            seconds = float(header)
+        except ValueError:
+            pass
+    seconds = min(max(seconds, 1.0), settings.AI_REQUEST_DEADLINE_MAX_SECONDS)
+    return Deadline(seconds)
+
+
+def request_deadline(request: Request) -> Deadline:
+    """FastAPI dependency: the deadline for this request's AI calls"""
+    return deadline_from_request(request, settings.AI_REQUEST_DEADLINE_SECONDS)
+
+
+def batch_request_deadline(request: Request) -> Deadline:
+    """FastAPI dependency: the deadline for a batch request, which runs many AI calls"""
+    return deadline_from_request(request, settings.BATCH_TAILOR_DEADLINE_SECONDS)
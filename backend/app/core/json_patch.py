@@ -0,0 +1,161 @@
+"""
+JSON Patch (RFC 6902) for plain JSON data.
+
+Used where clients send a delta of a document the server already holds
+(see app.services.chat_sessions). All six operations are supported, with
+JSON Pointer (RFC 6901) paths.
+
+Patching never mutates its input: each operation copies only the
+containers along its path and shares everything else with the previous
+version, so a small delta to a large document costs O(depth), not a deep
+copy. A failing operation raises JSONPatchError and leaves the input as it
+was.
+"""
+from typing import Any, Callable, Dict, List, Union
+
+Container = Union[Dict[str, Any], List[Any]]
+
+
+class JSONPatchError(ValueError):
+    """The patch is malformed or does not apply to the document"""
+
+
+def parse_pointer(pointer: str) -> List[str]:
+    """Reference tokens of a JSON Pointer ("" is the whole document)"""
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith("/")):
+        raise JSONPatchError(f"Invalid JSON pointer: {pointer!r}")
+    if not pointer:
+        return []
+    return [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+
+
+def _index(array: List[Any], token: str, insert: bool = False) -> int:
+    if insert and token == "-":
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JSONPatchError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(array) or (index == len(array) and not insert):
+        raise JSONPatchError(f"Array index out of range: {index}")
+    return index
+
+
+def _child(node: Any, token: str) -> Any:
+    if isinstance(node, dict):
+        if token not in node:
+            raise JSONPatchError(f"Member not found: {token!r}")
+        return node[token]
+    if isinstance(node, list):
+        return node[_index(node, token)]
+    raise JSONPatchError(f"Cannot reference {token!r} inside a {type(node).__name__}")
+
+
+def get_pointer(document: Any, tokens: List[str]) -> Any:
+    """Value at the location of `tokens`"""
+    for token in tokens:
+        document = _child(document, token)
+    return document
+
+
+def _update(node: Any, tokens: List[str], change: Callable[[Container, str], None]) -> Any:
+    """Copy of `node` with `change(parent, last token)` applied at the end of `tokens`"""
+    if not isinstance(node, (dict, list)):
+        raise JSONPatchError(f"Cannot reference {tokens[0]!r} inside a {type(node).__name__}")
+    copy = dict(node) if isinstance(node, dict) else list(node)
+    if len(tokens) == 1:
+        change(copy, tokens[0])
+    elif isinstance(copy, dict):
+        copy[tokens[0]] = _update(_child(node, tokens[0]), tokens[1:], change)
+    else:
+        index = _index(copy, tokens[0])
+        copy[index] = _update(copy[index], tokens[1:], change)
+    return copy
+
+
+def _add(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def add(parent: Container, token: str) -> None:
+        if isinstance(parent, dict):
+            parent[token] = value
+        else:
+            parent.insert(_index(parent, token, insert=True), value)
+
+    return _update(document, tokens, add)
+
+
+def _remove(document: Any, tokens: List[str]) -> Any:
+    if not tokens:
+        raise JSONPatchError("Cannot remove the whole document")
+
+    def remove(parent: Container, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JSONPatchError(f"Member not found: {token!r}")
+            del parent[token]
+        else:
+            del parent[_index(parent, token)]
+
+    return _update(document, tokens, remove)
+
+
+def _replace(document: Any, tokens: List[str], value: Any) -> Any:
+    if not tokens:
+        return value
+
+    def replace(parent: Container, token: str) -> None:
+        if isinstance(parent, dict):
+            if token not in parent:
+                raise JSONPatchError(f"Member not found: {token!r}")
+            parent[token] = value
+        else:
+            parent[_index(parent, token)] = value
+
+    return _update(document, tokens, replace)
+
+
+def apply_patch(document: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    Apply a JSON Patch, returning the new document.
+
+    Args:
+        document: JSON data (dicts, lists, scalars); not modified
+        patch: RFC 6902 operations, e.g. {"op": "replace", "path": "/a/0", "value": 1}
+
+    Raises:
+        JSONPatchError: Malformed operation, missing location, or failed "test"
+    """
+    if not isinstance(patch, list):
+        raise JSONPatchError("A patch must be a list of operations")
+    for operation in patch:
+        if not isinstance(operation, dict) or "path" not in operation:
+            raise JSONPatchError(f"Invalid patch operation: {operation!r}")
+        op = operation.get("op")
+        tokens = parse_pointer(operation["path"])
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise JSONPatchError(f"'{op}' requires a value")
+        if op in ("move", "copy") and "from" not in operation:
+            raise JSONPatchError(f"'{op}' requires 'from'")
+
+        if op == "add":
+            document = _add(document, tokens, operation["value"])
+        elif op == "remove":
+            document = _remove(document, tokens)
+        elif op == "replace":
+            document = _replace(document, tokens, operation["value"])
+        elif op == "move":
+            source = parse_pointer(operation["from"])
+            if tokens[:len(source)] == source and len(tokens) > len(source):
+                raise JSONPatchError("Cannot move a value into one of its children")
+            value = get_pointer(document, source)
+            document = _add(_remove(document, source), tokens, value)
+        elif op == "copy":
+            # Values are never modified in place, so the copy can share them
+            document = _add(document, tokens, get_pointer(document, parse_pointer(operation["from"])))
+        elif op == "test":
+            if get_pointer(document, tokens) != operation["value"]:
+                raise JSONPatchError(f"Test failed at {operation['path']!r}")
+        else:
+            raise JSONPatchError(f"Unknown patch operation: {op!r}")
+    return document
@@ -0,0 +1,146 @@
+"""
+Local JWT verification for Supabase access tokens.
+
+Supabase signs access tokens either with the project's JWT secret (HS256)
+or with asymmetric signing keys (ES256/RS256) that are published as a JWKS
+document. Both are verified in-process, so authenticated requests no longer
+wait on a round trip to Supabase Auth. Signatures are always checked.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+import httpx
+import jwt
+from app.core.config import settings
+
+SYMMETRIC_ALGORITHMS = {"HS256"}
+ASYMMETRIC_ALGORITHMS = {"ES256", "RS256"}
+
+
+class JWKSCache:
+    """
+    In-memory cache of the project's JSON Web Key Set.
+
+    The key set is fetched once and kept in memory. Unknown key IDs and stale
+    key sets trigger a refresh on a background thread, rate limited so that
+    tokens with made-up `kid` values can't be used to hammer the JWKS endpoint.
+    """
+
+    def __init__(self, jwks_url: str, refresh_interval: float, min_refresh_interval: float = 30.0):
+        self.jwks_url = jwks_url
+        self.refresh_interval = refresh_interval
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, jwt.PyJWK] = {}
+        self._fetched_at = 0.0
+        self._last_attempt = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get_key(self, kid: Optional[str]) -> Optional[jwt.PyJWK]:
+        """
+        Return the signing key for `kid`, scheduling a refresh if it is unknown.
+
+        Never fetches inline: this runs on the event loop. Until a key set has
+        been loaded (e.g. the startup prefetch failed), asymmetric tokens are
+        rejected while the background refresh retries.
+        """
+        key = self._keys.get(kid) if kid else None
+        if key is None or time.monotonic() - self._fetched_at > self.refresh_interval:
+            self.refresh_in_background()
+        return key
+
+    def refresh(self) -> bool:
+        """Fetch the key set synchronously. Returns True on success."""
+        with self._lock:
+            now = time.monotonic()
+            if self._refreshing or now - self._last_attempt < self.min_refresh_interval:
+                return False
+            self._refreshing = True
+            self._last_attempt = now
+
+        try:
+            response = httpx.get(self.jwks_url, timeout=5.0)
+            response.raise_for_status()
+            keys: Dict[str, jwt.PyJWK] = {}
+            for jwk in response.json().get("keys", []):
+                if jwk.get("alg") not in ASYMMETRIC_ALGORITHMS or not jwk.get("kid"):
+                    continue
+                keys[jwk["kid"]] = jwt.PyJWK(jwk)
+            # Swap the whole dict so readers never see a partially built set
+            self._keys = keys
+            self._fetched_at = time.monotonic()
+            return True
+        except Exception as e:
+            print(f"JWKS refresh failed: {e}")
+            return False
+        finally:
+            self._refreshing = False
+
+    def refresh_in_background(self) -> None:
+        """Refresh the key set on a daemon thread without blocking the caller."""
+        if self._refreshing or time.monotonic() - self._last_attempt < self.min_refresh_interval:
+            return
+        threading.Thread(target=self.refresh, name="jwks-refresh", daemon=True).start()
+
+
+class JWTVerifier:
+    """Verifies Supabase access tokens without calling Supabase Auth."""
+
+    AUDIENCE = "authenticated"
+
+    def __init__(self, jwt_secret: str, jwks: JWKSCache):
+        self.jwt_secret = jwt_secret
+        self.jwks = jwks
+
+    def verify(self, token: str) -> Dict:
+        """
+        Verify a token's signature, expiry and audience.
+
+        Args:
+            token: JWT access token
+
+        Returns:
+            Decoded token claims
+
+        Raises:
+            jwt.InvalidTokenError: If the token is malformed, expired, signed
+                with an unexpected algorithm or fails signature verification
+        """
+        header = jwt.get_unverified_header(token)
+        alg = header.get("alg")
+
+        # The key type is chosen from the algorithm, never the other way
+        # round, so an HS256 token can't be checked against a public key.
+        if alg in SYMMETRIC_ALGORITHMS:
+            if not self.jwt_secret:
+                raise jwt.InvalidTokenError("HS256 token received but no JWT secret is configured")
+            key = self.jwt_secret
+        elif alg in ASYMMETRIC_ALGORITHMS:
+            jwk = self.jwks.get_key(header.get("kid"))
+            if jwk is None:
+                raise jwt.InvalidTokenError(f"Unknown signing key: {header.get('kid')}")
+            key = jwk.key
+        else:
+            raise jwt.InvalidTokenError(f"Unsupported signing algorithm: {alg}")
+
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[alg],
+            audience=self.AUDIENCE,
+            options={"require": ["exp", "sub"]}
+        )
+
+    def prefetch(self) -> None:
+        """Load the JWKS ahead of the first request (called at startup)."""
+        self.jwks.refresh()
+
+
+jwt_verifier = JWTVerifier(
+    jwt_secret=settings.SUPABASE_JWT_SECRET,
+    jwks=JWKSCache(
+        jwks_url=settings.jwks_url,
+        refresh_interval=settings.JWKS_REFRESH_INTERVAL_SECONDS
+    )
+)
@@ -0,0 +1,136 @@
+"""
+CPU process pool for local scoring work.
+
+ATS scoring, bullet ranking and accuracy verification are pure-Python
+text processing. Run inline in an `async def` route, a large batch blocks
+the event loop that also serves SSE streams. Such work is sent to a pool
+of worker processes sized to the CPU cores, started and stopped with the
+app (see main.lifespan).
+
+Tasks are module-level functions taking and returning bytes (JSON), so what
+crosses the process boundary is one pre-serialized buffer rather than a
+pickled tree of Pydantic objects. Payloads under CPU_POOL_INLINE_MAX_BYTES
+run inline: for a single small resume the IPC round trip costs more than
+the scoring itself. Callers whose cost doesn't follow payload size opt out
+with inline=False (a batch chunk of short JDs is small but scores hundreds
+of pairs). Without a pool (disabled, or not started yet) tasks run in a
+thread, never on the event loop.
+
+Workers use the "spawn" start method: forking a process that already runs
+threads (JWKS refresh, thread pool) can deadlock the child.
+
+If a worker dies, the executor is broken for every task in flight. The
+first caller to notice replaces it and shuts the old one down; each
+failed task is retried once in a thread, off the event loop.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Optional, TypeVar
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+def _warm_worker() -> None:
+    """Runs once per worker: import the task modules and load the skill taxonomy"""
+    from app.services import cpu_tasks  # noqa: F401
+    from app.services.skill_taxonomy import skill_taxonomy
+    skill_taxonomy.skill_ids("python")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class CPUPool:
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.workers = 0
+        self.inline = 0
+        self.threaded = 0
+        self.offloaded = 0
+        self.restarts = 0
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker
+        )
+
+    async def start(self) -> None:
+        """Start the workers and wait until each has imported the task modules"""
+        if not settings.CPU_POOL_ENABLED or self._executor is not None:
+            return
+        self.workers = settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+        self._executor = self._create_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _ping) for _ in range(self.workers)
+        ))
+        print(f"CPU pool started with {self.workers} worker(s)")
+
+    async def run(self, task: Callable[[bytes], T], payload: bytes, inline: bool = True) -> T:
+        """
+        Run `task(payload)` in a worker process, inline if the payload is
+        small, or in a thread if the pool is not running.
+
+        Args:
+            task: Module-level function (picklable by reference)
+            payload: Serialized input
+            inline: Allow running small payloads on the event loop
+        """
+        if inline and len(payload) < settings.CPU_POOL_INLINE_MAX_BYTES:
+            self.inline += 1
+            return task(payload)
+        if self._executor is None:
+            self.threaded += 1
+            return await asyncio.to_thread(task, payload)
+
+        self.offloaded += 1
+        executor = self._executor
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, task, payload)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed). Retrying in a thread rather than
+            # the new pool: a payload that killed a worker may do it again
+            self._replace(executor)
+            return await asyncio.to_thread(task, payload)
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Swap a broken executor for a new one. Concurrent callers all see the
+        same broken executor; only the first replaces it. Runs on the event
+        loop without awaiting, so the check and the swap are atomic.
+        """
+        if self._executor is not broken:
+            return  # Already replaced, or the pool was shut down
+        print("CPU pool broken, restarting workers")
+        self.restarts += 1
+        self._executor = self._create_executor()
+        # Returns at once: the dead pool's processes are reaped by its manager thread
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    async def shutdown(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._executor is not None,
+            "workers": self.workers,
+            "inline": self.inline,
+            "threaded": self.threaded,
+            "offloaded": self.offloaded,
+            "restarts": self.restarts
+        }
+
+
+cpu_pool = CPUPool()
@@ -0,0 +1,203 @@
+"""
+Server-Sent Events encoding for the streaming endpoints.
+
+Endpoints yield event payloads (dicts); event_stream() turns them into
+wire frames:
+- each payload is serialized with orjson onto a single `data:` line (JSON
+  escapes newlines, so tokens containing quotes or line breaks stay
+  well-formed) and numbered with an `id:` field
+- consecutive {"type": "chunk", "content": ...} token events are merged
+  into one event for up to SSE_COALESCE_MS or SSE_COALESCE_BYTES, so a
+  stream costs one write per frame rather than one per token
+- the first frame sets the client's reconnection delay (`retry:`)
+- a `: ping` comment is sent after SSE_HEARTBEAT_SECONDS without output,
+  so proxies don't close idle streams while the model is thinking
+
+When the client disconnects, SSEResponse closes the event source at once
+rather than leaving it to garbage collection, so the provider request is
+cancelled and its connection returned to the pool (see StreamStats).
+"""
+import asyncio
+import threading
+import time
+from contextlib import suppress
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import orjson
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+HEARTBEAT = b": ping\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Disable Nginx buffering
+}
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_event(payload: Any, event_id: Optional[int] = None, retry_ms: Optional[int] = None) -> bytes:
+    """One SSE event: optional id and retry fields, then the JSON payload"""
+    frame = b""
+    if event_id is not None:
+        frame += b"id: %d\n" % event_id
+    if retry_ms is not None:
+        frame += b"retry: %d\n" % retry_ms
+    return frame + b"data: " + orjson.dumps(payload, default=_default, option=orjson.OPT_NON_STR_KEYS) + b"\n\n"
+
+
+def _is_chunk(payload: Any) -> bool:
+    return isinstance(payload, dict) and payload.get("type") == "chunk" and len(payload) == 2
+
+
+async def event_stream(events: AsyncIterator[Any]) -> AsyncIterator[bytes]:
+    """Encode `events` as SSE frames, coalescing token chunks and adding heartbeats"""
+    loop = asyncio.get_running_loop()
+    window = settings.SSE_COALESCE_MS / 1000
+    heartbeat = settings.SSE_HEARTBEAT_SECONDS
+    iterator = events.__aiter__()
+    next_id = 0
+    retry_ms: Optional[int] = settings.SSE_RETRY_MS
+
+    buffer: List[str] = []
+    buffered = 0
+    flush_at = 0.0
+    last_write = loop.time()
+    pending: Optional[asyncio.Future] = None
+
+    def encode(payload: Any) -> bytes:
+        nonlocal next_id, retry_ms
+        next_id += 1
+        frame = encode_event(payload, next_id, retry_ms)
+        retry_ms = None
+        return frame
+
+    def flush() -> bytes:
+        nonlocal buffered
+        frame = encode({"type": "chunk", "content": "".join(buffer)})
+        buffer.clear()
+        buffered = 0
+        return frame
+
+    try:
+        while True:
+            if pending is None:
+                # Awaited via wait() so a timeout doesn't cancel the source
+                pending = asyncio.ensure_future(iterator.__anext__())
+            deadline = flush_at if buffer else last_write + heartbeat
+            done, _ = await asyncio.wait({pending}, timeout=max(0.0, deadline - loop.time()))
+            if not done:
+                yield flush() if buffer else HEARTBEAT
+                last_write = loop.time()
+                continue
+
+            task, pending = pending, None
+            try:
+                payload = task.result()
+            except StopAsyncIteration:
+                break
+
+            if _is_chunk(payload):
+                if not buffer:
+                    flush_at = loop.time() + window
+                buffer.append(payload["content"])
+                buffered += len(payload["content"])
+                if buffered < settings.SSE_COALESCE_BYTES:
+                    continue
+                frame = flush()
+            else:
+                frame = (flush() if buffer else b"") + encode(payload)
+            yield frame
+            last_write = loop.time()
+
+        if buffer:
+            yield flush()
+    finally:
+        if pending is not None:
+            # Client went away mid-stream: stop the source where it is
+            pending.cancel()
+            with suppress(asyncio.CancelledError, StopAsyncIteration):
+                await pending
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
+
+
+class StreamStats:
+    """Outcomes of SSE streams on this worker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.open = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.abandoned_by_path: Dict[str, int] = {}
+
+    def opened(self) -> None:
+        with self._lock:
+            self.open += 1
+
+    def closed(self, path: str, abandoned: bool) -> None:
+        with self._lock:
+            self.open -= 1
+            if abandoned:
+                self.abandoned += 1
+                self.abandoned_by_path[path] = self.abandoned_by_path.get(path, 0) + 1
+            else:
+                self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "open": self.open,
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+            "abandoned_by_path": dict(self.abandoned_by_path)
+        }
+
+
+stream_stats = StreamStats()
+
+
+class SSEResponse(StreamingResponse):
+    """
+    StreamingResponse over event_stream() that stops the source when the
+    client disconnects.
+
+    Starlette cancels the send loop on http.disconnect, but leaves the body
+    iterator suspended; the upstream provider call would keep generating
+    (and billing) until the generator is garbage-collected. Closing it here
+    runs the sources' cleanup right away: provider streams are cancelled,
+    their connections released and provider_limiter slots freed.
+    """
+
+    def __init__(self, events: AsyncIterator[Any]):
+        super().__init__(event_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+        self.finished = False
+
+    async def stream_response(self, send: Send) -> None:
+        await super().stream_response(send)
+        self.finished = True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        stream_stats.opened()
+        started = time.perf_counter()
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self.body_iterator.aclose()
+            stream_stats.closed(scope["path"], abandoned=not self.finished)
+            if not self.finished:
+                print(f"SSE client left {scope['path']} after {time.perf_counter() - started:.1f}s; stream cancelled")
+
+
+def sse_response(events: AsyncIterator[Any]) -> SSEResponse:
+    """Response that sends `events` (payload dicts) as Server-Sent Events"""
+    return SSEResponse(events)
@@ -1,17 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.jwt_verifier import jwt_verifier
+from app.core.process_pool import cpu_pool
+from app.services.supabase_service import supabase_service
+from app.services.ai_client_pool import ai_client_pool
+from app.services.llm_cache import llm_cache
+from app.services.chat_history import chat_history
 from app.api.routes import router
 from app.api.auth import router as auth_router
 from app.api.ai_settings_routes import router as ai_settings_router
 from app.api.advanced_routes import router as advanced_router
 from app.api.chat_routes import router as chat_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the JWKS cache so the first authenticated request verifies locally
+    await asyncio.to_thread(jwt_verifier.prefetch)
+    await supabase_service.get_async_client()
+    await llm_cache.open()
+    await cpu_pool.start()
+    await chat_history.start()
+    yield
+    await chat_history.close()
+    await cpu_pool.shutdown()
+    await ai_client_pool.close_all()
+    await llm_cache.close()
+    await supabase_service.close()
+
 # Create FastAPI app
 app = FastAPI(
     title="Resumyx API",
     description="AI-powered resume builder backend",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -26,11 +26,20 @@ class ChatContext(BaseModel):
 
 
 class ChatRequest(BaseModel):
-    """Request to send a chat message"""
+    """
+    Request to send a chat message.
+
+    The first message of a session sends the full context_data; the server
+    keeps it per session_id and returns its fingerprint. Later messages
+    send context_fingerprint alone (context unchanged), or with a
+    context_patch (JSON Patch, RFC 6902) against that fingerprint.
+    """
     message: str
     page_context: str  # 'ai_build', 'cover_letter', or 'proposal'
-    context_data: ChatContext
-    session_id: Optional[str] = None
+    context_data: Optional[ChatContext] = None
+    context_fingerprint: Optional[str] = None
+    context_patch: Optional[List[Dict[str, Any]]] = None
+    session_id: Optional[UUID] = None  # Messages are saved to chat history only with a session_id
 
 
 class ChatHistoryItem(BaseModel):
@@ -47,5 +56,6 @@ class ChatHistoryItem(BaseModel):
 
 class ChatHistoryResponse(BaseModel):
     """Response containing chat history"""
-    messages: List[ChatHistoryItem]
+    messages: List[ChatHistoryItem]  # Oldest first
     session_id: UUID
+    next_cursor: Optional[str] = None  # Pass as `before` to load older messages; None at the start of the session
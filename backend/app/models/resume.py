@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 class PersonalInfo(BaseModel):
     fullName: str
@@ -78,6 +78,14 @@ class TailoredResumeData(BaseModel):
     projects: List[Project] = []
     certifications: List[str] = []
 
+class TailoringSnapshot(BaseModel):
+    """A previous tailoring result with the input fingerprint of each section"""
+    fingerprints: Dict[str, str] = {}
+    tailoredResume: TailoredResumeData
+
+class TailorResumeRequest(TailorRequest):
+    previousResult: Optional[TailoringSnapshot] = None
+
 class ATSScoreBreakdown(BaseModel):
     keyword_match: int  # 0-100
     formatting: int  # 0-100
@@ -92,15 +100,49 @@ class ATSScoreResponse(BaseModel):
     strengths: List[str] = []
     improvements: List[str] = []
 
+class WordEdit(BaseModel):
+    op: str  # equal | insert | delete
+    text: str
+
 class ChangeDetail(BaseModel):
     section: str
-    field: str
+    field: str  # Path in the tailored resume; removals use the original's path
     before: str
     after: str
     reason: str
+    wordDiff: List[WordEdit] = []  # Word-level edits from before to after, for text fields
 
 class TailoredResumeResponse(BaseModel):
     tailored: TailoredResumeData
     changes: List[ChangeDetail] = []
     keyword_analysis: dict = {}
     ats_improvement: dict = {}
+
+class RankBulletsRequest(BaseModel):
+    profileData: ResumeData
+    jobDescription: str
+    limit: Optional[int] = None  # Return only the top N bullets
+
+class BatchATSScoreRequest(BaseModel):
+    """Either `resumes` against one `jobDescription`, or one `resume` against `jobDescriptions`"""
+    jobDescription: Optional[str] = None
+    resumes: List[ResumeData] = []
+    resume: Optional[ResumeData] = None
+    jobDescriptions: List[str] = []
+
+class VerifyAccuracyRequest(BaseModel):
+    original: ResumeData
+    tailored: TailoredResumeData
+
+class AccuracyIssue(BaseModel):
+    category: str  # number | date | organization | role | technology | degree | certification
+    value: str  # The unsupported fact as written in the tailored resume
+    section: str
+    field: str  # Path within the tailored resume, e.g. "experience[0].description[2]"
+    start: Optional[int] = None  # Character span of `value` in that field
+    end: Optional[int] = None
+
+class AccuracyReport(BaseModel):
+    verified: bool  # True when no unsupported facts were found
+    issues: List[AccuracyIssue] = []
+    fieldsChecked: int = 0
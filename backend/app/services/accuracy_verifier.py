@@ -0,0 +1,304 @@
+"""
+Accuracy Verifier
+
+Local hallucination check of a tailored resume against the original, for
+/ai/verify-accuracy and the `accuracy` report of every tailoring response.
+No LLM call is involved, so it costs a few milliseconds per resume.
+
+Facts are extracted once from the original ResumeData into sets:
+- numbers and percentages ("40%", "$1.2M", "1,200"); four-digit years
+  count as dates
+- organizations (companies, institutions) and roles
+- technologies, as skill taxonomy IDs (listed skills the taxonomy
+  doesn't know must be made of terms the original uses)
+- degrees, by level (bachelor, master, ...) and by subject
+- certifications
+
+Every field of the tailored resume is then scanned with the same
+extractors. A fact that is not in the original's sets is reported with the
+field path and the character span where it appears. Company, role, degree
+and certification fields must match one of the original's, where dropping
+words is allowed ("Senior Engineer" may become "Engineer") but adding them
+is not. A degree matches on its level and subject, so "B.S. Computer
+Science" may be spelled out as "Bachelor of Science in Computer Science".
+Entry dates must equal those of the original entry with the same ID, in
+any format ("Jan 2019", "01/2019", "2019-01"). Rewording passes; new
+numbers, employers, titles, tools and degrees do not.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from app.models.resume import AccuracyIssue, AccuracyReport, ResumeData, TailoredResumeData
+from app.services.enhanced_ats_scorer import experience_years
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.text_utils import tokenize
+
+# "40%", "40 percent", "$1.2M", "2 million", "1,200", "3x", "5+"
+_NUMBER_RE = re.compile(
+    r"(?<![\w.])([$€£])?(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?"
+    r"(\s*%|\s*percent\b|\s*(?:thousand|million|billion)\b|[kmbx]\b)?(\+)?(?![\w])",
+    re.IGNORECASE
+)
+_UNITS = {"percent": "%", "thousand": "k", "million": "m", "billion": "b"}
+# A number of years of experience ("5+ years"), checked against the experience dates
+_YEARS_SUFFIX_RE = re.compile(r"\s*(?:\+\s*)?(?:years?|yrs?)\b", re.IGNORECASE)
+_YEAR_RANGE = range(1950, 2100)
+
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+# "Jan 2020", "January 2020", "01/2020", "1/15/2020", "2020-01", "2020"
+_DATE_RE = re.compile(
+    r"(?P<name>" + "|".join(_MONTHS) + r")[a-z]*\.?(?:\s+\d{1,2}(?:st|nd|rd|th)?)?,?\s+(?P<named_year>\d{4})"
+    r"|(?<![\d/.-])(?P<month>\d{1,2})[/.-](?:\d{1,2}[/.-])?(?P<year>\d{4})"
+    r"|(?P<iso_year>\d{4})[/.-](?P<iso_month>\d{1,2})(?!\d)"
+    r"|(?P<bare_year>\d{4})",
+    re.IGNORECASE
+)
+_PRESENT_RE = re.compile(r"present|current|now|today", re.IGNORECASE)
+
+# Spelled-out degree names, matched whole so their generic words ("Science"
+# in "Bachelor of Science") aren't taken for the subject
+_DEGREE_FIELDS = r"(?:\s+of\s+(?:science|arts|fine arts|engineering|technology|applied science))?"
+_DEGREE_RE = re.compile(
+    r"(?<![\w.])(?:"
+    r"(?P<phd>doctor of philosophy|ph\.?\s?d\.?|doctorate|doctoral)|"
+    r"(?P<mba>master'?s? of business administration|m\.?b\.?a\.?)|"
+    r"(?P<master>master'?s?" + _DEGREE_FIELDS + r"|m\.(?:sc?|a|eng|tech)\.?|msc|mtech)|"
+    r"(?P<bachelor>bachelor'?s?" + _DEGREE_FIELDS + r"|b\.(?:sc?|a|e|eng|tech)\.?|bsc|btech)|"
+    r"(?P<associate>associate'?s? degree)"
+    r")(?![\w])",
+    re.IGNORECASE
+)
+_DEGREE_FILLER = frozenset({"degree", "honors", "honours", "hons"})
+
+
+def _number_key(match: re.Match) -> Tuple[str, str]:
+    """(normalized value with currency and unit, bare value) of a _NUMBER_RE match"""
+    currency, digits, decimal, unit, _ = match.groups()
+    bare = digits.replace(",", "") + (decimal or "")
+    unit = (unit or "").strip().lower()
+    return (currency or "") + bare + _UNITS.get(unit, unit), bare
+
+
+def _date_key(text: str) -> Optional[Tuple[str, str]]:
+    """(month number or "", year) of a date, ("", "present"), or None"""
+    if _PRESENT_RE.search(text):
+        return "", "present"
+    match = _DATE_RE.search(text)
+    if match is None:
+        return None
+    if match.group("name"):
+        return str(_MONTHS.index(match.group("name").lower()) + 1), match.group("named_year")
+    if match.group("year"):
+        return str(int(match.group("month"))), match.group("year")
+    if match.group("iso_year"):
+        return str(int(match.group("iso_month"))), match.group("iso_year")
+    return "", match.group("bare_year")
+
+
+def _term_set(text: str) -> frozenset:
+    return frozenset(tokenize(text))
+
+
+def _degree_key(degree: str) -> Tuple[frozenset, frozenset]:
+    """(levels, subject terms) of a degree name"""
+    levels = frozenset(match.lastgroup for match in _DEGREE_RE.finditer(degree))
+    return levels, _term_set(_DEGREE_RE.sub(" ", degree)) - _DEGREE_FILLER
+
+
+@lru_cache(maxsize=1024)
+def _skill_pattern(skill_id: int) -> re.Pattern:
+    """Matches any alias of a skill as written in text (to locate its span)"""
+    aliases = sorted(skill_taxonomy.aliases(skill_id), key=len, reverse=True)
+    return re.compile(
+        r"(?<![\w+#.])(?:"
+        + "|".join(r"\s+".join(re.escape(part) for part in alias.split()) for alias in aliases)
+        + r")(?![\w+#])",
+        re.IGNORECASE
+    )
+
+
+class ResumeFacts:
+    """Fact sets of an original resume"""
+
+    def __init__(self, resume: ResumeData):
+        skills = resume.skills
+        texts = [resume.additionalInfo, resume.coverLetter, *resume.certifications]
+        texts += skills.languages + skills.databases + skills.cloud + skills.tools
+        for exp in resume.experience:
+            texts += [exp.company, exp.role, exp.location, exp.startDate, exp.endDate, *exp.description]
+        for edu in resume.education:
+            texts += [edu.institution, edu.degree, edu.location, edu.graduationDate]
+        for project in resume.projects:
+            texts += [project.name, *project.technologies, *project.description]
+        text = "\n".join(texts)
+
+        self.numbers: Set[str] = {_number_key(match)[0] for match in _NUMBER_RE.finditer(text)}
+        self.max_years = math.ceil(experience_years(resume))
+
+        self.skill_ids = skill_taxonomy.skill_ids(text)
+        self.terms = _term_set(text)
+        self.degree_levels = {match.lastgroup for match in _DEGREE_RE.finditer(text)}
+
+        self.organizations = [_term_set(exp.company) for exp in resume.experience]
+        self.organizations += [_term_set(edu.institution) for edu in resume.education]
+        self.roles = [_term_set(exp.role) for exp in resume.experience]
+        self.degrees = [_degree_key(edu.degree) for edu in resume.education]
+        self.certifications = [_term_set(cert) for cert in resume.certifications]
+        self.experience = {exp.id: exp for exp in resume.experience}
+        self.education = {edu.id: edu for edu in resume.education}
+
+
+# Field kind -> ResumeFacts attribute with the term sets it must match
+_KNOWN = {
+    "organization": "organizations",
+    "role": "roles",
+    "certification": "certifications",
+}
+
+
+def _supported(value: str, known: List[frozenset]) -> bool:
+    """True if the terms of `value` are all in one of the `known` term sets"""
+    terms = _term_set(value)
+    return not terms or any(terms <= candidate for candidate in known)
+
+
+def _degree_supported(value: str, known: List[Tuple[frozenset, frozenset]]) -> bool:
+    """True if one of the `known` degrees has the levels and subject terms of `value`"""
+    levels, subject = _degree_key(value)
+    return (not levels and not subject) or any(
+        levels <= known_levels and subject <= known_subject for known_levels, known_subject in known
+    )
+
+
+class AccuracyVerifier:
+    """Flags facts in a tailored resume that the original doesn't support"""
+
+    def verify(self, original: ResumeData, tailored: TailoredResumeData) -> AccuracyReport:
+        facts = ResumeFacts(original)
+        issues: List[AccuracyIssue] = []
+        fields = 0
+        for section, field, text, kind in self._fields(tailored):
+            fields += 1
+            if not text:
+                continue
+            if kind == "text":
+                issues += self._check_text(facts, text, section, field)
+            elif kind == "skill":
+                issues += self._check_skill(facts, text, section, field)
+            elif kind == "degree":
+                if not _degree_supported(text, facts.degrees):
+                    issues.append(self._issue(kind, text, section, field, 0, len(text)))
+            elif not _supported(text, getattr(facts, _KNOWN[kind])):
+                issues.append(self._issue(kind, text, section, field, 0, len(text)))
+
+        issues += self._check_dates(facts, tailored)
+        return AccuracyReport(verified=not issues, issues=issues, fieldsChecked=fields)
+
+    @staticmethod
+    def _fields(tailored: TailoredResumeData) -> Iterator[Tuple[str, str, str, str]]:
+        """(section, field path, text, kind) of every checked field"""
+        yield "summary", "summary", tailored.summary, "text"
+        yield "coverLetter", "coverLetter", tailored.coverLetter, "text"
+        for category in ("languages", "databases", "cloud", "tools"):
+            for position, skill in enumerate(getattr(tailored.skills, category)):
+                yield "skills", f"{category}[{position}]", skill, "skill"
+        for index, exp in enumerate(tailored.experience):
+            yield "experience", f"experience[{index}].company", exp.company, "organization"
+            yield "experience", f"experience[{index}].role", exp.role, "role"
+            for position, bullet in enumerate(exp.description):
+                yield "experience", f"experience[{index}].description[{position}]", bullet, "text"
+        for index, edu in enumerate(tailored.education):
+            yield "education", f"education[{index}].institution", edu.institution, "organization"
+            yield "education", f"education[{index}].degree", edu.degree, "degree"
+        for index, project in enumerate(tailored.projects):
+            yield "projects", f"projects[{index}].name", project.name, "text"
+            for position, technology in enumerate(project.technologies):
+                yield "projects", f"projects[{index}].technologies[{position}]", technology, "skill"
+            for position, bullet in enumerate(project.description):
+                yield "projects", f"projects[{index}].description[{position}]", bullet, "text"
+        for position, certification in enumerate(tailored.certifications):
+            yield "certifications", f"certifications[{position}]", certification, "certification"
+
+    @staticmethod
+    def _issue(
+        category: str,
+        value: str,
+        section: str,
+        field: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None
+    ) -> AccuracyIssue:
+        return AccuracyIssue(category=category, value=value, section=section, field=field, start=start, end=end)
+
+    def _check_skill(self, facts: ResumeFacts, text: str, section: str, field: str) -> List[AccuracyIssue]:
+        """A listed skill: known to the taxonomy and in the original, or made of original terms"""
+        skill_ids = skill_taxonomy.skill_ids(text)
+        if skill_ids:
+            return self._unknown_skills(facts, skill_ids, text, section, field)
+        if _term_set(text) <= facts.terms:
+            return []
+        return [self._issue("technology", text, section, field, 0, len(text))]
+
+    def _unknown_skills(
+        self,
+        facts: ResumeFacts,
+        skill_ids: FrozenSet[int],
+        text: str,
+        section: str,
+        field: str
+    ) -> List[AccuracyIssue]:
+        """Skills mentioned in `text` that the original never mentions"""
+        issues = []
+        for skill_id in sorted(skill_ids - facts.skill_ids):
+            match = _skill_pattern(skill_id).search(text)
+            if match is None:
+                issues.append(self._issue("technology", skill_taxonomy.name(skill_id), section, field))
+            else:
+                issues.append(self._issue("technology", match.group(), section, field, match.start(), match.end()))
+        return issues
+
+    def _check_text(self, facts: ResumeFacts, text: str, section: str, field: str) -> List[AccuracyIssue]:
+        """Free text: numbers, dates, technologies and degree mentions"""
+        issues = []
+        for match in _NUMBER_RE.finditer(text):
+            key, bare = _number_key(match)
+            if key in facts.numbers:
+                continue
+            if _YEARS_SUFFIX_RE.match(text, match.end()) and "." not in bare and int(bare) <= facts.max_years:
+                continue
+            category = "date" if key == bare and bare.isdigit() and int(bare) in _YEAR_RANGE else "number"
+            issues.append(self._issue(category, match.group(), section, field, match.start(), match.end()))
+
+        issues += self._unknown_skills(facts, skill_taxonomy.skill_ids(text), text, section, field)
+
+        for match in _DEGREE_RE.finditer(text):
+            if match.lastgroup not in facts.degree_levels:
+                issues.append(self._issue("degree", match.group(), section, field, match.start(), match.end()))
+        return issues
+
+    def _check_dates(self, facts: ResumeFacts, tailored: TailoredResumeData) -> List[AccuracyIssue]:
+        """Dates of entries that exist in the original must be unchanged"""
+        issues = []
+        for index, exp in enumerate(tailored.experience):
+            source = facts.experience.get(exp.id)
+            if source is None:
+                continue
+            for name in ("startDate", "endDate"):
+                value = getattr(exp, name)
+                if _date_key(value) != _date_key(getattr(source, name)):
+                    issues.append(self._issue(
+                        "date", value, "experience", f"experience[{index}].{name}", 0, len(value)
+                    ))
+        for index, edu in enumerate(tailored.education):
+            source = facts.education.get(edu.id)
+            if source is not None and _date_key(edu.graduationDate) != _date_key(source.graduationDate):
+                issues.append(self._issue(
+                    "date", edu.graduationDate, "education", f"education[{index}].graduationDate",
+                    0, len(edu.graduationDate)
+                ))
+        return issues
+
+
+accuracy_verifier = AccuracyVerifier()
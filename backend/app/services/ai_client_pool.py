@@ -0,0 +1,151 @@
+"""
+AI Provider Client Pool
+
+Keeps AI service instances (and the HTTP clients inside them) alive across
+requests so that calls to the same provider reuse keep-alive connections
+instead of paying a TLS handshake every time.
+
+Services are keyed by (provider, model, SHA-256 of the API key), so users
+never share a client that carries someone else's credentials. The pool is
+LRU-bounded; evicted services are closed after a grace period so that
+requests still using them can finish.
+"""
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import httpx
+from app.core.config import settings
+from app.models.ai_config import AIProviderConfig
+from app.services.ai_service_factory import AIServiceFactory
+from app.services.base_ai_service import BaseAIService
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Providers whose API endpoints negotiate HTTP/2. Gemini's SDK manages its
+# own gRPC channel (which is HTTP/2 already) and doesn't take an httpx client.
+HTTP_CLIENT_PROVIDERS = {"openai", "openrouter"}
+HTTP2_PROVIDERS = {"openai", "openrouter"}
+
+PoolKey = Tuple[str, str, str, str]
+
+
+class AIClientPool:
+    """LRU pool of provider service instances with shared connection pools"""
+
+    def __init__(self, maxsize: int, close_grace_seconds: float):
+        self.maxsize = maxsize
+        self.close_grace_seconds = close_grace_seconds
+        self._services: "OrderedDict[PoolKey, BaseAIService]" = OrderedDict()
+        self._pending_close: Dict[asyncio.Task, BaseAIService] = {}
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.requests = 0
+        self.responses_by_http_version: Dict[str, int] = {}
+
+    @staticmethod
+    def _key(config: AIProviderConfig) -> PoolKey:
+        key_hash = hashlib.sha256(config.api_key.encode()).hexdigest()
+        # OpenRouter attribution headers are baked into the service
+        extra = "|".join(
+            str(getattr(config, field, "") or "") for field in ("site_url", "app_name")
+        )
+        return (config.provider, config.model or "", key_hash, extra)
+
+    def _build_http_client(self, provider: str) -> httpx.AsyncClient:
+        """HTTP client for one provider host, capped at AI_MAX_CONNECTIONS_PER_HOST"""
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE and settings.AI_HTTP2_ENABLED and provider in HTTP2_PROVIDERS,
+            limits=httpx.Limits(
+                max_connections=settings.AI_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.AI_MAX_CONNECTIONS_PER_HOST,
+                keepalive_expiry=settings.AI_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(settings.AI_HTTP_TIMEOUT_SECONDS, connect=10.0),
+            event_hooks={"request": [self._on_request], "response": [self._on_response]}
+        )
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        version = response.http_version
+        self.responses_by_http_version[version] = self.responses_by_http_version.get(version, 0) + 1
+
+    async def acquire(self, config: AIProviderConfig) -> BaseAIService:
+        """Return the pooled service for this config, creating it if needed."""
+        key = self._key(config)
+        async with self._lock:
+            service = self._services.get(key)
+            if service is not None:
+                self._services.move_to_end(key)
+                self.hits += 1
+                return service
+
+            self.misses += 1
+            http_client = (
+                self._build_http_client(config.provider)
+                if config.provider in HTTP_CLIENT_PROVIDERS else None
+            )
+            service = AIServiceFactory.create_service(config, http_client=http_client)
+            self._services[key] = service
+
+            while len(self._services) > self.maxsize:
+                _, evicted = self._services.popitem(last=False)
+                self.evictions += 1
+                self._schedule_close(evicted)
+
+            return service
+
+    def _schedule_close(self, service: BaseAIService) -> None:
+        async def close_later():
+            await asyncio.sleep(self.close_grace_seconds)
+            await self._close(service)
+
+        task = asyncio.create_task(close_later())
+        self._pending_close[task] = service
+        task.add_done_callback(lambda t: self._pending_close.pop(t, None))
+
+    @staticmethod
+    async def _close(service: BaseAIService) -> None:
+        try:
+            await service.aclose()
+        except Exception as e:
+            print(f"Error closing AI client: {e}")
+
+    async def close_all(self) -> None:
+        """Close every pooled and pending-eviction client (called at shutdown)."""
+        async with self._lock:
+            services = list(self._services.values())
+            self._services.clear()
+        for task, service in list(self._pending_close.items()):
+            task.cancel()
+            services.append(service)
+        await asyncio.gather(*(self._close(service) for service in services))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._services),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "reuse_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "http_requests": self.requests,
+            "http_responses_by_version": dict(self.responses_by_http_version),
+            "http2_available": HTTP2_AVAILABLE
+        }
+
+
+ai_client_pool = AIClientPool(
+    maxsize=settings.AI_CLIENT_POOL_MAX_SIZE,
+    close_grace_seconds=settings.AI_CLIENT_CLOSE_GRACE_SECONDS
+)
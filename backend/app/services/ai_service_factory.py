@@ -1,3 +1,5 @@
+import httpx
+from typing import Optional
 from app.services.base_ai_service import BaseAIService
 from app.services.gemini_service import GeminiService
 from app.services.openai_service import OpenAIService
@@ -8,8 +10,18 @@ class AIServiceFactory:
     """Factory class to create appropriate AI service based on configuration"""
 
     @staticmethod
-    def create_service(config: AIProviderConfig) -> BaseAIService:
-        """Create and return appropriate AI service instance"""
+    def create_service(
+        config: AIProviderConfig,
+        http_client: Optional[httpx.AsyncClient] = None
+    ) -> BaseAIService:
+        """
+        Create and return appropriate AI service instance.
+
+        `http_client` is used by the HTTP-based providers (OpenAI, OpenRouter);
+        the service takes ownership of it and closes it in `aclose()`.
+        Request handlers should go through `ai_client_pool` rather than
+        calling this directly.
+        """
 
         if config.provider == "gemini":
             return GeminiService(
@@ -20,7 +32,8 @@ class AIServiceFactory:
         elif config.provider == "openai":
             return OpenAIService(
                 api_key=config.api_key,
-                model=config.model or "gpt-4o-mini"
+                model=config.model or "gpt-4o-mini",
+                http_client=http_client
             )
 
         elif config.provider == "openrouter":
@@ -29,7 +42,8 @@ class AIServiceFactory:
                 api_key=config.api_key,
                 model=config.model or "anthropic/claude-3.5-sonnet",
                 site_url=openrouter_config.site_url,
-                app_name=openrouter_config.app_name
+                app_name=openrouter_config.app_name,
+                http_client=http_client
             )
 
         else:
@@ -1,62 +1,123 @@
 from app.services.supabase_service import supabase_service
 from app.models.ai_config import AIProviderConfig, UserAISettings
-from typing import Optional
+from app.core.cache import TTLCache
+from app.core.config import settings
+from typing import Awaitable, Callable, List, Optional, Union
+from datetime import datetime
+import asyncio
 import json
 
+# Cached marker for users who have no settings row, so "not configured"
+# lookups are served from the cache as well.
+_NOT_CONFIGURED = object()
+
+InvalidationListener = Callable[[str], Union[None, Awaitable[None]]]
+
 class AISettingsService:
     """Service for managing user AI provider settings"""
 
     TABLE_NAME = "ai_settings"
 
-    async def get_user_settings(self, user_id: str) -> Optional[AIProviderConfig]:
-        """Get AI provider settings for a user"""
-        try:
-            response = supabase_service.client.table(self.TABLE_NAME).select("*").eq("user_id", user_id).execute()
+    def __init__(self):
+        # Read-through cache keyed by user_id. Writes on this worker update it
+        # directly; other workers learn about writes through invalidation listeners.
+        self._cache: TTLCache = TTLCache(
+            maxsize=settings.AI_SETTINGS_CACHE_MAX_ENTRIES,
+            ttl=settings.AI_SETTINGS_CACHE_TTL_SECONDS
+        )
+        self._invalidation_listeners: List[InvalidationListener] = []
 
-            if response.data and len(response.data) > 0:
-                settings_data = response.data[0]
-                # Parse provider_config JSON
-                provider_config = json.loads(settings_data["provider_config"])
-                return AIProviderConfig(**provider_config)
+    def add_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """
+        Register a callback run with the user_id after every settings write.
 
-            return None
+        Use it to fan invalidations out to other workers (e.g. publish on a
+        Redis channel whose subscriber calls `invalidate`). Listeners may be
+        sync or async; failures are logged and never fail the write.
+        """
+        self._invalidation_listeners.append(listener)
+
+    def invalidate(self, user_id: str) -> None:
+        """Drop the cached settings for a user (e.g. on a cross-worker notification)."""
+        self._cache.pop(user_id)
+
+    async def _notify_invalidation(self, user_id: str) -> None:
+        for listener in self._invalidation_listeners:
+            try:
+                result = listener(user_id)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"AI settings invalidation listener failed: {e}")
+
+    def cache_stats(self) -> dict:
+        return self._cache.stats()
+
+    async def get_user_settings(self, user_id: str) -> Optional[AIProviderConfig]:
+        """Get AI provider settings for a user (served from cache when fresh)"""
+        cached = self._cache.get(user_id)
+        if cached is not None:
+            return None if cached is _NOT_CONFIGURED else cached
+
+        try:
+            config = await self._fetch_user_settings(user_id)
         except Exception as e:
             print(f"Error getting user AI settings: {e}")
             return None
 
+        self._cache.set(user_id, config if config is not None else _NOT_CONFIGURED)
+        return config
+
+    async def _fetch_user_settings(self, user_id: str) -> Optional[AIProviderConfig]:
+        """Read settings straight from the database, bypassing the cache"""
+        client = await supabase_service.get_async_client()
+        response = await client.table(self.TABLE_NAME).select("provider_config").eq("user_id", user_id).execute()
+
+        if response.data and len(response.data) > 0:
+            return self._parse_provider_config(response.data[0]["provider_config"])
+
+        return None
+
+    @staticmethod
+    def _parse_provider_config(raw) -> AIProviderConfig:
+        """provider_config is native JSONB; rows written before that hold a JSON string"""
+        if isinstance(raw, str):
+            raw = json.loads(raw)
+        return AIProviderConfig(**raw)
+
     async def save_user_settings(self, user_id: str, config: AIProviderConfig) -> bool:
-        """Save AI provider settings for a user"""
+        """Save AI provider settings for a user (single atomic upsert on user_id)"""
         try:
-            # Convert config to JSON string
-            config_json = json.dumps(config.model_dump())
-
-            # Check if settings exist
-            existing = await self.get_user_settings(user_id)
-
-            if existing:
-                # Update existing
-                response = supabase_service.client.table(self.TABLE_NAME).update({
-                    "provider_config": config_json,
-                    "updated_at": "now()"
-                }).eq("user_id", user_id).execute()
-            else:
-                # Insert new
-                response = supabase_service.client.table(self.TABLE_NAME).insert({
-                    "user_id": user_id,
-                    "provider_config": config_json
-                }).execute()
+            client = await supabase_service.get_async_client()
+            response = await client.table(self.TABLE_NAME).upsert({
+                "user_id": user_id,
+                "provider_config": config.model_dump(),
+                "updated_at": datetime.utcnow().isoformat()
+            }, on_conflict="user_id").execute()
 
+            # Warm the cache with what was actually stored
+            stored = (
+                self._parse_provider_config(response.data[0]["provider_config"])
+                if response.data else config
+            )
+            self._cache.set(user_id, stored)
+            await self._notify_invalidation(user_id)
             return True
         except Exception as e:
+            self.invalidate(user_id)
             print(f"Error saving user AI settings: {e}")
             return False
 
     async def delete_user_settings(self, user_id: str) -> bool:
         """Delete AI provider settings for a user"""
         try:
-            supabase_service.client.table(self.TABLE_NAME).delete().eq("user_id", user_id).execute()
+            client = await supabase_service.get_async_client()
+            await client.table(self.TABLE_NAME).delete().eq("user_id", user_id).execute()
+            self._cache.set(user_id, _NOT_CONFIGURED)
+            await self._notify_invalidation(user_id)
             return True
         except Exception as e:
+            self.invalidate(user_id)
             print(f"Error deleting user AI settings: {e}")
             return False
 
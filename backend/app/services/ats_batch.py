@@ -0,0 +1,215 @@
+"""
+Batch ATS Scoring
+
+Scores many (resume, job description) pairs at once, in two shapes:
+- N resumes against 1 JD (recruiter-style screening)
+- 1 resume against N JDs (job-search triage)
+
+Resume features and parsed JDs are computed once each (see
+enhanced_ats_scorer.ResumeFeatures and job_description). The pairwise part
+is vectorized per block of pairs:
+- keyword presence is a sparse resume x keyword matrix from one matcher
+  scan per resume (over the union of the block's JD keywords), so keyword
+  and experience coverage for every pair is one sparse product with the
+  JD x keyword matrix
+- skills alignment is a product of resume x skill and JD x skill-weight
+  matrices over taxonomy IDs
+- years and formatting broadcast across the block
+
+Scores are identical to EnhancedATSScorer.calculate_comprehensive_score.
+"""
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+from scipy import sparse
+
+from app.models.resume import ResumeData
+from app.services.enhanced_ats_scorer import (
+    EXPERIENCE_COVERAGE_SHARE,
+    REQUIRED_SKILL_WEIGHT,
+    WEIGHTS,
+    ResumeFeatures
+)
+from app.services.job_description import ParsedJobDescription, parsed_job_descriptions
+from app.services.keyword_matcher import KeywordMatcher
+
+# Missing keywords reported per pair (the single-pair endpoint reports all)
+MISSING_KEYWORDS_PER_PAIR = 5
+
+
+def _presence_matrix(token_lists: List[List[str]], matcher: KeywordMatcher) -> sparse.csr_matrix:
+    """Binary matrix: row i marks the keywords of `matcher` found in token_lists[i]"""
+    indptr, indices = [0], []
+    for tokens in token_lists:
+        indices.extend(matcher.find(tokens))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr),
+        shape=(len(token_lists), len(matcher.keywords))
+    )
+
+
+class _JobBlock:
+    """A block of parsed JDs as matrices over the union of their keywords and skills"""
+
+    def __init__(self, jobs: List[ParsedJobDescription]):
+        self.jobs = jobs
+        if len(jobs) == 1:
+            # Reuse the JD's compiled matcher; its keyword IDs are the columns
+            self.matcher = jobs[0].matcher
+            self.job_columns = [np.arange(len(jobs[0].keywords))]
+        else:
+            columns: Dict[Tuple[str, ...], int] = {}
+            self.job_columns = [
+                np.array([columns.setdefault(keyword, len(columns)) for keyword in job.keywords], dtype=np.int64)
+                for job in jobs
+            ]
+            self.matcher = KeywordMatcher(list(columns))
+
+        rows = np.repeat(np.arange(len(jobs)), [len(cols) for cols in self.job_columns])
+        cols = np.concatenate(self.job_columns) if jobs else np.zeros(0, dtype=np.int64)
+        self.keywords = sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.float32), (rows, cols)),
+            shape=(len(jobs), len(self.matcher.keywords))
+        )
+        self.keyword_counts = np.array([len(job.keywords) for job in jobs], dtype=np.float64)
+
+        skill_columns: Dict[int, int] = {}
+        skill_rows, skill_cols, skill_weights = [], [], []
+        for row, job in enumerate(jobs):
+            for skill_id in job.skill_ids:
+                skill_rows.append(row)
+                skill_cols.append(skill_columns.setdefault(skill_id, len(skill_columns)))
+                skill_weights.append(REQUIRED_SKILL_WEIGHT if skill_id in job.required_skill_ids else 1)
+        self.skill_columns = skill_columns
+        self.skill_weights = sparse.csr_matrix(
+            (np.array(skill_weights, dtype=np.float64), (skill_rows, skill_cols)),
+            shape=(len(jobs), len(skill_columns))
+        )
+        self.skill_totals = np.asarray(self.skill_weights.sum(axis=1)).ravel()
+
+        self.min_years = np.array(
+            [job.min_years or 0 for job in jobs], dtype=np.float64
+        )
+
+
+class BatchATSScorer:
+    """Vectorized comprehensive ATS scores for many resume/JD pairs"""
+
+    def chunks(
+        self,
+        resumes: List[ResumeData],
+        job_descriptions: List[str],
+        chunk_size: int
+    ) -> Iterator[Tuple[List[ResumeData], List[str], int, int]]:
+        """
+        Split the pairs into (resumes, job_descriptions, resume_offset,
+        job_offset) chunks of about `chunk_size` pairs, chunking the side
+        that has many items so the first results arrive early.
+        """
+        if len(job_descriptions) == 1:
+            for start in range(0, len(resumes), chunk_size):
+                yield resumes[start:start + chunk_size], job_descriptions, start, 0
+        else:
+            step = max(1, chunk_size // max(1, len(resumes)))
+            for start in range(0, len(job_descriptions), step):
+                yield resumes, job_descriptions[start:start + step], 0, start
+
+    def score_chunk(
+        self,
+        resumes: List[ResumeData],
+        job_descriptions: List[str],
+        resume_offset: int = 0,
+        job_offset: int = 0
+    ) -> List[dict]:
+        """Score every pair of one chunk; indices in the results include the offsets"""
+        block = _JobBlock([parsed_job_descriptions.get(job_description) for job_description in job_descriptions])
+        features = [ResumeFeatures(resume) for resume in resumes]
+        return self._score_block(features, resume_offset, block, job_offset)
+
+    def iter_scores(
+        self,
+        resumes: List[ResumeData],
+        job_descriptions: List[str],
+        chunk_size: int
+    ) -> Iterator[List[dict]]:
+        """Yield scored pairs chunk by chunk (see chunks)"""
+        for chunk in self.chunks(resumes, job_descriptions, chunk_size):
+            yield self.score_chunk(*chunk)
+
+    @staticmethod
+    def _score_block(
+        features: List[ResumeFeatures],
+        resume_offset: int,
+        block: _JobBlock,
+        job_offset: int
+    ) -> List[dict]:
+        found_in_experience = _presence_matrix([f.experience_tokens for f in features], block.matcher)
+        found = found_in_experience.maximum(
+            _presence_matrix([f.other_tokens for f in features], block.matcher)
+        )
+
+        # resumes x jobs
+        has_keywords = block.keyword_counts > 0
+        counts = np.where(has_keywords, block.keyword_counts, 1.0)
+        matched = (found @ block.keywords.T).toarray()
+        keyword_match = np.where(has_keywords, np.rint(100 * matched / counts), 100)
+
+        coverage = np.where(has_keywords, (found_in_experience @ block.keywords.T).toarray() / counts, 1.0)
+        years = np.array([f.years for f in features], dtype=np.float64)[:, None]
+        min_years = block.min_years[None, :]
+        years_factor = np.where(min_years > 0, np.minimum(1.0, years / np.where(min_years > 0, min_years, 1.0)), 1.0)
+        experience = np.rint(100 * (
+            EXPERIENCE_COVERAGE_SHARE * coverage + (1 - EXPERIENCE_COVERAGE_SHARE) * years_factor
+        ))
+
+        skill_rows, skill_cols = [], []
+        for row, f in enumerate(features):
+            for skill_id in f.skill_ids:
+                column = block.skill_columns.get(skill_id)
+                if column is not None:
+                    skill_rows.append(row)
+                    skill_cols.append(column)
+        has_skills = sparse.csr_matrix(
+            (np.ones(len(skill_rows)), (skill_rows, skill_cols)),
+            shape=(len(features), len(block.skill_columns))
+        )
+        has_skill_totals = block.skill_totals > 0
+        skills = np.where(
+            has_skill_totals,
+            np.rint(100 * (has_skills @ block.skill_weights.T).toarray()
+                    / np.where(has_skill_totals, block.skill_totals, 1.0)),
+            100
+        )
+
+        formatting = np.array([f.formatting for f in features], dtype=np.float64)[:, None]
+        formatting = np.broadcast_to(formatting, keyword_match.shape)
+        overall = np.rint(
+            keyword_match * WEIGHTS["keyword_match"]
+            + formatting * WEIGHTS["formatting"]
+            + experience * WEIGHTS["experience_relevance"]
+            + skills * WEIGHTS["skills_alignment"]
+        )
+
+        found_dense = found.toarray().astype(bool)
+        results = []
+        for i in range(len(features)):
+            for j in range(len(block.jobs)):
+                columns = block.job_columns[j]
+                missing = columns[~found_dense[i, columns]][:MISSING_KEYWORDS_PER_PAIR]
+                results.append({
+                    "resumeIndex": resume_offset + i,
+                    "jobIndex": job_offset + j,
+                    "score": int(overall[i, j]),
+                    "breakdown": {
+                        "keyword_match": int(keyword_match[i, j]),
+                        "formatting": int(formatting[i, j]),
+                        "experience_relevance": int(experience[i, j]),
+                        "skills_alignment": int(skills[i, j]),
+                    },
+                    "missingKeywords": [" ".join(block.matcher.keywords[column]) for column in missing.tolist()]
+                })
+        return results
+
+
+batch_ats_scorer = BatchATSScorer()
@@ -2,18 +2,25 @@
 Authentication service using Supabase Auth.
 Handles user registration, login, and JWT token validation.
 """
+import hashlib
+import time
 import jwt
 from typing import Optional, Dict
-from datetime import datetime, timedelta
 from supabase import Client, create_client
 from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.jwt_verifier import jwt_verifier
 
 class AuthService:
     def __init__(self, supabase_client: Client):
         self.client = supabase_client
         # Create separate client with anon key for auth operations
         self.auth_client = create_client(settings.SUPABASE_URL, settings.SUPABASE_ANON_KEY)
-        self.jwt_secret = settings.SUPABASE_JWT_SECRET
+        # Verified claims keyed by SHA-256 of the token; entries never outlive the token's exp
+        self.token_cache: TTLCache[Dict] = TTLCache(
+            maxsize=settings.TOKEN_CACHE_MAX_ENTRIES,
+            ttl=settings.TOKEN_CACHE_TTL_SECONDS
+        )
 
     async def register(self, email: str, password: str) -> Dict:
         """
@@ -137,6 +144,7 @@ class AuthService:
         Returns:
             Success message
         """
+        self.token_cache.pop(self._token_digest(access_token))
         try:
             # Set the session for this request
             self.auth_client.auth.sign_out(access_token)
@@ -145,56 +153,49 @@ class AuthService:
             # Even if Supabase logout fails, we can still clear client-side
             return {"message": "Logged out (client-side)"}
 
+    @staticmethod
+    def _token_digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
     def verify_token(self, token: str) -> Optional[Dict]:
         """
         Verify and decode a JWT token.
 
+        The signature is checked locally (HS256 with the project JWT secret,
+        ES256/RS256 against the cached JWKS), so no request is made to
+        Supabase Auth. Verified claims are cached until the token expires,
+        so repeated requests with the same token skip verification.
+
         Args:
             token: JWT access token
 
         Returns:
             Decoded token payload with user info, or None if invalid
         """
+        digest = self._token_digest(token)
+        cached = self.token_cache.get(digest)
+        if cached is not None:
+            return cached
+
         try:
-            # First, try to verify using Supabase client (which handles ES256 tokens)
-            try:
-                user = self.supabase_client.auth.get_user(token)
-                if user and user.user:
-                    return {
-                        "user_id": user.user.id,
-                        "email": user.user.email,
-                        "role": "authenticated",
-                        "exp": None
-                    }
-            except Exception as e:
-                print(f"Supabase token verification failed, trying JWT decode: {e}")
-
-            # Fallback to JWT decode for backward compatibility
-            # Try without signature verification as a last resort for Supabase ES256 tokens
-            payload = jwt.decode(
-                token,
-                options={"verify_signature": False},
-                audience="authenticated"
-            )
-
-            # Check if token is expired
-            exp = payload.get("exp")
-            if exp and datetime.fromtimestamp(exp) < datetime.now():
-                return None
-
-            return {
-                "user_id": payload.get("sub"),  # Subject is the user ID
-                "email": payload.get("email"),
-                "role": payload.get("role"),
-                "exp": exp
-            }
+            payload = jwt_verifier.verify(token)
         except jwt.InvalidTokenError as e:
-            print(f"JWT decode error: {e}")
+            print(f"JWT verification failed: {e}")
             return None
         except Exception as e:
             print(f"Token verification error: {e}")
             return None
 
+        exp = payload.get("exp")
+        user_data = {
+            "user_id": payload.get("sub"),  # Subject is the user ID
+            "email": payload.get("email"),
+            "role": payload.get("role"),
+            "exp": exp
+        }
+        self.token_cache.set(digest, user_data, ttl=exp - time.time())
+        return user_data
+
     async def get_user(self, access_token: str) -> Dict:
         """
         Get current user info from access token.
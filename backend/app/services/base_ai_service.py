@@ -1,7 +1,27 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
+from pydantic import BaseModel
+from app.core.deadline import remaining_time
+from app.services.job_description import parsed_job_descriptions
 from app.models.resume import ResumeData, Skills, Experience, Education, Project
 
+
+class CompletionUsage(BaseModel):
+    promptTokens: int = 0
+    completionTokens: int = 0
+    totalTokens: int = 0
+
+
+class StreamChunk(BaseModel):
+    """
+    One event of stream_completion: a text delta, or (last) the finish
+    reason and token usage with an empty delta.
+    """
+    delta: str = ""
+    finishReason: Optional[str] = None
+    usage: Optional[CompletionUsage] = None
+
+
 class BaseAIService(ABC):
     """Base class for all AI service providers"""
 
@@ -9,6 +29,67 @@ class BaseAIService(ABC):
         self.api_key = api_key
         self.model = model
 
+    @property
+    def provider_name(self) -> str:
+        """Identifies the provider in cache keys and fingerprints"""
+        return type(self).__name__
+
+    async def aclose(self) -> None:
+        """Release provider clients and their connections. Override if the service holds any."""
+        pass
+
+    def _request_timeout(self, default: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds left before the current request's deadline, for use as the
+        provider call's timeout. Returns `default` outside a deadline scope.
+        """
+        return remaining_time(default)
+
+    def cover_letter_messages(
+        self,
+        profile_data: ResumeData,
+        job_description: str,
+        instructions: str = ""
+    ) -> List[Dict[str, str]]:
+        """Chat messages that ask for a cover letter body (for stream_completion)"""
+        job = parsed_job_descriptions.get(job_description)
+        experience = "\n".join(
+            f"- {exp.role} at {exp.company} ({exp.startDate} - {exp.endDate}): " + "; ".join(exp.description)
+            for exp in profile_data.experience
+        )
+        skills = profile_data.skills
+        skill_list = ", ".join(skills.languages + skills.databases + skills.cloud + skills.tools)
+        system = (
+            "You write cover letters. Reply with the body paragraphs only: no greeting, "
+            "no closing, no signature. Use only facts from the candidate's profile."
+        )
+        user = (
+            f"Candidate: {profile_data.personalInfo.fullName}\n"
+            f"Experience:\n{experience}\n"
+            f"Skills: {skill_list}\n\n"
+            f"Job description:\n{job.compact}\n\n{job.prompt_summary()}"
+        )
+        if instructions:
+            user += f"\n\nInstructions: {instructions}"
+        return [{"role": "system", "content": system}, {"role": "user", "content": user}]
+
+    @abstractmethod
+    def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Stream a chat completion as it is generated.
+
+        Implemented as an async generator. `messages` are OpenAI-style
+        {"role": "system" | "user" | "assistant", "content": ...} dicts.
+        Yields a StreamChunk per text delta, then a final chunk with the
+        finish reason and token usage.
+        """
+        pass
+
     @abstractmethod
     async def generate_summary(self, experience: str) -> str:
         """Generate professional summary from experience"""
@@ -89,26 +170,19 @@ class BaseAIService(ABC):
         """Generate freelance job proposal with suggested experience and projects"""
         pass
 
-    def _clean_cover_letter(self, content: str, candidate_name: str = "") -> str:
+    def clean_cover_letter(self, content: str, candidate_name: str = "") -> str:
         """
         AGGRESSIVELY clean cover letter to extract ONLY body paragraphs.
         Removes greetings, closings, signatures - everything except substantive content.
         """
         import re
 
-        print(f"\n{'='*60}")
-        print("DEBUG: Original AI response:")
-        print(content)
-        print(f"{'='*60}\n")
-
         # STEP 1: Split into paragraphs
         paragraphs = [p.strip() for p in content.split('\n\n') if p.strip()]
 
         if not paragraphs:
             return content
 
-        print(f"DEBUG: Found {len(paragraphs)} paragraphs")
-
         # STEP 2: Remove greeting paragraph (first paragraph with Dear/Hello/etc)
         greeting_patterns = [
             r'dear\s+', r'to\s+whom', r'hello', r'greetings', r'hi\s+'
@@ -117,7 +191,6 @@ class BaseAIService(ABC):
         if paragraphs:
             first_para_lower = paragraphs[0].lower()
             if any(re.search(pattern, first_para_lower) for pattern in greeting_patterns):
-                print(f"DEBUG: Removing greeting paragraph: {paragraphs[0][:50]}...")
                 paragraphs.pop(0)
 
         # STEP 3: Remove closing paragraphs from the END
@@ -146,7 +219,6 @@ class BaseAIService(ABC):
                 is_name = name_lower in last_para_lower or len(paragraphs[-1]) < 30
 
             if contains_closing or is_name:
-                print(f"DEBUG: Removing closing paragraph: {paragraphs[-1][:80]}...")
                 paragraphs.pop()
             else:
                 break
@@ -155,7 +227,6 @@ class BaseAIService(ABC):
         if paragraphs:
             # Check if last paragraph is suspiciously short (might be a signature line we missed)
             while paragraphs and len(paragraphs[-1]) < 50:
-                print(f"DEBUG: Removing short trailing line: {paragraphs[-1]}")
                 paragraphs.pop()
 
         # STEP 5: Rejoin and clean up
@@ -165,12 +236,6 @@ class BaseAIService(ABC):
         # Remove multiple consecutive newlines
         content = re.sub(r'\n{3,}', '\n\n', content)
 
-        print(f"\n{'='*60}")
-        print("DEBUG: Cleaned response:")
-        print(content)
-        print(f"{'='*60}\n")
-        print(f"DEBUG: Final paragraph count: {len(paragraphs)}")
-
         return content
 
     def _handle_rate_limit_error(self, error_msg: str):
@@ -0,0 +1,145 @@
+"""
+Batch Tailoring Service
+
+Runs /ai/batch-tailor: many job descriptions tailored in one request.
+
+Rather than N independent tailor runs, every (job, section) pair is one
+task in a single pool. All of them go through the per-API-key provider
+limiter (see provider_limiter), so the batch keeps the provider busy up to
+AI_MAX_INFLIGHT_PER_KEY calls at a time and a job's remaining sections
+start as soon as any slot frees up. Tasks are queued job by job, so early
+jobs finish first and progress can be reported per job.
+
+Work shared between jobs is done once:
+- the profile-side section hashes are computed once per distinct profile
+- identical (profile, job description) pairs are tailored once and the
+  result is returned for each position that asked for it
+"""
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel
+from app.core.cache import content_hash
+from app.core.deadline import Deadline
+from app.models.resume import TailorRequest
+from app.services.base_ai_service import BaseAIService
+from app.services.tailoring_service import (
+    SECTIONS,
+    SectionOutcome,
+    TailoringResult,
+    profile_section_hashes,
+    section_fingerprints,
+    tailoring_service
+)
+
+
+class BatchProgress(BaseModel):
+    """One finished section of one job in the batch"""
+    indices: List[int]  # Request positions answered by this job (duplicates share one job)
+    outcome: SectionOutcome
+    completed_sections: int  # Sections finished for this job so far
+    completed_jobs: int  # Jobs fully finished in the batch so far
+    total_jobs: int
+    result: Optional[TailoringResult] = None  # Set on the job's last section
+
+
+class _BatchJob:
+    def __init__(self, request: TailorRequest, fingerprints: Dict[str, str]):
+        self.request = request
+        self.fingerprints = fingerprints
+        self.indices: List[int] = []
+        self.outcomes: Dict[str, SectionOutcome] = {}
+
+
+class BatchTailoringService:
+    """Schedules the sections of many tailoring jobs over shared provider slots"""
+
+    @staticmethod
+    def plan(ai_service: BaseAIService, requests: List[TailorRequest]) -> List[_BatchJob]:
+        """Group requests into distinct jobs, hashing each distinct profile once"""
+        input_hashes: Dict[str, Dict[str, str]] = {}
+        jobs: Dict[str, _BatchJob] = {}
+        for index, request in enumerate(requests):
+            profile_key = content_hash(request.profileData)
+            if profile_key not in input_hashes:
+                input_hashes[profile_key] = profile_section_hashes(request.profileData)
+
+            job_key = content_hash(profile_key, request.jobDescription)
+            job = jobs.get(job_key)
+            if job is None:
+                fingerprints = section_fingerprints(
+                    ai_service, request.profileData, request.jobDescription,
+                    input_hashes[profile_key]
+                )
+                job = jobs[job_key] = _BatchJob(request, fingerprints)
+            job.indices.append(index)
+        return list(jobs.values())
+
+    async def iter_progress(
+        self,
+        ai_service: BaseAIService,
+        requests: List[TailorRequest],
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[BatchProgress]:
+        """
+        Yield each section as it finishes, with the job's TailoringResult
+        attached to its last section.
+
+        Sections wait for a provider slot before their budget starts, so a
+        long queue doesn't eat into a section's share of the deadline;
+        sections still queued when the deadline passes report "timeout".
+        Closing the iterator early cancels everything still queued or running.
+        """
+        jobs = self.plan(ai_service, requests)
+
+        async def run(job: _BatchJob, section: str):
+            outcome = await tailoring_service.run_tagged(
+                ai_service, job.request.profileData, section, job.request.jobDescription, deadline
+            )
+            return job, outcome
+
+        tasks = [
+            asyncio.create_task(run(job, section))
+            for job in jobs for section in SECTIONS
+        ]
+        completed_jobs = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                job, outcome = await next_done
+                job.outcomes[outcome.section] = outcome
+
+                result = None
+                if len(job.outcomes) == len(SECTIONS):
+                    result = tailoring_service.build_result(
+                        job.request.profileData, job.fingerprints, job.outcomes
+                    )
+                    completed_jobs += 1
+
+                yield BatchProgress(
+                    indices=job.indices,
+                    outcome=outcome,
+                    completed_sections=len(job.outcomes),
+                    completed_jobs=completed_jobs,
+                    total_jobs=len(jobs),
+                    result=result
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def tailor_all(
+        self,
+        ai_service: BaseAIService,
+        requests: List[TailorRequest],
+        deadline: Optional[Deadline] = None
+    ) -> List[TailoringResult]:
+        """Tailor every request; results are in request order"""
+        results: List[Optional[TailoringResult]] = [None] * len(requests)
+        async for progress in self.iter_progress(ai_service, requests, deadline):
+            if progress.result is not None:
+                for index in progress.indices:
+                    results[index] = progress.result
+        return results
+
+
+batch_tailoring_service = BatchTailoringService()
@@ -0,0 +1,235 @@
+"""
+Chat History
+
+Saves chat messages to the chat_history table
+(see supabase_chat_history_migration.sql).
+
+Writes are write-behind: record() appends to an in-memory buffer and
+returns at once, so the chat stream never waits on the database. A
+background task started with the app (see main.lifespan) inserts the
+buffer in batches of up to CHAT_HISTORY_BATCH_SIZE rows, as soon as a
+batch is full or every CHAT_HISTORY_FLUSH_SECONDS, and writes what is left
+at shutdown. Ids and timestamps are assigned when a message is recorded,
+so the order doesn't depend on when its batch is written. A failed batch
+is kept for the next flush; beyond CHAT_HISTORY_MAX_BUFFER unsaved
+messages the oldest are dropped.
+
+Reads use keyset pagination: a page holds the messages before a cursor,
+the (created_at, id) of the oldest message on the previous page. The
+(session_id, created_at, id) index serves it as one range scan, so a page
+costs the same however long the session is.
+
+The buffer is per worker process. A read first writes its own session's
+buffered messages, so it sees everything recorded by this worker.
+Messages recorded by another worker show up once that worker writes its
+batch, normally within CHAT_HISTORY_FLUSH_SECONDS. A delete drops the
+session's buffered messages on this worker only; another worker's buffered
+messages for the session are written after it.
+"""
+import asyncio
+import base64
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+from app.models.chat import ChatHistoryItem, ChatHistoryResponse
+from app.services.supabase_service import supabase_service
+
+
+class InvalidCursorError(ValueError):
+    """A history cursor that this service didn't issue"""
+
+
+def encode_cursor(created_at: str, message_id: str) -> str:
+    return base64.urlsafe_b64encode(f"{created_at}|{message_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """(created_at, id) of a cursor, re-formatted so they are safe inside a filter"""
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at).isoformat(), str(UUID(message_id))
+    except ValueError:
+        raise InvalidCursorError("Invalid history cursor") from None
+
+
+class ChatHistoryService:
+    """Write-behind storage and paginated reads of chat messages"""
+
+    TABLE_NAME = "chat_history"
+
+    def __init__(self):
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._flush_lock = asyncio.Lock()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.written = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop the background task and write the remaining buffer"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), settings.CHAT_HISTORY_FLUSH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    def record(
+        self,
+        user_id: str,
+        session_id: UUID,
+        page_context: str,
+        role: str,
+        content: str,
+        context_snapshot: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Queue a message for writing (never waits on the database)"""
+        self._buffer.append({
+            "id": str(uuid4()),
+            "user_id": user_id,
+            "session_id": str(session_id),
+            "page_context": page_context,
+            "role": role,
+            "content": content,
+            "context_snapshot": context_snapshot,
+            "created_at": datetime.now(timezone.utc).isoformat()
+        })
+        self.recorded += 1
+        self._trim()
+        if len(self._buffer) >= settings.CHAT_HISTORY_BATCH_SIZE:
+            self._batch_ready.set()
+
+    def _trim(self) -> None:
+        while len(self._buffer) > settings.CHAT_HISTORY_MAX_BUFFER:
+            self._buffer.popleft()
+            self.dropped += 1
+
+    def _take_batch(self, session: Optional[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Remove and return the next batch of oldest rows, only of `session` if given"""
+        size = settings.CHAT_HISTORY_BATCH_SIZE
+        if session is None:
+            return [self._buffer.popleft() for _ in range(min(len(self._buffer), size))]
+        batch: List[Dict[str, Any]] = []
+        rest: Deque[Dict[str, Any]] = deque()
+        for row in self._buffer:
+            if len(batch) < size and (row["user_id"], row["session_id"]) == session:
+                batch.append(row)
+            else:
+                rest.append(row)
+        self._buffer = rest
+        return batch
+
+    async def flush(self, user_id: Optional[str] = None, session_id: Optional[UUID] = None) -> None:
+        """Write buffered messages in batches: all of them, or one session's"""
+        session = (user_id, str(session_id)) if session_id is not None else None
+        async with self._flush_lock:
+            while True:
+                batch = self._take_batch(session)
+                if not batch:
+                    return
+                try:
+                    client = await supabase_service.get_async_client()
+                    await client.table(self.TABLE_NAME).insert(batch).execute()
+                except asyncio.CancelledError:
+                    # The flushing task was cancelled (shutdown, or a reader went away)
+                    self._buffer.extendleft(reversed(batch))
+                    raise
+                except Exception as e:
+                    print(f"Error writing chat history ({len(batch)} messages): {e}")
+                    self.failed_batches += 1
+                    # Keep them for the next flush, ahead of newer messages
+                    self._buffer.extendleft(reversed(batch))
+                    self._trim()
+                    return
+                self.written += len(batch)
+                self.batches += 1
+
+    async def get_page(
+        self,
+        user_id: str,
+        session_id: UUID,
+        limit: int,
+        before: Optional[str] = None
+    ) -> ChatHistoryResponse:
+        """
+        The latest `limit` messages of a session before the `before` cursor, oldest first.
+
+        Raises:
+            InvalidCursorError: `before` is not a cursor returned by get_page
+        """
+        await self.flush(user_id, session_id)
+        client = await supabase_service.get_async_client()
+        query = client.table(self.TABLE_NAME)\
+            .select("*")\
+            .eq("session_id", str(session_id))\
+            .eq("user_id", user_id)
+        if before is not None:
+            created_at, message_id = decode_cursor(before)
+            query = query.or_(
+                f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{message_id})'
+            )
+        response = await query\
+            .order("created_at", desc=True)\
+            .order("id", desc=True)\
+            .limit(limit + 1)\
+            .execute()
+
+        rows: List[Dict[str, Any]] = response.data[:limit]
+        oldest = rows[-1] if rows else None
+        return ChatHistoryResponse(
+            messages=[ChatHistoryItem.model_validate(row) for row in reversed(rows)],
+            session_id=session_id,
+            next_cursor=(
+                encode_cursor(oldest["created_at"], oldest["id"])
+                if len(response.data) > limit else None
+            )
+        )
+
+    async def delete_session(self, user_id: str, session_id: UUID) -> None:
+        """Delete a session's messages, including any not written yet"""
+        async with self._flush_lock:
+            session = str(session_id)
+            self._buffer = deque(
+                row for row in self._buffer
+                if row["session_id"] != session or row["user_id"] != user_id
+            )
+            client = await supabase_service.get_async_client()
+            await client.table(self.TABLE_NAME)\
+                .delete()\
+                .eq("session_id", session)\
+                .eq("user_id", user_id)\
+                .execute()
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "recorded": self.recorded,
+            "written": self.written,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "dropped": self.dropped
+        }
+
+
+chat_history = ChatHistoryService()
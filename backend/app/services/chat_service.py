@@ -8,10 +8,14 @@ ATS score, and which page they're on (AI Build, Cover Letter, Proposal).
 To implement: Fill in _build_system_prompt() with page-specific instructions
 and _build_profile_summary() to summarize the user's profile for the AI.
 """
-from typing import AsyncGenerator, Optional
+from contextlib import aclosing
+from typing import Any, AsyncGenerator, Dict
 from app.models.chat import ChatRequest, ChatContext
-from app.services.ai_service_factory import AIServiceFactory
-from app.services.ai_settings_service import ai_settings_service
+from app.services.base_ai_service import BaseAIService
+from app.services.chat_history import chat_history
+from app.services.chat_sessions import ChatSession
+from app.services.job_description import parsed_job_descriptions
+from app.services.provider_limiter import provider_limiter
 
 
 class ChatService:
@@ -20,28 +24,53 @@ class ChatService:
     async def stream_chat(
         self,
         request: ChatRequest,
-        user_id: str
-    ) -> AsyncGenerator[str, None]:
+        user_id: str,
+        ai_service: BaseAIService,
+        session: ChatSession
+    ) -> AsyncGenerator[Dict[str, Any], None]:
         """
-        Stream a chat response using the user's configured AI provider.
+        Stream a chat response from the user's AI provider.
 
         Args:
             request: ChatRequest containing message, context, and session info
-            user_id: Authenticated user ID
+            user_id: Authenticated user ID (messages are saved to its chat history)
+            ai_service: The user's provider service (see get_ai_service_for_user)
+            session: The request's context (see chat_sessions.resolve)
 
         Yields:
-            JSON-encoded SSE data strings
-
-        TODO: Implement streaming by:
-        1. Get user's AI config via ai_settings_service.get_user_settings(user_id)
-        2. Build system prompt using _build_system_prompt(request.context_data)
-        3. Stream tokens from the AI provider
-        4. Yield each token as: f'data: {{"type": "chunk", "content": "{token}"}}\n\n'
-        5. End with: 'data: {"type": "done"}\n\n'
+            Event payloads for app.core.sse: a "chunk" per token delta as the
+            provider produces it, then "done" with the token usage and the
+            context fingerprint for the next message (or "error")
         """
-        # Placeholder - yields error message
-        yield 'data: {"type": "chunk", "content": "Chat not yet implemented. See chat_service.py."}\n\n'
-        yield 'data: {"type": "done"}\n\n'
+        if session.system_prompt is None:
+            session.system_prompt = self._build_system_prompt(session.context)
+        messages = [
+            {"role": "system", "content": session.system_prompt},
+            {"role": "user", "content": request.message},
+        ]
+        if request.session_id is not None:
+            chat_history.record(
+                user_id, request.session_id, request.page_context, "user", request.message,
+                {"page": session.context.page, "contextFingerprint": session.fingerprint}
+            )
+        parts = []
+        usage = None
+        try:
+            # Holds one of the API key's provider slots for the whole stream
+            async with provider_limiter.slot(ai_service.api_key):
+                # Closed explicitly, so a client disconnect cancels the provider request
+                async with aclosing(ai_service.stream_completion(messages)) as stream:
+                    async for chunk in stream:
+                        if chunk.delta:
+                            parts.append(chunk.delta)
+                            yield {"type": "chunk", "content": chunk.delta}
+                        elif chunk.usage is not None:
+                            usage = chunk.usage.model_dump()
+            if request.session_id is not None:
+                chat_history.record(user_id, request.session_id, request.page_context, "assistant", "".join(parts))
+            yield {"type": "done", "usage": usage, "contextFingerprint": session.fingerprint}
+        except Exception as e:
+            yield {"type": "error", "message": str(e)}
 
     def _build_system_prompt(self, context: ChatContext) -> str:
         """
@@ -65,7 +94,12 @@ class ChatService:
         - Page-specific instructions and guidance
         """
         # Placeholder
-        return f"You are a helpful resume assistant. The user is on the {context.page} page."
+        prompt = f"You are a helpful resume assistant. The user is on the {context.page} page."
+        if context.job_description:
+            requirements = parsed_job_descriptions.get(context.job_description).prompt_summary()
+            if requirements:
+                prompt += f"\n\nTarget job:\n{requirements}"
+        return prompt
 
     def _build_profile_summary(self, profile: dict) -> str:
         """
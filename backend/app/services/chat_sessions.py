@@ -0,0 +1,106 @@
+"""
+Chat Sessions
+
+Server-side chat context per (user, session_id), so a conversation sends
+its ChatContext (profile, JD, tailored resume, cover letter) once instead
+of with every message.
+
+Every stored context version has a fingerprint, returned to the client in
+the "done" event. A request then carries one of:
+- context_data: the full context (first message, or after a 409). Sending
+  the same context again keeps the session and its cached prompt.
+- context_fingerprint: the context is unchanged since that version
+- context_fingerprint + context_patch: a JSON Patch against that version;
+  only the patched document is validated again
+
+The system prompt built from a context is cached on its session entry, so
+it is rebuilt only when the context changes. Sessions expire after
+CHAT_SESSION_TTL_SECONDS without a message.
+"""
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.core.cache import TTLCache, content_hash
+from app.core.config import settings
+from app.core.json_patch import apply_patch
+from app.models.chat import ChatContext, ChatRequest
+
+
+class ChatSession(BaseModel):
+    context: ChatContext
+    document: Dict[str, Any]  # context as JSON data, the base for patches
+    fingerprint: str
+    system_prompt: Optional[str] = None  # Built on first use (see ChatService)
+
+
+class ChatSessionStore:
+    """Chat contexts by (user_id, session_id)"""
+
+    def __init__(self):
+        self._sessions: TTLCache[ChatSession] = TTLCache(
+            maxsize=settings.CHAT_SESSION_MAX_ENTRIES,
+            ttl=settings.CHAT_SESSION_TTL_SECONDS
+        )
+        self.full = 0
+        self.unchanged = 0
+        self.patched = 0
+        self.stale = 0
+
+    def resolve(self, user_id: str, request: ChatRequest) -> Optional[ChatSession]:
+        """
+        Context of a chat request, stored for the session's next messages.
+
+        Returns None when the request refers to a context version this
+        worker doesn't hold (unknown or expired session, or another
+        fingerprint); the client must send context_data again.
+
+        Raises:
+            JSONPatchError: context_patch doesn't apply
+            pydantic.ValidationError: the patched context is not a valid ChatContext
+        """
+        key = (user_id, request.session_id)
+        if request.context_data is not None:
+            self.full += 1
+            document = request.context_data.model_dump(mode="json")
+            fingerprint = content_hash(document)
+            session = self._sessions.get(key) if request.session_id else None
+            if session is None or session.fingerprint != fingerprint:
+                session = ChatSession(context=request.context_data, document=document, fingerprint=fingerprint)
+            if request.session_id:
+                self._sessions.set(key, session)
+            return session
+
+        session = self._sessions.get(key) if request.session_id else None
+        if session is None or session.fingerprint != request.context_fingerprint:
+            self.stale += 1
+            return None
+        if request.context_patch:
+            document = apply_patch(session.document, request.context_patch)
+            session = ChatSession(
+                context=ChatContext.model_validate(document),
+                document=document,
+                # Chained from the base version: no need to hash the whole document again
+                fingerprint=content_hash(session.fingerprint, request.context_patch)
+            )
+            self.patched += 1
+        else:
+            self.unchanged += 1
+        self._sessions.set(key, session)
+        return session
+
+    def drop(self, user_id: str, session_id: UUID) -> None:
+        self._sessions.pop((user_id, session_id))
+
+    def stats(self) -> dict:
+        return {
+            **self._sessions.stats(),
+            "full_context": self.full,
+            "unchanged": self.unchanged,
+            "patched": self.patched,
+            "stale": self.stale
+        }
+
+
+chat_sessions = ChatSessionStore()
@@ -0,0 +1,59 @@
+"""
+CPU Tasks
+
+Entry points for work sent to the CPU process pool (see
+app.core.process_pool). Each task takes the request as JSON bytes,
+validates it with the same Pydantic model the route uses, and returns its
+result as JSON bytes. They also run inline for small payloads, so they must
+not depend on anything but their input.
+
+Each worker process keeps its own parsed-JD and bullet-index caches.
+"""
+import json
+from typing import List
+
+from pydantic import BaseModel
+
+from app.models.resume import RankBulletsRequest, ResumeData, TailorRequest, VerifyAccuracyRequest
+from app.services.accuracy_verifier import accuracy_verifier
+from app.services.ats_batch import batch_ats_scorer
+from app.services.bullet_ranker import bullet_ranker
+from app.services.enhanced_ats_scorer import EnhancedATSScorer
+from app.services.job_description import parsed_job_descriptions
+
+
+class ATSBatchChunk(BaseModel):
+    """One chunk of a batch ATS request (see BatchATSScorer.chunks)"""
+    resumes: List[ResumeData]
+    jobDescriptions: List[str]
+    resumeOffset: int = 0
+    jobOffset: int = 0
+
+
+def ats_score(payload: bytes) -> bytes:
+    """TailorRequest -> EnhancedATSScorer.calculate_comprehensive_score result"""
+    request = TailorRequest.model_validate_json(payload)
+    result = EnhancedATSScorer().calculate_comprehensive_score(request.profileData, request.jobDescription)
+    return json.dumps(result).encode()
+
+
+def ats_score_batch(payload: bytes) -> bytes:
+    """ATSBatchChunk -> list of scored pairs"""
+    chunk = ATSBatchChunk.model_validate_json(payload)
+    results = batch_ats_scorer.score_chunk(
+        chunk.resumes, chunk.jobDescriptions, chunk.resumeOffset, chunk.jobOffset
+    )
+    return json.dumps(results).encode()
+
+
+def rank_bullets(payload: bytes) -> bytes:
+    """RankBulletsRequest -> ranked bullets"""
+    request = RankBulletsRequest.model_validate_json(payload)
+    job = parsed_job_descriptions.get(request.jobDescription)
+    return json.dumps(bullet_ranker.rank(request.profileData, job, request.limit)).encode()
+
+
+def verify_accuracy(payload: bytes) -> bytes:
+    """VerifyAccuracyRequest -> AccuracyReport"""
+    request = VerifyAccuracyRequest.model_validate_json(payload)
+    return accuracy_verifier.verify(request.original, request.tailored).model_dump_json().encode()
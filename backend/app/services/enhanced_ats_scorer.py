@@ -8,10 +8,175 @@ formatting evaluation, and relevance scoring.
 This class provides the scoring logic for the /ai/ats-score endpoint.
 The /ai/ats-score-llm endpoint combines this with an LLM-based analysis.
 
-To implement: Fill in the scoring methods below with your own algorithms.
+Everything derived from the resume alone is extracted once into
+ResumeFeatures, and everything derived from the JD alone comes from the
+cached ParsedJobDescription, so scoring a pair only compares the two.
+The batch scorer (ats_batch) uses the same features for many pairs.
 """
-from typing import List, Tuple
+import re
+from datetime import date
+from typing import FrozenSet, List, Optional, Tuple
 from app.models.resume import ResumeData, ATSScoreBreakdown, ATSScoreResponse
+from app.services.job_description import ParsedJobDescription, parsed_job_descriptions
+from app.services.skill_taxonomy import skill_taxonomy
+
+# Sub-score weights of the overall score
+WEIGHTS = {
+    "keyword_match": 0.40,
+    "formatting": 0.20,
+    "experience_relevance": 0.25,
+    "skills_alignment": 0.15,
+}
+
+# Skills from the JD's requirement sentences count this much more than
+# skills it only mentions
+REQUIRED_SKILL_WEIGHT = 2
+
+# Experience relevance: JD keyword coverage by experience vs. years asked for
+EXPERIENCE_COVERAGE_SHARE = 0.7
+
+# A bullet with fewer words than this doesn't count as a meaningful description
+MIN_BULLET_WORDS = 4
+
+_MONTHS = {
+    month: index for index, month in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec")
+    )
+}
+_DATE_RE = re.compile(r"(?:([a-z]{3})[a-z]*\.?\s+)?(\d{4})", re.IGNORECASE)
+_PRESENT_RE = re.compile(r"present|current|now|today", re.IGNORECASE)
+
+
+def experience_text(resume_data: ResumeData) -> str:
+    """Roles and bullets of all experience entries (one field per line)"""
+    return "\n".join(
+        line for exp in resume_data.experience for line in (exp.role, *exp.description)
+    )
+
+
+def other_resume_text(resume_data: ResumeData) -> str:
+    """Searchable resume content outside experience_text() (one field per line)"""
+    parts = [resume_data.additionalInfo]
+    skills = resume_data.skills
+    parts += skills.languages + skills.databases + skills.cloud + skills.tools
+    parts += [exp.company for exp in resume_data.experience]
+    for project in resume_data.projects:
+        parts += [project.name, *project.technologies, *project.description]
+    for edu in resume_data.education:
+        parts += [edu.degree, edu.institution]
+    parts += resume_data.certifications
+    return "\n".join(parts)
+
+
+def resume_skill_ids(resume_data: ResumeData) -> FrozenSet[int]:
+    """Taxonomy IDs of the skills listed in the resume and its project technologies"""
+    skills = resume_data.skills
+    listed = skills.languages + skills.databases + skills.cloud + skills.tools
+    for project in resume_data.projects:
+        listed += project.technologies
+    return skill_taxonomy.skill_ids("\n".join(listed))
+
+
+def _parse_date(text: str, today: date) -> Optional[float]:
+    """Fractional year of "Jan 2020", "2020" or "Present"; None if unparseable"""
+    if _PRESENT_RE.search(text):
+        return today.year + (today.month - 1) / 12
+    match = _DATE_RE.search(text)
+    if match is None:
+        return None
+    month = _MONTHS.get((match.group(1) or "").lower(), 0)
+    return int(match.group(2)) + month / 12
+
+
+def experience_years(resume_data: ResumeData) -> float:
+    """Total years covered by experience entries (overlapping jobs count once)"""
+    today = date.today()
+    spans = []
+    for exp in resume_data.experience:
+        start = _parse_date(exp.startDate, today)
+        end = _parse_date(exp.endDate, today) if exp.endDate else None
+        if start is None:
+            continue
+        if end is None or end < start:
+            end = start + 1 / 12
+        spans.append((start, end))
+
+    total, covered_until = 0.0, float("-inf")
+    for start, end in sorted(spans):
+        start = max(start, covered_until)
+        if end > start:
+            total += end - start
+            covered_until = end
+    return round(total, 1)
+
+
+def formatting_score(resume_data: ResumeData) -> int:
+    """Structure and completeness checklist, 0-100"""
+    info = resume_data.personalInfo
+    skills = resume_data.skills
+    score = 10 * sum(bool(field.strip()) for field in (info.fullName, info.email, info.phone))
+    score += 20 if resume_data.experience else 0
+    score += 15 if skills.languages or skills.databases or skills.cloud or skills.tools else 0
+    score += 15 if resume_data.education else 0
+
+    bullets = [bullet for exp in resume_data.experience for bullet in exp.description]
+    bullets += [bullet for project in resume_data.projects for bullet in project.description]
+    if bullets:
+        meaningful = sum(len(bullet.split()) >= MIN_BULLET_WORDS for bullet in bullets)
+        score += round(20 * meaningful / len(bullets))
+    return score
+
+
+class ResumeFeatures:
+    """
+    Everything the scorer needs from one resume, extracted once.
+
+    The text is tokenized in two parts, experience and everything else;
+    a JD keyword is found in the resume if it is found in either part.
+    """
+
+    def __init__(self, resume_data: ResumeData):
+        self.experience_tokens: List[str] = skill_taxonomy.canonical_tokens(experience_text(resume_data))
+        self.other_tokens: List[str] = skill_taxonomy.canonical_tokens(other_resume_text(resume_data))
+        self.skill_ids: FrozenSet[int] = resume_skill_ids(resume_data)
+        self.years: float = experience_years(resume_data)
+        self.formatting: int = formatting_score(resume_data)
+
+
+def years_factor(years: float, min_years: Optional[int]) -> float:
+    """1.0 when the resume meets the JD's minimum years (or it names none)"""
+    if not min_years:
+        return 1.0
+    return min(1.0, years / min_years)
+
+
+def build_feedback(breakdown: dict, missing_keywords: List[str]) -> Tuple[str, List[str], List[str]]:
+    """(feedback, strengths, improvements) for a score breakdown"""
+    labels = {
+        "keyword_match": "Keyword coverage of the job description",
+        "formatting": "Resume structure and completeness",
+        "experience_relevance": "Relevance of work experience",
+        "skills_alignment": "Alignment of listed skills",
+    }
+    strengths = [f"{labels[name]} is strong ({value}/100)" for name, value in breakdown.items() if value >= 75]
+    improvements = []
+    if breakdown["keyword_match"] < 75 and missing_keywords:
+        improvements.append(f"Work in missing keywords where accurate: {', '.join(missing_keywords[:8])}")
+    if breakdown["formatting"] < 75:
+        improvements.append("Complete contact details, skills and education, and write full-sentence bullets")
+    if breakdown["experience_relevance"] < 75:
+        improvements.append("Describe experience in terms of the job's requirements")
+    if breakdown["skills_alignment"] < 75:
+        improvements.append("List the required skills you have in the skills section")
+
+    overall = round(sum(breakdown[name] * weight for name, weight in WEIGHTS.items()))
+    if overall >= 80:
+        feedback = "Strong match: the resume covers most of what this job asks for."
+    elif overall >= 60:
+        feedback = "Good match with gaps: a few targeted edits would raise the score."
+    else:
+        feedback = "Weak match: the resume misses many of this job's requirements."
+    return feedback, strengths, improvements
 
 
 class EnhancedATSScorer:
@@ -41,17 +206,61 @@ class EnhancedATSScorer:
             dict with keys: score, feedback, breakdown, missing_keywords,
                           strengths, improvements
 
-        TODO: Implement comprehensive scoring by combining all sub-scores.
-        Example implementation:
-            keyword_score, missing = self.calculate_keyword_match(resume_data, job_description)
-            format_score = self.score_formatting(resume_data)
-            exp_score = self.score_experience_relevance(resume_data, job_description)
-            skills_score = self.score_skills_alignment(resume_data, job_description)
-
-            weighted = (keyword_score * 0.4 + format_score * 0.2 +
-                       exp_score * 0.25 + skills_score * 0.15)
+        Sub-scores are combined with WEIGHTS; resume features and the
+        parsed JD are each computed once.
         """
-        raise NotImplementedError("TODO: Implement calculate_comprehensive_score")
+        features = ResumeFeatures(resume_data)
+        job = parsed_job_descriptions.get(job_description)
+
+        keyword_score, missing = self._keyword_match(features, job)
+        breakdown = {
+            "keyword_match": keyword_score,
+            "formatting": features.formatting,
+            "experience_relevance": self._experience_relevance(features, job),
+            "skills_alignment": self._skills_alignment(features, job),
+        }
+        feedback, strengths, improvements = build_feedback(breakdown, missing)
+        return {
+            "score": round(sum(breakdown[name] * weight for name, weight in WEIGHTS.items())),
+            "feedback": feedback,
+            "breakdown": breakdown,
+            "missing_keywords": missing,
+            "strengths": strengths,
+            "improvements": improvements,
+        }
+
+    @staticmethod
+    def _keyword_match(features: ResumeFeatures, job: ParsedJobDescription) -> Tuple[int, List[str]]:
+        if not job.keywords:
+            return 100, []
+        found = job.matcher.find(features.experience_tokens) | job.matcher.find(features.other_tokens)
+        missing = [" ".join(keyword) for index, keyword in enumerate(job.keywords) if index not in found]
+        return round(100 * len(found) / len(job.keywords)), missing
+
+    @staticmethod
+    def _experience_relevance(features: ResumeFeatures, job: ParsedJobDescription) -> int:
+        coverage = (
+            len(job.matcher.find(features.experience_tokens)) / len(job.keywords)
+            if job.keywords else 1.0
+        )
+        relevance = (
+            EXPERIENCE_COVERAGE_SHARE * coverage
+            + (1 - EXPERIENCE_COVERAGE_SHARE) * years_factor(features.years, job.min_years)
+        )
+        return round(100 * relevance)
+
+    @staticmethod
+    def _skills_alignment(features: ResumeFeatures, job: ParsedJobDescription) -> int:
+        if not job.skill_ids:
+            return 100
+        required = job.required_skill_ids
+        others = job.skill_ids - required
+        total = REQUIRED_SKILL_WEIGHT * len(required) + len(others)
+        matched = (
+            REQUIRED_SKILL_WEIGHT * len(required & features.skill_ids)
+            + len(others & features.skill_ids)
+        )
+        return round(100 * matched / total)
 
     def calculate_keyword_match(
         self,
@@ -68,13 +277,11 @@ class EnhancedATSScorer:
         Returns:
             Tuple of (match_percentage: int, missing_keywords: List[str])
 
-        TODO: Implement keyword extraction and matching:
-        1. Extract meaningful keywords from job_description (nouns, technical terms)
-        2. Build a searchable text from all resume fields
-        3. Find which keywords are present/missing
-        4. Calculate percentage matched
+        The JD's keywords are compiled once per JD (see job_description),
+        so this is a single scan over the resume text. A JD without any
+        keywords scores 100.
         """
-        raise NotImplementedError("TODO: Implement calculate_keyword_match")
+        return self._keyword_match(ResumeFeatures(resume_data), parsed_job_descriptions.get(job_description))
 
     def score_formatting(self, resume_data: ResumeData) -> int:
         """
@@ -86,14 +293,11 @@ class EnhancedATSScorer:
         Returns:
             Score from 0-100
 
-        TODO: Implement formatting checks:
-        - Has contact info (name, email, phone)
-        - Has at least one experience entry
-        - Has skills section
-        - Has education section
-        - Has meaningful descriptions (not empty bullets)
+        Checks: contact info (name, email, phone), at least one experience
+        entry, a skills section, an education section, and the share of
+        bullets with at least MIN_BULLET_WORDS words.
         """
-        raise NotImplementedError("TODO: Implement score_formatting")
+        return formatting_score(resume_data)
 
     def score_experience_relevance(
         self,
@@ -110,12 +314,13 @@ class EnhancedATSScorer:
         Returns:
             Score from 0-100
 
-        TODO: Implement relevance scoring:
-        - Check if job titles/roles appear in JD
-        - Check if experience descriptions overlap with JD keywords
-        - Consider years of experience vs requirements
+        Combines the share of JD keywords found in roles and experience
+        bullets (EXPERIENCE_COVERAGE_SHARE) with total years of experience
+        against the minimum the JD asks for.
         """
-        raise NotImplementedError("TODO: Implement score_experience_relevance")
+        return self._experience_relevance(
+            ResumeFeatures(resume_data), parsed_job_descriptions.get(job_description)
+        )
 
     def score_skills_alignment(
         self,
@@ -132,9 +337,11 @@ class EnhancedATSScorer:
         Returns:
             Score from 0-100
 
-        TODO: Implement skills alignment:
-        - Extract required skills from JD
-        - Match against user's skills categories
-        - Weight technical skills more heavily for tech roles
+        Skills are compared as taxonomy IDs (see skill_taxonomy), so aliases
+        like "k8s" / "Kubernetes" count as the same skill. Skills from
+        requirement sentences weigh REQUIRED_SKILL_WEIGHT, other JD skills
+        1. A JD that names no known skills scores 100.
         """
-        raise NotImplementedError("TODO: Implement score_skills_alignment")
+        return self._skills_alignment(
+            ResumeFeatures(resume_data), parsed_job_descriptions.get(job_description)
+        )
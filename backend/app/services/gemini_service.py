@@ -12,10 +12,14 @@ Usage:
     The AIServiceFactory instantiates this class automatically.
 """
 import google.generativeai as genai
-from typing import List
-from app.services.base_ai_service import BaseAIService
+from google.ai import generativelanguage as glm
+from typing import AsyncIterator, Dict, List, Optional
+from app.services.base_ai_service import BaseAIService, CompletionUsage, StreamChunk
 from app.models.resume import ResumeData, Skills, Experience, Education, Project
 
+# Chat roles -> Gemini content roles (system messages become the system instruction)
+_GEMINI_ROLES = {"user": "user", "assistant": "model"}
+
 
 class GeminiService(BaseAIService):
     """AI service implementation using Google Gemini"""
@@ -25,6 +29,67 @@ class GeminiService(BaseAIService):
         # TODO: Initialize the Gemini client
         # genai.configure(api_key=api_key)
         # self.client = genai.GenerativeModel(model)
+        self._async_client: Optional[glm.GenerativeServiceAsyncClient] = None
+
+    def _streaming_client(self) -> glm.GenerativeServiceAsyncClient:
+        # Keyed to this service: genai.configure() is process-wide, and every
+        # user brings their own API key. Created on first use, inside the event loop.
+        if self._async_client is None:
+            self._async_client = glm.GenerativeServiceAsyncClient(client_options={"api_key": self.api_key})
+        return self._async_client
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.transport.close()
+            self._async_client = None
+
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream via the async generate_content streaming RPC"""
+        system = "\n\n".join(m["content"] for m in messages if m["role"] == "system")
+        request = {
+            "model": self.model if "/" in self.model else f"models/{self.model}",
+            "contents": [
+                glm.Content(role=_GEMINI_ROLES.get(m["role"], "user"), parts=[glm.Part(text=m["content"])])
+                for m in messages if m["role"] != "system"
+            ],
+            "generation_config": glm.GenerationConfig(temperature=temperature, max_output_tokens=max_tokens),
+        }
+        if system:
+            request["system_instruction"] = glm.Content(parts=[glm.Part(text=system)])
+
+        try:
+            stream = await self._streaming_client().stream_generate_content(
+                glm.GenerateContentRequest(**request),
+                timeout=self._request_timeout()
+            )
+            usage, finish_reason = CompletionUsage(), None
+            try:
+                async for response in stream:
+                    if response.candidates:
+                        candidate = response.candidates[0]
+                        text = "".join(part.text for part in candidate.content.parts)
+                        if text:
+                            yield StreamChunk(delta=text)
+                        if candidate.finish_reason:
+                            finish_reason = candidate.finish_reason.name.lower()
+                    if response.usage_metadata:
+                        usage = CompletionUsage(
+                            promptTokens=response.usage_metadata.prompt_token_count,
+                            completionTokens=response.usage_metadata.candidates_token_count,
+                            totalTokens=response.usage_metadata.total_token_count
+                        )
+            finally:
+                # Cancels the RPC if the consumer stops early (no-op once it has finished)
+                stream.cancel()
+        except Exception as e:
+            self._handle_rate_limit_error(str(e))
+            raise
+        yield StreamChunk(finishReason=finish_reason, usage=usage)
 
     async def generate_summary(self, experience: str) -> str:
         """
@@ -182,7 +247,7 @@ class GeminiService(BaseAIService):
             Cover letter body text (no greeting/closing)
 
         TODO: Implement prompt to generate a compelling cover letter body.
-              Use self._clean_cover_letter() to strip greeting/closing.
+              Use self.clean_cover_letter() to strip greeting/closing.
         """
         raise NotImplementedError("TODO: Implement generate_cover_letter with Gemini API")
 
@@ -0,0 +1,192 @@
+"""
+JD Compactor
+
+Strips boilerplate from job descriptions before they are sent to an LLM.
+Pasted JDs often carry EEO statements, benefits lists, company blurbs and
+application instructions that cost prompt tokens without helping the
+model tailor anything.
+
+The classifier works per sentence and is deterministic:
+- Boilerplate section headings ("Benefits", "About us", "What we offer")
+  mark every following line as boilerplate until a content heading
+  ("Requirements", "Responsibilities", ...) appears.
+- Elsewhere, a sentence is boilerplate if it matches the cue index (one
+  compiled alternation per category) and has no requirement cue.
+
+The full JD is kept for display; the compact JD feeds every AI method
+(see CachedAIService) and the local analysis (see ParsedJobDescription).
+"""
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from pydantic import BaseModel
+
+# Category -> cue phrases (regex fragments, matched case-insensitively)
+BOILERPLATE_CUES: Dict[str, Tuple[str, ...]] = {
+    "eeo": (
+        r"equal employment opportunit", r"equal opportunity (?:employer|workplace)",
+        r"\beeo\b", r"affirmative action",
+        r"without regard to", r"regardless of (?:race|gender|age|religion)",
+        r"protected (?:veteran|characteristic|class|status)", r"sexual orientation",
+        r"gender identity", r"national origin", r"diverse (?:and|&) inclusive",
+        r"values? diversity", r"reasonable accommodations?", r"disability status",
+    ),
+    "benefits": (
+        r"\bbenefits?\b", r"(?:health(?:care)?|medical|dental|vision) (?:insurance|coverage|plans?)",
+        r"dental,? (?:and |& )?vision", r"401\s*\(?k\)?", r"paid time off", r"\bpto\b", r"parental leave",
+        r"stock options?", r"equity (?:package|grants?|compensation|stake)",
+        r"(?:meaningful|generous|competitive) equity", r"competitive (?:salary|compensation|pay)",
+        r"salary range", r"\bperks?\b", r"wellness (?:stipend|budget|allowance|program)",
+        r"gym membership", r"remote[- ]friendly", r"flexible (?:hours|schedule|working)",
+        r"learning (?:and|&) development budget", r"free (?:lunch|snacks|meals)",
+    ),
+    "company": (
+        r"\bwe are (?:a|an|the) (?:leading|fast[- ]growing|global|innovative)",
+        r"founded in \d{4}", r"our mission", r"our vision", r"our values", r"backed by",
+        r"series [a-e]\b", r"fortune \d+", r"award[- ]winning", r"headquartered in",
+        r"trusted by", r"world'?s (?:leading|largest)",
+    ),
+    "process": (
+        r"to apply", r"apply (?:now|today|online)", r"send (?:us )?your (?:resume|cv)",
+        r"cover letter", r"background check", r"drug (?:test|screen)", r"e-verify",
+        r"privacy (?:policy|notice)", r"recruit(?:ment|ing) agenc", r"visa sponsorship",
+        r"interview process",
+    ),
+}
+
+# Sentences with these cues are kept even if they also hit a boilerplate cue
+_REQUIREMENT_RE = re.compile(
+    r"\b(?:require|must|experience (?:with|in)|proficien|knowledge of|familiar|"
+    r"\d+\+? years|you will|you'll|responsib)",
+    re.IGNORECASE
+)
+
+_BOILERPLATE_HEADING_RE = re.compile(
+    r"^(?:about (?:us|the company|the team|(?!you\b)[a-z0-9 ]{1,30})|who we are|our (?:company|story|culture|mission)|"
+    r"benefits|perks|perks (?:and|&) benefits|what we offer|why (?:join us|work (?:with|for) us)|"
+    r"compensation|equal (?:employment )?opportunity|eeo statement|how to apply)\s*:?$",
+    re.IGNORECASE
+)
+_CONTENT_HEADING_RE = re.compile(
+    r"^(?:requirements|qualifications|minimum qualifications|preferred qualifications|"
+    r"responsibilities|key responsibilities|what you(?:'ll| will) do|what you(?:'ll| will) bring|"
+    r"about (?:the|this) (?:role|position|job)|about you|the role|skills|nice to have|must have|"
+    r"who you are|you have|tech stack)\s*:?$",
+    re.IGNORECASE
+)
+_HEADING_MAX_CHARS = 60
+
+# Split after sentence punctuation followed by whitespace, so "node.js" stays whole
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+_CATEGORY_RES = {
+    category: re.compile("|".join(cues), re.IGNORECASE)
+    for category, cues in BOILERPLATE_CUES.items()
+}
+# One combined pass decides "any cue?"; the per-category patterns only run on hits
+_ANY_CUE_RE = re.compile("|".join(f"(?:{cue})" for cues in BOILERPLATE_CUES.values() for cue in cues), re.IGNORECASE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about 4 characters per token for English)"""
+    return (len(text) + 3) // 4
+
+
+class JDCompaction(BaseModel):
+    originalTokens: int
+    compactTokens: int
+    reductionPercent: float
+    removedSentences: Dict[str, int] = {}  # per boilerplate category
+
+
+def _classify(sentence: str) -> str:
+    """Boilerplate category of a sentence, or "" for content"""
+    if not _ANY_CUE_RE.search(sentence) or _REQUIREMENT_RE.search(sentence):
+        return ""
+    for category, pattern in _CATEGORY_RES.items():
+        if pattern.search(sentence):
+            return category
+    return ""
+
+
+def compact_job_description(text: str) -> Tuple[str, JDCompaction]:
+    """Return the JD without boilerplate, and what was removed"""
+    kept_lines: List[str] = []
+    removed: Dict[str, int] = {}
+    in_boilerplate_section = False
+
+    for line in text.splitlines():
+        stripped = line.strip().strip("#*").strip()
+        if not stripped:
+            # Keep one blank line between paragraphs: it ends a heading's section
+            if kept_lines and kept_lines[-1]:
+                kept_lines.append("")
+            continue
+        if len(stripped) <= _HEADING_MAX_CHARS:
+            # Content headings first: "About the role" is not "About us"
+            if _CONTENT_HEADING_RE.match(stripped):
+                in_boilerplate_section = False
+                kept_lines.append(stripped)
+                continue
+            if _BOILERPLATE_HEADING_RE.match(stripped):
+                in_boilerplate_section = True
+                removed["section"] = removed.get("section", 0) + 1
+                continue
+
+        kept = []
+        for sentence in _SENTENCE_SPLIT_RE.split(stripped):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            category = "section" if in_boilerplate_section else _classify(sentence)
+            if category:
+                removed[category] = removed.get(category, 0) + 1
+            else:
+                kept.append(sentence)
+        if kept:
+            kept_lines.append(" ".join(kept))
+
+    compact = "\n".join(kept_lines).strip()
+    if not compact:
+        # Nothing recognisable as content; never send an empty JD
+        compact = text.strip()
+        removed = {}
+
+    original_tokens = estimate_tokens(text)
+    compact_tokens = estimate_tokens(compact)
+    return compact, JDCompaction(
+        originalTokens=original_tokens,
+        compactTokens=compact_tokens,
+        reductionPercent=round(100 * (1 - compact_tokens / original_tokens), 1) if original_tokens else 0.0,
+        removedSentences=removed
+    )
+
+
+class CompactionStats:
+    """Prompt tokens saved by JD compaction on this worker"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.original_tokens = 0
+        self.compact_tokens = 0
+
+    def record(self, compaction: JDCompaction) -> None:
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += compaction.originalTokens
+            self.compact_tokens += compaction.compactTokens
+
+    def stats(self) -> dict:
+        saved = self.original_tokens - self.compact_tokens
+        return {
+            "ai_calls": self.calls,
+            "original_tokens": self.original_tokens,
+            "compact_tokens": self.compact_tokens,
+            "tokens_saved": saved,
+            "reduction_ratio": round(saved / self.original_tokens, 4) if self.original_tokens else 0.0
+        }
+
+
+compaction_stats = CompactionStats()
@@ -0,0 +1,221 @@
+"""
+Parsed Job Descriptions
+
+The same job description is sent to tailoring, ATS scoring, cover letter,
+proposal and chat endpoints, usually many times while a user iterates.
+Everything derived from the JD text alone is computed once per JD hash
+into a ParsedJobDescription and kept in a bounded LRU. Analysis runs on
+the compact JD, so EEO and benefits text never count as keywords:
+
+- the compact JD without boilerplate (sent to the LLM, see jd_compactor)
+- normalized text and tokens (for the bullet ranker's query vector)
+- keywords and their compiled matcher (for ATS keyword matching)
+- required / preferred skills, split by the cue words of their sentence
+  or section heading, as keywords and as taxonomy skill IDs
+- seniority signals: level words of the title, headings and role nouns
+  ("senior engineer"), and the years of experience the requirements ask for
+"""
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.core.cache import TTLCache, content_hash
+from app.core.config import settings
+from app.services.jd_compactor import JDCompaction, compact_job_description
+from app.services.keyword_matcher import KeywordMatcher, extract_keywords
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.text_utils import tokenize
+
+# Split after sentence punctuation followed by whitespace, so "node.js" stays whole
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?;])\s+")
+_WHITESPACE_RE = re.compile(r"[ \t]+")
+_BULLET_RE = re.compile(r"^(?:[-*•●▪◦]|\d{1,2}[.)])\s")
+_HEADING_MAX_CHARS = 60
+_HEADING_MAX_WORDS = 4  # for headings without a colon
+_YEARS_RE = re.compile(r"(\d{1,2})\s*\+?\s*(?:-|to)?\s*(?:\d{1,2}\s*)?\+?\s*years?", re.IGNORECASE)
+
+_PREFERRED_CUES = ("plus", "preferred", "nice to have", "bonus", "ideally", "desirable")
+_REQUIRED_CUES = (
+    "require", "must", "need", "experience with", "experience in", "proficien",
+    "knowledge of", "familiar", "years", "expert", "strong", "solid", "hands-on", "qualification"
+)
+
+# Seniority words, by rank; the highest one found is the JD's level
+SENIORITY_LEVELS = {
+    "intern": 0, "internship": 0,
+    "junior": 1, "entry": 1, "graduate": 1, "associate": 1,
+    "mid": 2, "intermediate": 2,
+    "senior": 3, "sr": 3,
+    "lead": 4, "staff": 4,
+    "principal": 5, "architect": 5,
+    "head": 6, "director": 6, "vp": 7,
+}
+# Outside the title and headings, a level word counts only when it
+# directly modifies one of these ("senior engineer", not "lead code
+# reviews" or "report to the VP")
+_ROLE_NOUNS = frozenset("""
+administrator analyst architect consultant designer developer devops engineer manager programmer
+researcher scientist specialist sre tester
+""".split())
+_ROLE_NOUN_WINDOW = 2  # "senior software engineer"
+
+
+def _cue_section(text: str) -> Optional[str]:
+    """"preferred" or "required" by the cue words in `text`, else None"""
+    lowered = text.lower()
+    if any(cue in lowered for cue in _PREFERRED_CUES):
+        return "preferred"
+    if any(cue in lowered for cue in _REQUIRED_CUES):
+        return "required"
+    return None
+
+
+def _seniority_words(line: str, title: bool) -> List[str]:
+    """Level words of a line: all of them in a title or heading, else only before a role noun"""
+    tokens = tokenize(line)
+    return [
+        token for position, token in enumerate(tokens)
+        if token in SENIORITY_LEVELS and (
+            title or any(
+                following in _ROLE_NOUNS
+                for following in tokens[position + 1:position + 1 + _ROLE_NOUN_WINDOW]
+            )
+        )
+    ]
+
+
+def _is_heading(line: str) -> bool:
+    """
+    A section heading line: "Requirements:", "What you'll need:", or a
+    short line with a cue word ("Nice to have", "Bonus points").
+    """
+    if len(line) > _HEADING_MAX_CHARS or _BULLET_RE.match(line):
+        return False
+    if line.endswith(":"):
+        return True
+    return (
+        len(line.split()) <= _HEADING_MAX_WORDS
+        and line[-1] not in ".!?;,"
+        and _cue_section(line) is not None
+    )
+
+
+class ParsedJobDescription:
+    """Everything derived from one JD's text, shared by all endpoints"""
+
+    def __init__(self, text: str, fingerprint: Optional[str] = None):
+        self.text = text
+        self.compaction: Optional[JDCompaction]
+        self.fingerprint = fingerprint or content_hash(text)
+        if settings.JD_COMPACTION_ENABLED:
+            self.compact, self.compaction = compact_job_description(text)
+        else:
+            self.compact, self.compaction = text, None
+        self.normalized = "\n".join(
+            _WHITESPACE_RE.sub(" ", line).strip() for line in self.compact.splitlines() if line.strip()
+        )
+        self.tokens: List[str] = skill_taxonomy.canonical_tokens(self.normalized)
+        self.term_counts: Counter = Counter(self.tokens)
+
+        self.keywords: List[Tuple[str, ...]] = extract_keywords(self.normalized)
+        self.matcher = KeywordMatcher(self.keywords)
+
+        required: Dict[str, None] = {}
+        preferred: Dict[str, None] = {}
+        skill_ids: Set[int] = set()
+        required_ids: Set[int] = set()
+        preferred_ids: Set[int] = set()
+        levels: Set[str] = set()
+        years: List[int] = []
+        required_years: List[int] = []
+        # A heading's section ("Nice to have:") covers the lines under it,
+        # until the next heading or a blank line
+        section: Optional[str] = None
+        for line_number, line in enumerate(self.compact.splitlines()):
+            line = _WHITESPACE_RE.sub(" ", line).strip()
+            if not line:
+                section = None
+                continue
+            heading = _is_heading(line)
+            # A short first line is the job title
+            title = heading or (line_number == 0 and len(line) <= _HEADING_MAX_CHARS)
+            levels.update(_seniority_words(line, title))
+            for sentence in _SENTENCE_SPLIT_RE.split(line):
+                sentence_skills = skill_taxonomy.skill_ids(sentence)
+                skill_ids |= sentence_skills
+                sentence_years = [int(match) for match in _YEARS_RE.findall(sentence)]
+                years += sentence_years
+                cue = _cue_section(sentence)
+                # "preferred" cues win over the section; the section wins over
+                # generic required cues ("experience with" under "Nice to have")
+                kind = cue if heading or cue == "preferred" else section or cue
+                if kind is None:
+                    continue
+                if kind == "required" and (heading or section == "required"):
+                    required_years += sentence_years
+                if kind == "preferred":
+                    target, target_ids = preferred, preferred_ids
+                else:
+                    target, target_ids = required, required_ids
+                target_ids |= sentence_skills
+                for keyword_id in sorted(self.matcher.find(skill_taxonomy.canonical_tokens(sentence))):
+                    keyword = self.keywords[keyword_id]
+                    if keyword[0] not in SENIORITY_LEVELS:
+                        target.setdefault(" ".join(keyword))
+            if heading:
+                section = _cue_section(line)
+
+        self.required_skills: List[str] = list(required)
+        self.preferred_skills: List[str] = [skill for skill in preferred if skill not in required]
+        # Taxonomy skill IDs (see skill_taxonomy)
+        self.skill_ids: FrozenSet[int] = frozenset(skill_ids)
+        self.required_skill_ids: FrozenSet[int] = frozenset(required_ids)
+        self.preferred_skill_ids: FrozenSet[int] = frozenset(preferred_ids - required_ids)
+
+        self.seniority_terms: List[str] = sorted(levels, key=SENIORITY_LEVELS.get)
+        self.seniority_level: Optional[str] = self.seniority_terms[-1] if levels else None
+        # Years of experience the role asks for: the most named under a
+        # requirements heading ("5+ years of Python" over "1 year with
+        # Docker"), else the most named anywhere
+        years = required_years or years
+        self.min_years: Optional[int] = max(years) if years else None
+
+    def prompt_summary(self) -> str:
+        """Short requirements digest to include in LLM prompts"""
+        lines = []
+        if self.required_skills:
+            lines.append(f"Key requirements: {', '.join(self.required_skills)}")
+        if self.preferred_skills:
+            lines.append(f"Nice to have: {', '.join(self.preferred_skills)}")
+        seniority = []
+        if self.seniority_level:
+            seniority.append(self.seniority_level)
+        if self.min_years is not None:
+            seniority.append(f"{self.min_years}+ years")
+        if seniority:
+            lines.append(f"Seniority: {', '.join(seniority)}")
+        return "\n".join(lines)
+
+
+class JobDescriptionCache:
+    """Bounded LRU of parsed JDs, keyed by JD hash"""
+
+    def __init__(self):
+        self._parsed: TTLCache[ParsedJobDescription] = TTLCache(
+            maxsize=settings.PARSED_JD_CACHE_MAX_ENTRIES,
+            ttl=settings.PARSED_JD_CACHE_TTL_SECONDS
+        )
+
+    def get(self, job_description: str) -> ParsedJobDescription:
+        key = content_hash(job_description)
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            parsed = ParsedJobDescription(job_description, key)
+            self._parsed.set(key, parsed)
+        return parsed
+
+    def stats(self) -> dict:
+        return self._parsed.stats()
+
+
+parsed_job_descriptions = JobDescriptionCache()
@@ -0,0 +1,140 @@
+"""
+Keyword Matcher
+
+Finds which job-description keywords appear in a resume, for the ATS
+keyword score and the keywordAnalysis of tailoring responses.
+
+A JD's keywords (single terms and multi-word phrases) are compiled once
+into an Aho-Corasick automaton over tokens. Matching a resume is then one
+linear pass over its token stream, however many keywords the JD has.
+Working on tokens gives case folding and word boundaries for free: "Java"
+never matches inside "JavaScript". Both sides are tokenized with skill
+aliases canonicalized, so "k8s" in a resume satisfies "Kubernetes". The
+compiled matcher is part of the ParsedJobDescription cached per JD hash
+(see job_description), so re-scoring the same JD against an edited resume
+skips keyword extraction and compilation.
+"""
+import re
+from collections import Counter, deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+from app.services.skill_taxonomy import skill_taxonomy
+
+# Words common in job descriptions that say nothing about the role's
+# requirements; they are never reported as missing keywords
+JD_FILLER_WORDS = frozenset("""
+ability able across apply based benefits best bonus candidate candidates company work working
+demonstrated desirable desired ensure environment etc excellent experience experienced familiarity
+good great help ideal ideally include includes including join just knowledge like looking make must need new
+nice offer offers opportunity part plus points position preferred proven re related required requirements
+responsibilities responsible role skills strong team teams understanding use using well
+will year years
+build building collaborate collaborating create creating deliver delivering design designing
+develop developing drive driving engineers fast get grow growing improve improving lead
+maintain maintaining manage managers mentor mentoring own partner run runs scale
+ship support supporting take write writing
+""".split())
+
+# Runs of two or three Capitalized words ("Google Cloud", "Machine Learning")
+_PHRASE_RE = re.compile(r"\b[A-Z][\w+#.]*(?:[ \t]+[A-Z][\w+#.]*){1,2}\b")
+# Words with a capital letter ("Kafka", "gRPC", "SQL")
+_CAPITALIZED_RE = re.compile(r"\b\w*[A-Z][\w+#.]*")
+# Sentence or line breaks, and the first word after one, which is
+# capitalized whatever it is
+_LINE_SPLIT_RE = re.compile(r"(?<=[.!?:;])\s+|\n+")
+_LEADING_WORD_RE = re.compile(r"^\W*[\w+#.]+")
+
+
+def extract_keywords(job_description: str) -> List[Tuple[str, ...]]:
+    """
+    Keywords of a whole JD as token tuples: capitalized multi-word phrases,
+    then single terms in order of first appearance.
+
+    Ordinary prose is not a keyword. A single term counts when it is a
+    taxonomy skill, is written capitalized mid-sentence ("with Kafka"), or
+    occurs more than once in the JD.
+    """
+    tokens = skill_taxonomy.canonical_tokens(job_description)
+    counts = Counter(tokens)
+    notable: Set[str] = set()
+    keywords: Dict[Tuple[str, ...], None] = {}
+    # Per sentence, so a phrase never spans one ("Strong AWS. Kafka skills")
+    for sentence in _LINE_SPLIT_RE.split(job_description):
+        for phrase in _PHRASE_RE.findall(sentence):
+            phrase_tokens = tuple(
+                token for token in skill_taxonomy.canonical_tokens(phrase) if token not in JD_FILLER_WORDS
+            )
+            if len(phrase_tokens) > 1:
+                keywords.setdefault(phrase_tokens)
+        for word in _CAPITALIZED_RE.findall(_LEADING_WORD_RE.sub("", sentence, count=1)):
+            notable.update(skill_taxonomy.canonical_tokens(word))
+
+    for skill_id in skill_taxonomy.skill_ids(job_description):
+        skill_tokens = tuple(skill_taxonomy.canonical_tokens(skill_taxonomy.name(skill_id)))
+        if len(skill_tokens) > 1:
+            keywords.setdefault(skill_tokens)
+        else:
+            notable.update(skill_tokens)
+    for token in tokens:
+        if token in JD_FILLER_WORDS or not any(char.isalpha() for char in token):
+            continue
+        if token in notable or counts[token] > 1:
+            keywords.setdefault((token,))
+    return list(keywords)
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over token sequences"""
+
+    def __init__(self, keywords: Iterable[Tuple[str, ...]]):
+        self.keywords: List[Tuple[str, ...]] = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for keyword_id, tokens in enumerate(self.keywords):
+            state = 0
+            for token in tokens:
+                next_state = self._goto[state].get(token)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][token] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(keyword_id)
+
+        # Breadth-first: a state's failure link is the longest proper suffix
+        # of its path that is also a path from the root
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(token, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, tokens: Iterable[str]) -> Set[int]:
+        """IDs of the keywords that occur in `tokens` (one linear scan)"""
+        goto, fail, output = self._goto, self._fail, self._output
+        found: Set[int] = set()
+        state = 0
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+    def match(self, text: str) -> Tuple[List[str], List[str]]:
+        """(matched, missing) keywords for `text`, each in JD order"""
+        found = self.find(skill_taxonomy.canonical_tokens(text))
+        matched, missing = [], []
+        for keyword_id, tokens in enumerate(self.keywords):
+            (matched if keyword_id in found else missing).append(" ".join(tokens))
+        return matched, missing
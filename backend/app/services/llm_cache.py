@@ -0,0 +1,329 @@
+"""
+LLM Response Cache
+
+Content-addressed cache for the section tailoring and generation methods
+of BaseAIService. Re-running /ai/tailor-resume with the same profile and
+job description (page reload, retry) is answered from the cache instead
+of re-billing the provider.
+
+Keys are a SHA-256 over the method name, provider, model and the
+canonical JSON of the method's inputs. There are two tiers:
+- an in-memory LRU (always on)
+- an optional SQLite file (LLM_CACHE_SQLITE_PATH) that survives restarts
+
+Concurrent identical calls share one provider request.
+
+CachedAIService is also where job descriptions are swapped for their
+compact form (boilerplate removed, see jd_compactor) before they reach the
+provider and the cache key, so every AI method gets the compact JD.
+"""
+import asyncio
+import copy
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+from app.core.cache import TTLCache, content_hash, to_jsonable
+from app.core.config import settings
+from app.models.resume import ResumeData, Skills, Experience, Education, Project
+from app.services.base_ai_service import BaseAIService, StreamChunk
+from app.services.jd_compactor import compaction_stats
+from app.services.job_description import parsed_job_descriptions
+
+HOUR = 3600
+
+
+def _list_of(model: type) -> Callable[[Any], List[BaseModel]]:
+    return lambda data: [model(**item) for item in data]
+
+
+# method name -> (TTL in seconds, decoder for the cached JSON value)
+CACHED_METHODS: Dict[str, tuple] = {
+    "tailor_summary": (24 * HOUR, str),
+    "tailor_experience": (24 * HOUR, _list_of(Experience)),
+    "tailor_skills": (24 * HOUR, lambda data: Skills(**data)),
+    "tailor_projects": (24 * HOUR, _list_of(Project)),
+    "tailor_education": (24 * HOUR, _list_of(Education)),
+    "calculate_ats_score": (6 * HOUR, copy.deepcopy),
+    "generate_cover_letter": (6 * HOUR, str),
+    "generate_proposal": (6 * HOUR, copy.deepcopy),
+}
+
+
+class _SQLiteTier:
+    """Persistent second tier. All calls run in a worker thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        self._conn = conn
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value_json, expires_at) for a live entry"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+        return row
+
+    def set(self, key: str, value: str, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+
+
+class LLMResponseCache:
+    """Two-tier (memory, optional SQLite) cache of LLM method results"""
+
+    def __init__(self, maxsize: int, max_ttl: float, sqlite_path: str = ""):
+        self.memory: TTLCache[Any] = TTLCache(maxsize=maxsize, ttl=max_ttl)
+        self.disk = _SQLiteTier(sqlite_path) if sqlite_path else None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.shared_inflight = 0
+
+    async def open(self) -> None:
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.open)
+
+    async def close(self) -> None:
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.close)
+
+    @staticmethod
+    def make_key(method: str, provider: str, model: str, inputs: list) -> str:
+        return content_hash(method, provider, model, inputs)
+
+    async def get(self, key: str, decode: Callable[[Any], Any]) -> Any:
+        """Look up both tiers; returns None on a miss"""
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory_hits += 1
+            return decode(data)
+
+        if self.disk is not None:
+            row = await asyncio.to_thread(self.disk.get, key)
+            if row is not None:
+                value_json, expires_at = row
+                data = json.loads(value_json)
+                self.memory.set(key, data, ttl=expires_at - time.time())
+                self.disk_hits += 1
+                return decode(data)
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        data = to_jsonable(value)
+        self.memory.set(key, data, ttl=ttl)
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(
+                    self.disk.set, key, json.dumps(data, ensure_ascii=False), time.time() + ttl
+                )
+            except Exception as e:
+                print(f"LLM cache disk write failed: {e}")
+
+    async def get_or_call(
+        self,
+        key: str,
+        ttl: float,
+        decode: Callable[[Any], Any],
+        call: Callable[[], Any],
+        bypass: bool = False
+    ) -> Any:
+        """
+        Return the cached result or run `call()` and store its result.
+
+        With `bypass`, the lookup is skipped but the fresh result still
+        replaces the cached one.
+        """
+        if bypass:
+            self.bypasses += 1
+        else:
+            cached = await self.get(key, decode)
+            if cached is not None:
+                return cached
+
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                try:
+                    result = await asyncio.shield(inflight)
+                    self.shared_inflight += 1
+                    return decode(to_jsonable(result))
+                except asyncio.CancelledError:
+                    # The leading request was cancelled (client went away);
+                    # re-raise only if this request is the one being cancelled.
+                    if not inflight.cancelled():
+                        raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+            future.set_result(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved; callers sharing this future re-raise it themselves
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        await self.set(key, result, ttl)
+        return result
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory": self.memory.stats(),
+            "disk_enabled": self.disk is not None,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "shared_inflight": self.shared_inflight,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0
+        }
+
+
+class CachedAIService(BaseAIService):
+    """
+    Wraps a provider service: job descriptions are compacted, and the
+    cacheable methods are answered from LLMResponseCache (when `cache` is
+    set). Everything else is passed through unchanged.
+    """
+
+    def __init__(self, inner: BaseAIService, cache: Optional[LLMResponseCache], bypass: bool = False):
+        super().__init__(inner.api_key, inner.model)
+        self.inner = inner
+        self.cache = cache
+        self.bypass = bypass
+
+    @property
+    def provider_name(self) -> str:
+        return self.inner.provider_name
+
+    @staticmethod
+    def _compact(job_description: str) -> str:
+        parsed = parsed_job_descriptions.get(job_description)
+        if parsed.compaction is not None:
+            compaction_stats.record(parsed.compaction)
+        return parsed.compact
+
+    async def _cached(self, method: str, *args) -> Any:
+        if self.cache is None:
+            return await getattr(self.inner, method)(*args)
+        ttl, decode = CACHED_METHODS[method]
+        key = self.cache.make_key(method, self.provider_name, self.model, list(args))
+        return await self.cache.get_or_call(
+            key, ttl, decode, lambda: getattr(self.inner, method)(*args), bypass=self.bypass
+        )
+
+    def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[StreamChunk]:
+        # Streams are never cached
+        return self.inner.stream_completion(messages, temperature, max_tokens)
+
+    async def generate_summary(self, experience: str) -> str:
+        return await self.inner.generate_summary(experience)
+
+    async def tailor_summary(
+        self,
+        additional_info: str,
+        skills: Skills,
+        experience: List[Experience],
+        job_description: str
+    ) -> str:
+        return await self._cached("tailor_summary", additional_info, skills, experience, self._compact(job_description))
+
+    async def tailor_experience(
+        self,
+        experience: List[Experience],
+        job_description: str
+    ) -> List[Experience]:
+        return await self._cached("tailor_experience", experience, self._compact(job_description))
+
+    async def tailor_skills(
+        self,
+        skills: Skills,
+        job_description: str
+    ) -> Skills:
+        return await self._cached("tailor_skills", skills, self._compact(job_description))
+
+    async def tailor_projects(
+        self,
+        projects: List[Project],
+        job_description: str
+    ) -> List[Project]:
+        return await self._cached("tailor_projects", projects, self._compact(job_description))
+
+    async def tailor_education(
+        self,
+        education: List[Education],
+        job_description: str
+    ) -> List[Education]:
+        return await self._cached("tailor_education", education, self._compact(job_description))
+
+    async def calculate_ats_score(
+        self,
+        resume_data: ResumeData,
+        job_description: str
+    ) -> dict:
+        return await self._cached("calculate_ats_score", resume_data, self._compact(job_description))
+
+    async def generate_cover_letter(
+        self,
+        profile_data: ResumeData,
+        job_description: str,
+        instructions: str = ""
+    ) -> str:
+        return await self._cached("generate_cover_letter", profile_data, self._compact(job_description), instructions)
+
+    async def generate_proposal(
+        self,
+        profile_data: ResumeData,
+        job_description: str
+    ) -> dict:
+        return await self._cached("generate_proposal", profile_data, self._compact(job_description))
+
+
+llm_cache = LLMResponseCache(
+    maxsize=settings.LLM_CACHE_MAX_ENTRIES,
+    max_ttl=settings.LLM_CACHE_TTL_SECONDS,
+    sqlite_path=settings.LLM_CACHE_SQLITE_PATH
+)
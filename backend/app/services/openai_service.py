@@ -11,19 +11,68 @@ Usage:
     The user configures their API key via the Settings page.
     The AIServiceFactory instantiates this class automatically.
 """
+import httpx
 from openai import AsyncOpenAI
-from typing import List
-from app.services.base_ai_service import BaseAIService
+from typing import AsyncIterator, Dict, List, Optional
+from app.services.base_ai_service import BaseAIService, CompletionUsage, StreamChunk
 from app.models.resume import ResumeData, Skills, Experience, Education, Project
 
 
 class OpenAIService(BaseAIService):
     """AI service implementation using OpenAI GPT models"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gpt-4o-mini",
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
         super().__init__(api_key, model)
-        # TODO: Initialize the async OpenAI client
-        # self.client = AsyncOpenAI(api_key=api_key)
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream with stream=True; the last event carries the usage"""
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if max_tokens is not None:
+            options["max_tokens"] = max_tokens
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True},
+                timeout=self._request_timeout(),
+                **options
+            )
+            usage, finish_reason = CompletionUsage(), None
+            # Closing the stream aborts the request if the consumer stops early
+            async with stream:
+                async for chunk in stream:
+                    if chunk.choices:
+                        choice = chunk.choices[0]
+                        if choice.delta.content:
+                            yield StreamChunk(delta=choice.delta.content)
+                        finish_reason = choice.finish_reason or finish_reason
+                    if chunk.usage:
+                        usage = CompletionUsage(
+                            promptTokens=chunk.usage.prompt_tokens,
+                            completionTokens=chunk.usage.completion_tokens,
+                            totalTokens=chunk.usage.total_tokens
+                        )
+        except Exception as e:
+            self._handle_rate_limit_error(str(e))
+            raise
+        yield StreamChunk(finishReason=finish_reason, usage=usage)
 
     async def generate_summary(self, experience: str) -> str:
         """
@@ -57,6 +106,7 @@ class OpenAIService(BaseAIService):
 
         TODO: Implement using self.client.chat.completions.create()
               Use response_format={"type": "json_object"} for structured output.
+              Pass timeout=self._request_timeout() to respect the request deadline.
         """
         raise NotImplementedError("TODO: Implement tailor_experience with OpenAI API")
 
@@ -120,7 +170,7 @@ class OpenAIService(BaseAIService):
         Generate a personalized cover letter.
 
         TODO: Implement using self.client.chat.completions.create()
-              Use self._clean_cover_letter() to strip greeting/closing.
+              Use self.clean_cover_letter() to strip greeting/closing.
         """
         raise NotImplementedError("TODO: Implement generate_cover_letter with OpenAI API")
 
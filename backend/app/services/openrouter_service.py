@@ -7,15 +7,16 @@ through a single unified API with the same OpenAI-compatible interface.
 
 Setup:
     Get your API key from: https://openrouter.ai/
-    No additional packages needed (uses httpx or openai client)
+    No additional packages needed (uses httpx)
 
 Usage:
     The user configures their API key via the Settings page.
     The AIServiceFactory instantiates this class automatically.
 """
+import json
 import httpx
-from typing import List, Optional
-from app.services.base_ai_service import BaseAIService
+from typing import AsyncIterator, Dict, List, Optional
+from app.services.base_ai_service import BaseAIService, CompletionUsage, StreamChunk
 from app.models.resume import ResumeData, Skills, Experience, Education, Project
 
 
@@ -29,35 +30,86 @@ class OpenRouterService(BaseAIService):
         api_key: str,
         model: str = "anthropic/claude-3.5-sonnet",
         site_url: Optional[str] = None,
-        app_name: Optional[str] = "Resumyx"
+        app_name: Optional[str] = "Resumyx",
+        http_client: Optional[httpx.AsyncClient] = None
     ):
         super().__init__(api_key, model)
         self.site_url = site_url or ""
         self.app_name = app_name or "Resumyx"
 
-        # TODO: Initialize HTTP client
-        # self.headers = {
-        #     "Authorization": f"Bearer {api_key}",
-        #     "HTTP-Referer": self.site_url,
-        #     "X-Title": self.app_name,
-        #     "Content-Type": "application/json"
-        # }
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": self.site_url,
+            "X-Title": self.app_name,
+            "Content-Type": "application/json"
+        }
+        # Long-lived client so requests reuse pooled keep-alive connections
+        self.http_client = http_client or httpx.AsyncClient()
+
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
 
     async def _chat(self, messages: list, **kwargs) -> str:
-        """
-        Send a chat completion request to OpenRouter.
-
-        TODO: Implement using httpx.AsyncClient or OpenAI client pointed at OpenRouter
-        Example:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.OPENROUTER_API_URL,
-                    headers=self.headers,
-                    json={"model": self.model, "messages": messages, **kwargs}
-                )
-                return response.json()["choices"][0]["message"]["content"]
-        """
-        raise NotImplementedError("TODO: Implement _chat with OpenRouter API")
+        """Send a chat completion request to OpenRouter."""
+        response = await self.http_client.post(
+            self.OPENROUTER_API_URL,
+            headers=self.headers,
+            json={"model": self.model, "messages": messages, **kwargs},
+            timeout=self._request_timeout(self.http_client.timeout)
+        )
+        if response.status_code >= 400:
+            self._handle_rate_limit_error(f"{response.status_code} {response.text}")
+            raise Exception(f"OpenRouter request failed ({response.status_code}): {response.text}")
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> AsyncIterator[StreamChunk]:
+        """Stream by parsing OpenRouter's SSE response (OpenAI chunk format)"""
+        payload = {"model": self.model, "messages": messages, "stream": True, "usage": {"include": True}}
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if max_tokens is not None:
+            payload["max_tokens"] = max_tokens
+
+        usage, finish_reason = CompletionUsage(), None
+        async with self.http_client.stream(
+            "POST",
+            self.OPENROUTER_API_URL,
+            headers=self.headers,
+            json=payload,
+            timeout=self._request_timeout(self.http_client.timeout)
+        ) as response:
+            if response.status_code >= 400:
+                body = (await response.aread()).decode(errors="replace")
+                self._handle_rate_limit_error(f"{response.status_code} {body}")
+                raise Exception(f"OpenRouter request failed ({response.status_code}): {body}")
+            async for line in response.aiter_lines():
+                # Lines starting with ":" are keep-alive comments
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if "error" in event:
+                    raise Exception(f"OpenRouter stream failed: {event['error'].get('message', event['error'])}")
+                if event.get("choices"):
+                    choice = event["choices"][0]
+                    content = (choice.get("delta") or {}).get("content")
+                    if content:
+                        yield StreamChunk(delta=content)
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                if event.get("usage"):
+                    usage = CompletionUsage(
+                        promptTokens=event["usage"].get("prompt_tokens", 0),
+                        completionTokens=event["usage"].get("completion_tokens", 0),
+                        totalTokens=event["usage"].get("total_tokens", 0)
+                    )
+        yield StreamChunk(finishReason=finish_reason, usage=usage)
 
     async def generate_summary(self, experience: str) -> str:
         """TODO: Implement generate_summary with OpenRouter API"""
@@ -124,7 +176,7 @@ class OpenRouterService(BaseAIService):
     ) -> str:
         """
         TODO: Implement generate_cover_letter with OpenRouter API
-              Use self._clean_cover_letter() to strip greeting/closing.
+              Use self.clean_cover_letter() to strip greeting/closing.
         """
         raise NotImplementedError("TODO: Implement generate_cover_letter with OpenRouter API")
 
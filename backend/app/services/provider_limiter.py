@@ -0,0 +1,79 @@
+"""
+Per-API-key concurrency limiter for AI provider calls.
+
+Provider rate limits are per API key, so in-flight calls are capped per
+key (AI_MAX_INFLIGHT_PER_KEY) rather than per request. A batch of many job
+descriptions then queues behind the cap instead of tripping 429s, and two
+concurrent requests from the same user share the same allowance.
+"""
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+from app.core.config import settings
+from app.core.deadline import Deadline
+
+
+class ProviderLimiter:
+    def __init__(self, max_inflight_per_key: int):
+        self.max_inflight_per_key = max_inflight_per_key
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Callers holding or waiting for a slot, per key; idle keys are dropped
+        self._users: Dict[str, int] = {}
+        self.acquired = 0
+        self.waited = 0
+        self.timeouts = 0
+
+    @staticmethod
+    def _key(api_key: str) -> str:
+        return hashlib.sha256(api_key.encode()).hexdigest()
+
+    @asynccontextmanager
+    async def slot(self, api_key: str, deadline: Optional[Deadline] = None) -> AsyncIterator[None]:
+        """
+        Hold one in-flight slot for `api_key` while the body runs.
+
+        Raises:
+            asyncio.TimeoutError: If the deadline passes while waiting for a slot
+        """
+        key = self._key(api_key)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(self.max_inflight_per_key)
+        self._users[key] = self._users.get(key, 0) + 1
+
+        try:
+            if semaphore.locked():
+                self.waited += 1
+            if deadline is None or not semaphore.locked():
+                # A free slot is taken without suspending
+                await semaphore.acquire()
+            else:
+                try:
+                    await deadline.run(semaphore.acquire())
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    raise
+            self.acquired += 1
+            try:
+                yield
+            finally:
+                semaphore.release()
+        finally:
+            self._users[key] -= 1
+            if not self._users[key]:
+                del self._users[key]
+                del self._semaphores[key]
+
+    def stats(self) -> dict:
+        return {
+            "max_inflight_per_key": self.max_inflight_per_key,
+            "active_keys": len(self._semaphores),
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "timeouts": self.timeouts
+        }
+
+
+provider_limiter = ProviderLimiter(max_inflight_per_key=settings.AI_MAX_INFLIGHT_PER_KEY)
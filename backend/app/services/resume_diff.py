@@ -0,0 +1,283 @@
+"""
+Resume Diff
+
+Server-side diff of a tailored resume against the original, for the
+`changes` of tailoring responses, so the frontend doesn't diff large
+resumes in the browser.
+
+- Experience, project and education entries are aligned by ID.
+- Bullets within an entry are aligned by exact text first, then greedily
+  by token similarity (Jaccard) among the rest. Entries hold a handful of
+  bullets, so the pairwise step stays small; above MAX_PAIRWISE_BULLETS
+  pairs, leftovers are aligned by position.
+- Aligned text pairs get a word-level Myers diff after trimming the
+  common prefix and suffix, returned as WordEdit runs. It takes O((N+M)D)
+  time and O(D^2) memory for D edits, so texts over MAX_DIFF_WORDS are
+  reported as one replacement instead.
+- Skill and technology lists are compared as lists: added, removed or
+  reordered items.
+
+A change's reason names the JD keywords the new text adds, when a parsed
+JD is given.
+"""
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from app.models.resume import ChangeDetail, ResumeData, TailoredResumeData, WordEdit
+from app.services.job_description import ParsedJobDescription
+from app.services.skill_taxonomy import skill_taxonomy
+from app.services.tailoring_service import original_section
+from app.services.text_utils import tokenize
+
+# Bullets below this token similarity are an addition plus a removal, not an edit
+MIN_BULLET_SIMILARITY = 0.2
+# Above this many leftover bullet pairs in one entry, align by position
+MAX_PAIRWISE_BULLETS = 400
+# Texts longer than this (in words, both sides, after trimming the common
+# prefix and suffix) are diffed as one replacement. Bounds one diff to about
+# 35 ms and 2 MB (two disjoint 250-word texts)
+MAX_DIFF_WORDS = 500
+
+_SKILL_CATEGORIES = ("languages", "databases", "cloud", "tools")
+
+
+def _myers(a: Sequence[str], b: Sequence[str]) -> List[Tuple[str, str]]:
+    """Shortest edit script from `a` to `b` as (op, word) pairs"""
+    n, m = len(a), len(b)
+    offset = n + m + 1
+    v = [0] * (2 * offset + 1)
+    # Before round d only diagonals -d-1..d+1 matter: keep just that band
+    trace: List[List[int]] = []
+    for d in range(n + m + 1):
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _backtrack(a, b, trace)
+    return []
+
+
+def _backtrack(a: Sequence[str], b: Sequence[str], trace: List[List[int]]) -> List[Tuple[str, str]]:
+    edits: List[Tuple[str, str]] = []
+    x, y = len(a), len(b)
+    for d in range(len(trace) - 1, -1, -1):
+        # trace[d] starts at diagonal -d-1
+        v, offset = trace[d], d + 1
+        k = x - y
+        if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+            previous_k = k + 1
+        else:
+            previous_k = k - 1
+        previous_x = v[offset + previous_k]
+        previous_y = previous_x - previous_k
+        while x > previous_x and y > previous_y:
+            x -= 1
+            y -= 1
+            edits.append(("equal", a[x]))
+        if d > 0:
+            if x == previous_x:
+                edits.append(("insert", b[previous_y]))
+            else:
+                edits.append(("delete", a[previous_x]))
+        x, y = previous_x, previous_y
+    edits.reverse()
+    return edits
+
+
+def word_diff(before: str, after: str) -> List[WordEdit]:
+    """Word-level edits from `before` to `after`, consecutive words of one op merged"""
+    a, b = before.split(), after.split()
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < len(a) - prefix and suffix < len(b) - prefix and a[-1 - suffix] == b[-1 - suffix]:
+        suffix += 1
+
+    middle_a, middle_b = a[prefix:len(a) - suffix], b[prefix:len(b) - suffix]
+    if len(middle_a) + len(middle_b) > MAX_DIFF_WORDS:
+        middle = [("delete", word) for word in middle_a] + [("insert", word) for word in middle_b]
+    else:
+        middle = _myers(middle_a, middle_b)
+    edits = [("equal", word) for word in a[:prefix]] + middle + [("equal", word) for word in a[len(a) - suffix:]]
+
+    return [
+        WordEdit(op=op, text=" ".join(word for _, word in run))
+        for op, run in groupby(edits, key=itemgetter(0))
+    ]
+
+
+def align_bullets(before: List[str], after: List[str]) -> List[Tuple[Optional[int], Optional[int]]]:
+    """
+    (before index, after index) pairs; None on one side marks an added or
+    removed bullet. Exact matches first, then the most similar pairs.
+    """
+    pairs: List[Tuple[Optional[int], Optional[int]]] = []
+    unmatched: Dict[str, List[int]] = {}
+    for index, text in enumerate(before):
+        unmatched.setdefault(text, []).append(index)
+    left_after = []
+    for index, text in enumerate(after):
+        same = unmatched.get(text)
+        if same:
+            pairs.append((same.pop(0), index))
+        else:
+            left_after.append(index)
+    left_before = [index for indices in unmatched.values() for index in indices]
+
+    if len(left_before) * len(left_after) > MAX_PAIRWISE_BULLETS:
+        pairs += list(zip(left_before, left_after))
+        used_before = set(left_before[:len(left_after)])
+        used_after = set(left_after[:len(left_before)])
+    else:
+        terms_before = {index: set(tokenize(before[index])) for index in left_before}
+        terms_after = {index: set(tokenize(after[index])) for index in left_after}
+        candidates = []
+        for i, terms_i in terms_before.items():
+            for j, terms_j in terms_after.items():
+                union = len(terms_i | terms_j)
+                similarity = len(terms_i & terms_j) / union if union else 1.0
+                if similarity >= MIN_BULLET_SIMILARITY:
+                    candidates.append((similarity, -j, i, j))
+        candidates.sort(reverse=True)
+        used_before, used_after = set(), set()
+        for _, _, i, j in candidates:
+            if i not in used_before and j not in used_after:
+                used_before.add(i)
+                used_after.add(j)
+                pairs.append((i, j))
+
+    pairs += [(None, j) for j in left_after if j not in used_after]
+    pairs += [(i, None) for i in left_before if i not in used_before]
+    return pairs
+
+
+class _Differ:
+    """Collects the changes between one original and tailored resume"""
+
+    def __init__(self, job: Optional[ParsedJobDescription]):
+        self.changes: List[ChangeDetail] = []
+        self.job_terms: Set[str] = (
+            {keyword[0] for keyword in job.keywords if len(keyword) == 1} if job is not None else set()
+        )
+
+    def _reason(self, before: str, after: str, edits: List[WordEdit]) -> str:
+        reason = "Added" if not before else "Removed" if not after else "Reworded"
+        if not self.job_terms:
+            return reason
+        inserted = " ".join(edit.text for edit in edits if edit.op == "insert") if before else after
+        existing = set(skill_taxonomy.canonical_tokens(before))
+        added: Dict[str, None] = {}
+        for term in skill_taxonomy.canonical_tokens(inserted):
+            if term in self.job_terms and term not in existing:
+                added.setdefault(term)
+        if added:
+            reason += f"; adds JD keywords: {', '.join(added)}"
+        return reason
+
+    def text(self, section: str, field: str, before: str, after: str) -> None:
+        if before == after:
+            return
+        edits = word_diff(before, after) if before and after else []
+        self.changes.append(ChangeDetail(
+            section=section,
+            field=field,
+            before=before,
+            after=after,
+            reason=self._reason(before, after, edits),
+            wordDiff=edits
+        ))
+
+    def items(self, section: str, field: str, before: List[str], after: List[str]) -> None:
+        if before == after:
+            return
+        before_keys = {item.strip().lower() for item in before}
+        after_keys = {item.strip().lower() for item in after}
+        added = [item for item in after if item.strip().lower() not in before_keys]
+        removed = [item for item in before if item.strip().lower() not in after_keys]
+        parts = []
+        if added:
+            parts.append(f"Added: {', '.join(added)}")
+        if removed:
+            parts.append(f"Removed: {', '.join(removed)}")
+        self.changes.append(ChangeDetail(
+            section=section,
+            field=field,
+            before=", ".join(before),
+            after=", ".join(after),
+            reason="; ".join(parts) or "Reordered"
+        ))
+
+    def bullets(self, section: str, path: str, before_path: str, before: List[str], after: List[str]) -> None:
+        if before == after:
+            return
+        for i, j in align_bullets(before, after):
+            if j is None:
+                self.text(section, f"{before_path}.description[{i}]", before[i], "")
+            else:
+                self.text(section, f"{path}.description[{j}]", before[i] if i is not None else "", after[j])
+
+
+def diff_resumes(
+    original: ResumeData,
+    tailored: TailoredResumeData,
+    job: Optional[ParsedJobDescription] = None
+) -> List[ChangeDetail]:
+    """Changes from the original to the tailored resume, in resume order"""
+    differ = _Differ(job)
+    differ.text("summary", "summary", original_section(original, "summary"), tailored.summary)
+
+    for category in _SKILL_CATEGORIES:
+        differ.items("skills", f"skills.{category}", getattr(original.skills, category), getattr(tailored.skills, category))
+
+    originals = {exp.id: (index, exp) for index, exp in enumerate(original.experience)}
+    for index, exp in enumerate(tailored.experience):
+        path = f"experience[{index}]"
+        source_index, source = originals.pop(exp.id, (None, None))
+        if source is None:
+            differ.text("experience", f"{path}.role", "", f"{exp.role} @ {exp.company}")
+            differ.bullets("experience", path, path, [], exp.description)
+            continue
+        for name in ("company", "role", "location", "startDate", "endDate"):
+            differ.text("experience", f"{path}.{name}", getattr(source, name), getattr(exp, name))
+        differ.bullets("experience", path, f"experience[{source_index}]", source.description, exp.description)
+    for source_index, source in originals.values():
+        differ.text("experience", f"experience[{source_index}]", f"{source.role} @ {source.company}", "")
+
+    originals = {project.id: (index, project) for index, project in enumerate(original.projects)}
+    for index, project in enumerate(tailored.projects):
+        path = f"projects[{index}]"
+        source_index, source = originals.pop(project.id, (None, None))
+        if source is None:
+            differ.text("projects", f"{path}.name", "", project.name)
+            differ.items("projects", f"{path}.technologies", [], project.technologies)
+            differ.bullets("projects", path, path, [], project.description)
+            continue
+        differ.text("projects", f"{path}.name", source.name, project.name)
+        differ.items("projects", f"{path}.technologies", source.technologies, project.technologies)
+        differ.bullets("projects", path, f"projects[{source_index}]", source.description, project.description)
+    for source_index, source in originals.values():
+        differ.text("projects", f"projects[{source_index}]", source.name, "")
+
+    originals = {edu.id: (index, edu) for index, edu in enumerate(original.education)}
+    for index, edu in enumerate(tailored.education):
+        path = f"education[{index}]"
+        source_index, source = originals.pop(edu.id, (None, None))
+        if source is None:
+            differ.text("education", path, "", f"{edu.degree}, {edu.institution}")
+            continue
+        for name in ("institution", "degree", "location", "graduationDate"):
+            differ.text("education", f"{path}.{name}", getattr(source, name), getattr(edu, name))
+    for source_index, source in originals.values():
+        differ.text("education", f"education[{source_index}]", f"{source.degree}, {source.institution}", "")
+
+    return differ.changes
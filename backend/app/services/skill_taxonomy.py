@@ -0,0 +1,164 @@
+"""
+Skill Taxonomy
+
+Normalizes skill mentions to canonical skills, so "k8s" matches
+"Kubernetes" and "Postgres" matches "PostgreSQL" in keyword matching,
+skills alignment and bullet ranking.
+
+The taxonomy ships as app/data/skill_taxonomy.json, one compact row per
+skill: [name, category, [aliases]]. A skill's ID is its row index. It is
+loaded on first use (not at startup) into a trie over alias tokens, so a
+text is normalized in one pass over its tokens with longest-match lookup.
+
+Some names and aliases are also common words ("Go", "Swift", "shell",
+"security"). The taxonomy's "ambiguous" map lists them with the spelling
+that marks the skill in prose ("Go" but not "go", and not as the first
+word of a sentence), or null when only a skill-list context counts. Skill
+lists are "Python, Go", "Go/Rust", "Languages: Go" or a bullet holding
+just the skill. Longer aliases ("golang", "Spring Boot") always match.
+"""
+import json
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.services.text_utils import token_spans, tokenize
+
+TAXONOMY_PATH = Path(__file__).resolve().parent.parent / "data" / "skill_taxonomy.json"
+
+# Trie node key holding the skill ID of an alias that ends at this node
+_SKILL_ID = ""
+# Trie node key marking an ambiguous alias that ends at this node; holds
+# its case-sensitive spelling, or None if only skill lists count
+_AMBIGUOUS = " "
+
+_LIST_BEFORE = (",", "/", "|", ":", "(")
+_LIST_AFTER = (",", "/", "|", ")")
+_BULLET_CHARS = "-*•·●▪◦ \t"
+
+
+def _in_skill_context(text: str, start: int, end: int, spelling: Optional[str]) -> bool:
+    """Whether the ambiguous alias at text[start:end] names the skill"""
+    before = text[:start].rstrip(" \t")
+    after = text[end:].lstrip(" \t")
+    if before.endswith(_LIST_BEFORE) or after.startswith(_LIST_AFTER):
+        return True
+    line_before = before.rsplit("\n", 1)[-1].strip(_BULLET_CHARS)
+    if not line_before and not after.split("\n", 1)[0].strip(" .;"):
+        return True  # Alone on its line
+    if spelling is None or text[start:end] != spelling:
+        return False
+    following = text[end:end + 1]
+    if following == "&" or (len(spelling) == 1 and following == "-"):
+        return False  # "R&D", "C-level"
+    # Every sentence starts with a capital, so only count it mid-sentence
+    return bool(line_before) and not line_before.endswith((".", "!", "?"))
+
+
+class SkillTaxonomy:
+    """Lazily loaded alias trie over the bundled skill taxonomy"""
+
+    def __init__(self, path: Path = TAXONOMY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._names: List[str] = []
+        self._categories: List[str] = []
+        self._canonical_tokens: List[Tuple[str, ...]] = []
+        self._aliases: List[Tuple[str, ...]] = []
+        self._trie: Optional[Dict[str, dict]] = None
+
+    def _load(self) -> Dict[str, dict]:
+        with self._lock:
+            if self._trie is not None:
+                return self._trie
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            rows = data["skills"]
+            ambiguous: Dict[str, Optional[str]] = data.get("ambiguous", {})
+
+            trie: Dict[str, dict] = {}
+            for skill_id, (name, category, aliases) in enumerate(rows):
+                self._names.append(name)
+                self._categories.append(category)
+                self._canonical_tokens.append(tuple(tokenize(name)))
+                self._aliases.append((name, *aliases))
+                for alias in (name, *aliases):
+                    node = trie
+                    for token in tokenize(alias):
+                        node = node.setdefault(token, {})
+                    if node is not trie:
+                        node.setdefault(_SKILL_ID, skill_id)
+                        if alias.lower() in ambiguous:
+                            node[_AMBIGUOUS] = ambiguous[alias.lower()]
+            self._trie = trie
+            return trie
+
+    def _canonicalize(self, text: str) -> Tuple[List[str], Set[int]]:
+        """
+        One left-to-right pass over the tokens of `text`: replace the
+        longest alias match at each position with its skill's canonical
+        tokens. Returns the new tokens and the skill IDs seen.
+        """
+        trie = self._trie or self._load()
+        tokens = tokenize(text)
+        spans: Optional[List[Tuple[int, int]]] = None  # Only needed for ambiguous aliases
+        canonical: List[str] = []
+        skill_ids: Set[int] = set()
+        position, count = 0, len(tokens)
+        while position < count:
+            node = trie.get(tokens[position])
+            if node is None:
+                # Most tokens start no alias
+                canonical.append(tokens[position])
+                position += 1
+                continue
+            match_end, match_id, match_node = position + 1, node.get(_SKILL_ID), node
+            cursor = position + 1
+            while cursor < count:
+                node = node.get(tokens[cursor])
+                if node is None:
+                    break
+                cursor += 1
+                if _SKILL_ID in node:
+                    match_end, match_id, match_node = cursor, node[_SKILL_ID], node
+            if match_id is not None and _AMBIGUOUS in match_node:
+                if spans is None:
+                    spans = token_spans(text)
+                if len(spans) != count or not _in_skill_context(
+                    text, spans[position][0], spans[match_end - 1][1], match_node[_AMBIGUOUS]
+                ):
+                    match_end, match_id = position + 1, None
+            if match_id is None:
+                canonical.append(tokens[position])
+            else:
+                canonical.extend(self._canonical_tokens[match_id])
+                skill_ids.add(match_id)
+            position = match_end
+        return canonical, skill_ids
+
+    def skill_ids(self, text: str) -> FrozenSet[int]:
+        """IDs of every skill mentioned in `text`"""
+        return frozenset(self._canonicalize(text)[1])
+
+    def canonical_tokens(self, text: str) -> List[str]:
+        """tokenize(text) with every skill alias replaced by its canonical name's tokens"""
+        return self._canonicalize(text)[0]
+
+    def name(self, skill_id: int) -> str:
+        if self._trie is None:
+            self._load()
+        return self._names[skill_id]
+
+    def category(self, skill_id: int) -> str:
+        if self._trie is None:
+            self._load()
+        return self._categories[skill_id]
+
+    def aliases(self, skill_id: int) -> Tuple[str, ...]:
+        """The canonical name followed by every alias, as written in the taxonomy"""
+        if self._trie is None:
+            self._load()
+        return self._aliases[skill_id]
+
+
+skill_taxonomy = SkillTaxonomy()
@@ -1,21 +1,49 @@
-from supabase import create_client, Client
+from supabase import create_client, acreate_client, Client, AsyncClient
 from app.core.config import settings
 from app.models.resume import ResumeData, ResumeProfile
 from typing import Optional
 from datetime import datetime
+import asyncio
 
 class SupabaseService:
     def __init__(self):
+        # Sync client is kept for the Supabase Auth helpers in AuthService.
+        # Table queries go through the async client so they never block the event loop.
         self.client: Client = create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_SERVICE_KEY
         )
+        self._async_client: Optional[AsyncClient] = None
+        self._async_client_lock = asyncio.Lock()
         self.table_name = "resume_profiles"
 
+    async def get_async_client(self) -> AsyncClient:
+        """
+        Get the shared async client, creating it on first use.
+
+        All queries on a worker share this client's PostgREST HTTP
+        connection pool.
+        """
+        if self._async_client is None:
+            async with self._async_client_lock:
+                if self._async_client is None:
+                    self._async_client = await acreate_client(
+                        settings.SUPABASE_URL,
+                        settings.SUPABASE_SERVICE_KEY
+                    )
+        return self._async_client
+
+    async def close(self) -> None:
+        """Close the async client's connection pool (called at shutdown)."""
+        if self._async_client is not None:
+            await self._async_client.postgrest.aclose()
+            self._async_client = None
+
     async def get_profile(self, user_id: str) -> Optional[dict]:
         """Get user profile from database"""
         try:
-            response = self.client.table(self.table_name)\
+            client = await self.get_async_client()
+            response = await client.table(self.table_name)\
                 .select("*")\
                 .eq("user_id", user_id)\
                 .execute()
@@ -42,7 +70,8 @@ class SupabaseService:
                 "updated_at": datetime.utcnow().isoformat()
             }
 
-            response = self.client.table(self.table_name)\
+            client = await self.get_async_client()
+            response = await client.table(self.table_name)\
                 .upsert(data)\
                 .execute()
 
@@ -54,7 +83,8 @@ class SupabaseService:
     async def delete_profile(self, user_id: str) -> bool:
         """Delete user profile"""
         try:
-            self.client.table(self.table_name)\
+            client = await self.get_async_client()
+            await client.table(self.table_name)\
                 .delete()\
                 .eq("user_id", user_id)\
                 .execute()
@@ -0,0 +1,256 @@
+"""
+Resume Tailoring Service
+
+Runs the per-section tailoring agents for /ai/tailor-resume and assembles
+the result into TailoredResumeData.
+
+Every section gets an input fingerprint: a hash of the provider, model,
+the profile data the section is generated from, and the job description.
+When a previous tailoring result is available (sent by the client or kept
+server-side per user), sections whose fingerprint hasn't changed are
+reused instead of being sent to the LLM again, so editing one experience
+entry re-runs only the sections that depend on it.
+"""
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel
+from app.core.cache import TTLCache, content_hash
+from app.core.config import settings
+from app.core.deadline import Deadline
+from app.models.resume import ResumeData, TailoredResumeData, TailoringSnapshot
+from app.services.base_ai_service import BaseAIService
+from app.services.provider_limiter import provider_limiter
+
+SECTIONS = ("summary", "experience", "skills", "projects", "education")
+
+# Share of the request's remaining time each section may use. Sections run
+# in parallel, so shares are relative to the whole budget, not split from it;
+# lighter sections get less so a stalled one can't hold the request open.
+SECTION_BUDGET_SHARE = {
+    "summary": 0.8,
+    "experience": 0.95,
+    "skills": 0.7,
+    "projects": 0.9,
+    "education": 0.6,
+}
+
+
+def section_inputs(profile: ResumeData, section: str) -> List[Any]:
+    """Profile data a section is generated from (the JD is added separately)"""
+    if section == "summary":
+        return [profile.additionalInfo, profile.skills, profile.experience]
+    if section == "skills":
+        return [profile.skills]
+    return [getattr(profile, section)]
+
+
+def profile_section_hashes(profile: ResumeData) -> Dict[str, str]:
+    """Hash of each section's profile inputs; independent of the JD, so a batch computes it once"""
+    return {section: content_hash(section_inputs(profile, section)) for section in SECTIONS}
+
+
+def section_fingerprints(
+    ai_service: BaseAIService,
+    profile: ResumeData,
+    job_description: str,
+    input_hashes: Optional[Dict[str, str]] = None
+) -> Dict[str, str]:
+    input_hashes = input_hashes or profile_section_hashes(profile)
+    jd_hash = content_hash(job_description)
+    return {
+        section: content_hash(
+            section, ai_service.provider_name, ai_service.model,
+            input_hashes[section], jd_hash
+        )
+        for section in SECTIONS
+    }
+
+
+def original_section(profile: ResumeData, section: str) -> Any:
+    """Untailored content used when a section's agent fails"""
+    if section == "summary":
+        return profile.additionalInfo
+    return getattr(profile, section)
+
+
+def run_section(
+    ai_service: BaseAIService,
+    profile: ResumeData,
+    section: str,
+    job_description: str
+):
+    """Coroutine that tailors one section"""
+    method = getattr(ai_service, f"tailor_{section}")
+    return method(*section_inputs(profile, section), job_description)
+
+
+class SectionOutcome(BaseModel):
+    section: str
+    content: Any
+    status: str  # "tailored" | "reused" | "fallback" | "timeout"
+
+
+class TailoringResult(BaseModel):
+    tailored: TailoredResumeData
+    fingerprints: Dict[str, str]
+    reused_sections: List[str] = []
+    fallback_sections: List[str] = []
+    timed_out_sections: List[str] = []
+
+    def snapshot(self) -> TailoringSnapshot:
+        """Snapshot for the next incremental run; fallback/timed-out sections aren't reusable"""
+        not_reusable = set(self.fallback_sections) | set(self.timed_out_sections)
+        return TailoringSnapshot(
+            fingerprints={
+                section: fingerprint for section, fingerprint in self.fingerprints.items()
+                if section not in not_reusable
+            },
+            tailoredResume=self.tailored
+        )
+
+
+class TailoringService:
+    """Orchestrates section tailoring with reuse of unchanged sections"""
+
+    def __init__(self):
+        # Last tailoring result per user, for clients that don't send one back
+        self._snapshots: TTLCache[TailoringSnapshot] = TTLCache(
+            maxsize=settings.TAILORING_SNAPSHOT_MAX_ENTRIES,
+            ttl=settings.TAILORING_SNAPSHOT_TTL_SECONDS
+        )
+
+    def remember(self, user_id: str, result: TailoringResult) -> None:
+        self._snapshots.set(user_id, result.snapshot())
+
+    def previous_for(self, user_id: str, provided: Optional[TailoringSnapshot]) -> Optional[TailoringSnapshot]:
+        return provided if provided is not None else self._snapshots.get(user_id)
+
+    @staticmethod
+    def reusable_sections(
+        fingerprints: Dict[str, str],
+        previous: Optional[TailoringSnapshot]
+    ) -> Dict[str, Any]:
+        """Previous section outputs whose input fingerprint is unchanged"""
+        if previous is None:
+            return {}
+        return {
+            section: getattr(previous.tailoredResume, section)
+            for section in SECTIONS
+            if previous.fingerprints.get(section) == fingerprints[section]
+        }
+
+    @staticmethod
+    def assemble(profile: ResumeData, sections: Dict[str, Any]) -> TailoredResumeData:
+        return TailoredResumeData(
+            personalInfo=profile.personalInfo,
+            summary=sections["summary"],
+            coverLetter=profile.coverLetter,
+            skills=sections["skills"],
+            experience=sections["experience"],
+            education=sections["education"],
+            projects=sections["projects"],
+            certifications=profile.certifications
+        )
+
+    @staticmethod
+    async def run_tagged(
+        ai_service: BaseAIService,
+        profile: ResumeData,
+        section: str,
+        job_description: str,
+        deadline: Optional[Deadline]
+    ) -> SectionOutcome:
+        """
+        Run one section within its budget, falling back to the original
+        content on failure. Waits for a per-API-key provider slot first;
+        the section's budget starts once it has one.
+        """
+        try:
+            async with provider_limiter.slot(ai_service.api_key, deadline):
+                call = run_section(ai_service, profile, section, job_description)
+                if deadline is None:
+                    result = await call
+                else:
+                    result = await deadline.run(call, deadline.remaining() * SECTION_BUDGET_SHARE[section])
+        except asyncio.TimeoutError:
+            return SectionOutcome(section=section, content=original_section(profile, section), status="timeout")
+        except Exception:
+            result = None
+        expected_list = section in ("experience", "projects", "education")
+        if result is None or (expected_list and not isinstance(result, list)):
+            return SectionOutcome(section=section, content=original_section(profile, section), status="fallback")
+        return SectionOutcome(section=section, content=result, status="tailored")
+
+    async def iter_sections(
+        self,
+        ai_service: BaseAIService,
+        profile: ResumeData,
+        job_description: str,
+        fingerprints: Dict[str, str],
+        previous: Optional[TailoringSnapshot] = None,
+        deadline: Optional[Deadline] = None
+    ) -> AsyncIterator[SectionOutcome]:
+        """
+        Yield each section as soon as it is ready.
+
+        Reused sections come first, then tailored sections in completion
+        order. With a deadline, each section gets its share of the remaining
+        time and is cancelled (status "timeout") when it runs out. Closing
+        the iterator early cancels the sections still running.
+        """
+        reusable = self.reusable_sections(fingerprints, previous)
+        for section, content in reusable.items():
+            yield SectionOutcome(section=section, content=content, status="reused")
+
+        # PARALLEL PROCESSING: Tailor all changed sections simultaneously
+        tasks = [
+            asyncio.create_task(self.run_tagged(ai_service, profile, section, job_description, deadline))
+            for section in SECTIONS if section not in reusable
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def build_result(
+        self,
+        profile: ResumeData,
+        fingerprints: Dict[str, str],
+        outcomes: Dict[str, SectionOutcome]
+    ) -> TailoringResult:
+        return TailoringResult(
+            tailored=self.assemble(profile, {section: o.content for section, o in outcomes.items()}),
+            fingerprints=fingerprints,
+            reused_sections=[s for s in SECTIONS if outcomes[s].status == "reused"],
+            fallback_sections=[s for s in SECTIONS if outcomes[s].status == "fallback"],
+            timed_out_sections=[s for s in SECTIONS if outcomes[s].status == "timeout"]
+        )
+
+    async def tailor(
+        self,
+        ai_service: BaseAIService,
+        profile: ResumeData,
+        job_description: str,
+        previous: Optional[TailoringSnapshot] = None,
+        deadline: Optional[Deadline] = None
+    ) -> TailoringResult:
+        """
+        Tailor all sections, re-running only those whose inputs changed.
+
+        Sections that raise or exceed their budget fall back to the
+        original profile content.
+        """
+        fingerprints = section_fingerprints(ai_service, profile, job_description)
+        outcomes = {
+            outcome.section: outcome
+            async for outcome in self.iter_sections(
+                ai_service, profile, job_description, fingerprints, previous, deadline
+            )
+        }
+        return self.build_result(profile, fingerprints, outcomes)
+
+
+tailoring_service = TailoringService()
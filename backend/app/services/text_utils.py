@@ -0,0 +1,46 @@
+"""
+Text utilities shared by the local (non-LLM) analysis services.
+
+The tokenizer is tuned for resumes and job descriptions: it lowercases,
+keeps technology names intact ("c++", "c#", "node.js", "ci/cd" is split
+into "ci" and "cd") and drops English stopwords.
+"""
+import re
+from typing import List, Tuple
+
+# A token starts and ends with a letter/digit (or +/# for "c++", "c#"),
+# and may contain dots in between ("node.js", "asp.net")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+# The same tokens, found in the original text to keep their positions
+_TOKEN_SPAN_RE = re.compile(_TOKEN_RE.pattern, re.IGNORECASE)
+
+# Single-character tokens that are meaningful on their own
+_SINGLE_CHAR_TERMS = frozenset({"c", "r"})
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before
+being below between both but by can could did do does doing down during each etc few for
+from further had has have having he her here hers herself him himself his how i if in into
+is it its itself just let me more most my myself no nor not now of off on once only or other
+our ours ourselves out over own per same she should so some such than that the their theirs
+them themselves then there these they this those through to too under until up upon us very
+via was we were what when where which while who whom why will with within without would you
+your yours yourself yourselves
+""".split())
+
+
+def _is_term(token: str) -> bool:
+    return token not in STOPWORDS and (len(token) > 1 or token in _SINGLE_CHAR_TERMS)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of `text`, in order, without stopwords"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if _is_term(token)]
+
+
+def token_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) in `text` of each term of tokenize(text)"""
+    return [
+        match.span() for match in _TOKEN_SPAN_RE.finditer(text)
+        if _is_term(match.group().lower())
+    ]
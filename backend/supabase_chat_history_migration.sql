@@ -0,0 +1,27 @@
+-- Chat history for the in-app assistant (see app/services/chat_history.py)
+-- Run in the Supabase SQL editor.
+
+CREATE TABLE IF NOT EXISTS chat_history (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    user_id UUID NOT NULL,
+    session_id UUID NOT NULL,
+    page_context TEXT NOT NULL,
+    role TEXT NOT NULL CHECK (role IN ('user', 'assistant')),
+    content TEXT NOT NULL,
+    context_snapshot JSONB,
+    -- Set by the backend when the message happens, not when its batch is written
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Serves history pages: rows of one session in (created_at, id) order,
+-- resumed from a cursor (keyset pagination, no OFFSET scan). id breaks
+-- ties between messages with the same timestamp.
+CREATE INDEX IF NOT EXISTS idx_chat_history_session_created
+    ON chat_history (session_id, created_at, id);
+
+-- The backend uses the service key; clients never query the table directly
+ALTER TABLE chat_history ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can read their own chat history"
+    ON chat_history FOR SELECT
+    USING (auth.uid() = user_id);
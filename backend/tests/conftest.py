@@ -0,0 +1,21 @@
+"""
+Shared test setup.
+
+Settings are read from the environment when app.core.config is imported,
+so placeholder values are set here first. No test talks to Supabase or an
+AI provider.
+"""
+import os
+
+import pytest
+
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+os.environ.setdefault("SUPABASE_ANON_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.test")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.test")
+os.environ.setdefault("SUPABASE_JWT_SECRET", "test-secret")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
@@ -0,0 +1,73 @@
+import pytest
+
+from app.models.resume import Education, Experience, PersonalInfo, ResumeData, Skills, TailoredResumeData
+from app.services.accuracy_verifier import accuracy_verifier
+
+PERSONAL = PersonalInfo(fullName="Ada Lovelace", email="ada@example.com", phone="", location="", linkedin="", github="")
+
+
+def original_resume() -> ResumeData:
+    return ResumeData(
+        personalInfo=PERSONAL,
+        skills=Skills(languages=["Python", "Go"], databases=["PostgreSQL"]),
+        experience=[Experience(
+            id="exp-1", company="Acme Corp", role="Senior Backend Engineer", location="Berlin",
+            startDate="Jan 2019", endDate="Present",
+            description=["Cut API latency by 40% for 1,200 customers", "Built billing services in Python"]
+        )],
+        education=[Education(
+            id="edu-1", institution="TU Berlin", degree="B.S. Computer Science", location="Berlin",
+            graduationDate="Jun 2018"
+        )]
+    )
+
+
+def tailor(**changes) -> TailoredResumeData:
+    original = original_resume()
+    experience = original.experience[0].model_copy(update=changes.pop("experience", {}))
+    education = original.education[0].model_copy(update=changes.pop("education", {}))
+    return TailoredResumeData(
+        personalInfo=PERSONAL,
+        summary=changes.pop("summary", "Backend engineer"),
+        skills=changes.pop("skills", original.skills),
+        experience=[experience],
+        education=[education],
+        **changes
+    )
+
+
+def issues(tailored: TailoredResumeData):
+    report = accuracy_verifier.verify(original_resume(), tailored)
+    assert report.verified == (not report.issues)
+    return [(issue.category, issue.value) for issue in report.issues]
+
+
+@pytest.mark.parametrize("changes", [
+    {"education": {"degree": "Bachelor of Science in Computer Science"}},
+    {"education": {"degree": "BSc Computer Science"}},
+    {"education": {"degree": "Computer Science"}},
+    {"experience": {"startDate": "01/2019"}},
+    {"experience": {"startDate": "2019-01"}},
+    {"experience": {"startDate": "January 2019"}},
+    {"education": {"graduationDate": "06/2018"}},
+    {"experience": {"role": "Backend Engineer"}},
+    {"summary": "Engineer who cut API latency by 40 percent, mostly in Go"},
+])
+def test_rewording_is_accepted(changes):
+    assert issues(tailor(**changes)) == []
+
+
+@pytest.mark.parametrize("changes, expected", [
+    ({"education": {"degree": "Master of Science in Computer Science"}},
+     ("degree", "Master of Science in Computer Science")),
+    ({"education": {"degree": "B.S. Computer Engineering"}}, ("degree", "B.S. Computer Engineering")),
+    ({"experience": {"startDate": "03/2019"}}, ("date", "03/2019")),
+    ({"experience": {"startDate": "Jan 2018"}}, ("date", "Jan 2018")),
+    ({"experience": {"role": "Staff Backend Engineer"}}, ("role", "Staff Backend Engineer")),
+    ({"experience": {"company": "Google"}}, ("organization", "Google")),
+    ({"summary": "Cut API latency by 60%"}, ("number", "60%")),
+    ({"summary": "Ran Kubernetes clusters"}, ("technology", "Kubernetes")),
+    ({"summary": "Holds a PhD"}, ("degree", "PhD")),
+])
+def test_fabrications_are_flagged(changes, expected):
+    assert issues(tailor(**changes)) == [expected]
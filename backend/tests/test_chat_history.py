@@ -0,0 +1,76 @@
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.chat_history import ChatHistoryService, InvalidCursorError, decode_cursor, encode_cursor
+from app.services.supabase_service import supabase_service
+from tests.test_supabase_concurrency import StubSupabase
+
+
+class RecordingPostgrest:
+    """Records inserted rows; selects return no rows"""
+
+    def __init__(self):
+        self.inserted = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            self.inserted.append(json.loads(request.content))
+            return httpx.Response(201, json=[])
+        return httpx.Response(200, json=[])
+
+
+@pytest.fixture
+async def postgrest():
+    handler = RecordingPostgrest()
+    stub = StubSupabase(handler)
+    previous, supabase_service._async_client = supabase_service._async_client, stub
+    yield handler
+    supabase_service._async_client = previous
+    await stub.postgrest.session.aclose()
+
+
+@pytest.mark.anyio
+async def test_reading_a_page_writes_only_that_sessions_messages(postgrest):
+    history = ChatHistoryService()
+    mine, other = uuid4(), uuid4()
+    history.record("user-1", mine, "ai_build", "user", "hello")
+    history.record("user-2", other, "ai_build", "user", "not yet")
+    history.record("user-1", mine, "ai_build", "assistant", "hi")
+
+    page = await history.get_page("user-1", mine, limit=20)
+
+    assert page.messages == []
+    assert [[row["content"] for row in batch] for batch in postgrest.inserted] == [["hello", "hi"]]
+    assert history.stats()["buffered"] == 1
+
+    await history.flush()
+
+    assert [row["content"] for row in postgrest.inserted[-1]] == ["not yet"]
+    assert history.stats()["buffered"] == 0
+
+
+@pytest.mark.anyio
+async def test_flush_writes_in_batches(postgrest, monkeypatch):
+    monkeypatch.setattr(settings, "CHAT_HISTORY_BATCH_SIZE", 2)
+    history = ChatHistoryService()
+    session = uuid4()
+    for position in range(5):
+        history.record("user-1", session, "ai_build", "user", f"message {position}")
+
+    await history.flush()
+
+    assert [len(batch) for batch in postgrest.inserted] == [2, 2, 1]
+    assert history.stats()["written"] == 5
+
+
+def test_cursor_round_trip_and_rejects_foreign_cursors():
+    message_id = str(uuid4())
+    created_at = "2026-01-02T03:04:05.123456+00:00"
+
+    assert decode_cursor(encode_cursor(created_at, message_id)) == (created_at, message_id)
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("bm90LWEtY3Vyc29y")
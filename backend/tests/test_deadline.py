@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from app.core.deadline import Deadline, remaining_time
+
+
+@pytest.mark.anyio
+async def test_the_deadline_is_visible_inside_the_call():
+    async def call():
+        return remaining_time()
+
+    left = await Deadline(5).run(call())
+    assert 0 < left <= 5
+
+
+@pytest.mark.anyio
+async def test_the_deadline_does_not_leak_into_the_caller():
+    async def call():
+        return "ok"
+
+    assert await Deadline(5).run(call()) == "ok"
+    assert remaining_time() is None
+
+
+@pytest.mark.anyio
+async def test_a_call_past_its_budget_times_out():
+    with pytest.raises(asyncio.TimeoutError):
+        await Deadline(5).run(asyncio.sleep(1), budget=0.01)
@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.jd_compactor import compact_job_description
+
+
+@pytest.mark.parametrize("sentence", [
+    "Work on computer vision models for retail analytics.",
+    "Design our equity trading platform.",
+    "Ship features in our wellness app.",
+    "Build accessible UIs for people with disabilities.",
+    "Partner with our dental clinics to digitize patient records.",
+])
+def test_content_that_mentions_benefit_words_is_kept(sentence):
+    compact, compaction = compact_job_description(f"Backend Engineer\n{sentence}")
+
+    assert sentence in compact
+    assert compaction.removedSentences == {}
+
+
+@pytest.mark.parametrize("sentence, category", [
+    ("We offer medical, dental and vision insurance.", "benefits"),
+    ("Every hire gets a generous equity package.", "benefits"),
+    ("Enjoy a monthly wellness stipend.", "benefits"),
+    ("Acme is an equal opportunity employer.", "eeo"),
+    ("We consider all applicants regardless of disability status.", "eeo"),
+])
+def test_boilerplate_sentences_are_removed(sentence, category):
+    compact, compaction = compact_job_description(f"Build APIs in Python.\n{sentence}")
+
+    assert compact == "Build APIs in Python."
+    assert compaction.removedSentences == {category: 1}
+
+
+@pytest.mark.parametrize("heading", ["About you", "About the role", "About You:"])
+def test_content_headings_keep_their_section(heading):
+    jd = f"About us\nWe sell shoes online.\n\n{heading}\n5+ years of Python.\nYou ship fast."
+
+    compact, _ = compact_job_description(jd)
+
+    assert "We sell shoes online." not in compact
+    assert "5+ years of Python." in compact
+    assert "You ship fast." in compact
+
+
+def test_boilerplate_section_runs_until_a_content_heading():
+    jd = (
+        "Benefits:\n- Unlimited PTO\n- Learn Go with the team\n"
+        "Requirements:\n- Go and PostgreSQL\n"
+    )
+
+    compact, compaction = compact_job_description(jd)
+
+    assert compact == "Requirements:\n- Go and PostgreSQL"
+    assert compaction.removedSentences == {"section": 3}
+    assert compaction.compactTokens < compaction.originalTokens
+
+
+def test_paragraph_breaks_are_kept_once():
+    compact, _ = compact_job_description("Build APIs.\n\n\n\nRun Kubernetes.\n\n")
+
+    assert compact == "Build APIs.\n\nRun Kubernetes."
+
+
+def test_never_returns_an_empty_jd():
+    jd = "We offer great benefits and perks."
+
+    compact, compaction = compact_job_description(jd)
+
+    assert compact == jd
+    assert compaction.removedSentences == {}
@@ -0,0 +1,78 @@
+from app.services.job_description import ParsedJobDescription
+from app.services.skill_taxonomy import skill_taxonomy
+
+
+def skill_names(skill_ids):
+    return {skill_taxonomy.name(skill_id) for skill_id in skill_ids}
+
+
+def test_bullets_take_the_category_of_their_heading():
+    parsed = ParsedJobDescription(
+        "Requirements:\n- Python\n- Kubernetes\nNice to have:\n- Terraform\n- Ansible"
+    )
+
+    assert parsed.required_skills == ["python", "kubernetes"]
+    assert skill_names(parsed.required_skill_ids) == {"Python", "Kubernetes"}
+    assert parsed.preferred_skills == ["terraform", "ansible"]
+    assert skill_names(parsed.preferred_skill_ids) == {"Terraform", "Ansible"}
+
+
+def test_inline_heading_classifies_the_rest_of_its_line():
+    parsed = ParsedJobDescription("Nice to have: Go, Terraform.")
+
+    assert parsed.required_skills == []
+    assert parsed.preferred_skills == ["go", "terraform"]
+
+
+def test_blank_line_ends_a_section():
+    parsed = ParsedJobDescription(
+        "Requirements\n- Python\n- Kafka is a plus\n\nWe run Kubernetes in production.\n\n"
+        "Bonus points\n- Experience with Terraform"
+    )
+
+    assert parsed.required_skills == ["python"]
+    assert parsed.preferred_skills == ["kafka", "terraform"]
+    assert "Kubernetes" in skill_names(parsed.skill_ids)
+    assert "Kubernetes" not in skill_names(parsed.required_skill_ids | parsed.preferred_skill_ids)
+
+
+def test_cue_words_are_not_skills():
+    parsed = ParsedJobDescription("Bonus points:\n- Nice to have Rust\n- Ideally Terraform, a big plus")
+
+    assert parsed.preferred_skills == ["rust", "terraform"]
+
+
+def test_seniority_and_years():
+    parsed = ParsedJobDescription("Senior Backend Engineer\nRequirements:\n- 5+ years of Python")
+
+    assert parsed.seniority_level == "senior"
+    assert parsed.min_years == 5
+    assert "senior" not in parsed.required_skills
+
+
+def test_seniority_comes_from_the_title_and_role_nouns():
+    parsed = ParsedJobDescription(
+        "Software Engineer (mid-level)\n"
+        "You will report to the VP of Engineering and lead code reviews.\n\n"
+        "Requirements:\n- 5+ years of Python\n- 1 year with Docker"
+    )
+
+    assert parsed.seniority_level == "mid"
+    assert parsed.min_years == 5
+    assert "Seniority: mid, 5+ years" in parsed.prompt_summary()
+
+
+def test_level_word_before_a_role_noun_counts_in_the_body():
+    parsed = ParsedJobDescription(
+        "We are hiring a Senior Backend Engineer to help our staff engineers ship faster."
+    )
+
+    assert parsed.seniority_terms == ["senior"]
+
+
+def test_years_prefer_the_requirements():
+    parsed = ParsedJobDescription(
+        "Our team has shipped for 12 years.\n\nRequirements:\n- 3+ years of Go\n\nNice to have:\n- 6 years of Rust"
+    )
+
+    assert parsed.min_years == 3
@@ -0,0 +1,77 @@
+import pytest
+
+from app.core.json_patch import JSONPatchError, apply_patch
+
+
+def document():
+    return {"profile": {"name": "Ada", "skills": ["Python", "Go"]}, "jd": "Backend", "a/b": 1, "m~n": 2}
+
+
+@pytest.mark.parametrize("patch, expected", [
+    ([{"op": "add", "path": "/profile/skills/1", "value": "Rust"}], ["Python", "Rust", "Go"]),
+    ([{"op": "add", "path": "/profile/skills/-", "value": "Rust"}], ["Python", "Go", "Rust"]),
+    ([{"op": "remove", "path": "/profile/skills/0"}], ["Go"]),
+    ([{"op": "replace", "path": "/profile/skills/1", "value": "Golang"}], ["Python", "Golang"]),
+    ([{"op": "move", "from": "/profile/skills/0", "path": "/profile/skills/-"}], ["Go", "Python"]),
+    ([{"op": "copy", "from": "/profile/skills/0", "path": "/profile/skills/0"}], ["Python", "Python", "Go"]),
+    ([{"op": "test", "path": "/profile/skills/0", "value": "Python"}], ["Python", "Go"]),
+])
+def test_operations(patch, expected):
+    assert apply_patch(document(), patch)["profile"]["skills"] == expected
+
+
+def test_escaped_pointer_tokens():
+    patched = apply_patch(document(), [
+        {"op": "replace", "path": "/a~1b", "value": 10},
+        {"op": "remove", "path": "/m~0n"},
+    ])
+
+    assert patched["a/b"] == 10
+    assert "m~n" not in patched
+
+
+def test_input_is_not_modified_and_untouched_parts_are_shared():
+    original = document()
+
+    patched = apply_patch(original, [{"op": "replace", "path": "/profile/name", "value": "Grace"}])
+
+    assert original["profile"]["name"] == "Ada"
+    assert patched["profile"]["name"] == "Grace"
+    assert patched["profile"]["skills"] is original["profile"]["skills"]
+
+
+def test_whole_document_replace():
+    assert apply_patch(document(), [{"op": "replace", "path": "", "value": [1]}]) == [1]
+
+
+@pytest.mark.parametrize("patch", [
+    {"op": "add", "path": "/jd", "value": 1},
+    [{"op": "add", "path": "jd", "value": 1}],
+    [{"op": "add", "path": "/jd"}],
+    [{"op": "move", "path": "/jd"}],
+    [{"op": "remove", "path": "/missing"}],
+    [{"op": "replace", "path": "/profile/skills/2", "value": "Rust"}],
+    [{"op": "add", "path": "/profile/skills/01", "value": "Rust"}],
+    [{"op": "add", "path": "/jd/child", "value": 1}],
+    [{"op": "move", "from": "/profile", "path": "/profile/copy"}],
+    [{"op": "test", "path": "/jd", "value": "Frontend"}],
+    [{"op": "remove", "path": ""}],
+    [{"op": "rename", "path": "/jd"}],
+])
+def test_invalid_patches_raise(patch):
+    original = document()
+
+    with pytest.raises(JSONPatchError):
+        apply_patch(original, patch)
+    assert original == document()
+
+
+def test_failing_operation_leaves_earlier_operations_unapplied():
+    original = document()
+
+    with pytest.raises(JSONPatchError):
+        apply_patch(original, [
+            {"op": "replace", "path": "/jd", "value": "Frontend"},
+            {"op": "test", "path": "/jd", "value": "Backend"},
+        ])
+    assert original["jd"] == "Backend"
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from app.core import jwt_verifier as jwt_verifier_module
+from app.core.jwt_verifier import JWKSCache, JWTVerifier
+
+SECRET = "test-secret"
+
+
+def claims(**extra):
+    return {"sub": "user-1", "aud": "authenticated", "exp": int(time.time()) + 60, **extra}
+
+
+@pytest.fixture
+def signing_key():
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    jwk = jwt.algorithms.ECAlgorithm.to_jwk(private_key.public_key(), as_dict=True)
+    return private_key, {**jwk, "kid": "key-1", "alg": "ES256"}
+
+
+class SlowJWKS:
+    """Stands in for httpx.get: the JWKS endpoint answers after `delay` seconds"""
+
+    def __init__(self, keys, delay=0.0, fail=False):
+        self.keys = keys
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.served = threading.Event()
+
+    def __call__(self, url, timeout):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError("connection refused")
+        self.served.set()
+        return _Response({"keys": self.keys})
+
+
+class _Response:
+    def __init__(self, body):
+        self.body = body
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+
+def test_hs256_never_fetches_jwks(monkeypatch):
+    fetch = SlowJWKS([], fail=True)
+    monkeypatch.setattr(jwt_verifier_module.httpx, "get", fetch)
+    verifier = JWTVerifier(SECRET, JWKSCache("http://jwks.test", refresh_interval=600))
+
+    token = jwt.encode(claims(), SECRET, algorithm="HS256")
+
+    assert verifier.verify(token)["sub"] == "user-1"
+    assert fetch.calls == 0
+
+
+def test_unloaded_jwks_fails_fast_and_refreshes_in_background(monkeypatch, signing_key):
+    private_key, public_jwk = signing_key
+    fetch = SlowJWKS([public_jwk], delay=0.5)
+    monkeypatch.setattr(jwt_verifier_module.httpx, "get", fetch)
+    # min_refresh_interval=0 so the test doesn't wait for the rate limit
+    verifier = JWTVerifier(SECRET, JWKSCache("http://jwks.test", refresh_interval=600, min_refresh_interval=0))
+    token = jwt.encode(claims(), private_key, algorithm="ES256", headers={"kid": "key-1"})
+
+    started = time.perf_counter()
+    with pytest.raises(jwt.InvalidTokenError):
+        verifier.verify(token)
+    # Rejected without waiting on the (slow) JWKS endpoint
+    assert time.perf_counter() - started < 0.1
+
+    assert fetch.served.wait(2)
+    for _ in range(100):
+        if verifier.jwks._fetched_at:
+            break
+        time.sleep(0.01)
+    assert verifier.verify(token)["sub"] == "user-1"
+
+
+def test_asymmetric_token_rejected_without_signature_match(monkeypatch, signing_key):
+    _, public_jwk = signing_key
+    monkeypatch.setattr(jwt_verifier_module.httpx, "get", SlowJWKS([public_jwk]))
+    cache = JWKSCache("http://jwks.test", refresh_interval=600)
+    cache.refresh()
+    verifier = JWTVerifier(SECRET, cache)
+    other_key = ec.generate_private_key(ec.SECP256R1())
+    forged = jwt.encode(claims(), other_key, algorithm="ES256", headers={"kid": "key-1"})
+
+    with pytest.raises(jwt.InvalidSignatureError):
+        verifier.verify(forged)
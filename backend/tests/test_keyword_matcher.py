@@ -0,0 +1,52 @@
+from app.services.keyword_matcher import KeywordMatcher, extract_keywords
+
+JD = """We are a fast growing fintech startup. You will design, build and maintain services in Python.
+You will collaborate with product managers and mentor engineers. Experience with Kafka and gRPC required.
+Our Data Platform team runs Kafka at scale."""
+
+
+def test_generic_prose_is_not_a_keyword():
+    keywords = {" ".join(keyword) for keyword in extract_keywords(JD)}
+
+    for word in ("growing", "design", "build", "maintain", "collaborate", "mentor", "managers", "services"):
+        assert word not in keywords
+
+
+def test_skills_capitalized_terms_and_phrases_are_keywords():
+    keywords = {" ".join(keyword) for keyword in extract_keywords(JD)}
+
+    assert {"python", "kafka", "grpc", "data platform"} <= keywords
+
+
+def test_repeated_terms_are_keywords():
+    keywords = extract_keywords("Own the billing pipeline. Keep the billing ledger consistent.")
+
+    assert ("billing",) in keywords
+    assert ("ledger",) not in keywords
+
+
+def test_matcher_reports_missing_keywords_in_jd_order():
+    matcher = KeywordMatcher(extract_keywords(JD))
+
+    matched, missing = matcher.match("Built Kafka consumers in Python")
+
+    assert matched == ["python", "kafka"]
+    assert "grpc" in missing
+    assert "data platform" in missing
+
+
+def test_aliases_match_canonical_keywords():
+    matcher = KeywordMatcher(extract_keywords("Experience with Kubernetes and PostgreSQL required."))
+
+    matched, missing = matcher.match("Ran k8s clusters backed by Postgres")
+
+    assert missing == []
+    assert set(matched) == {"kubernetes", "postgresql"}
+
+
+def test_phrases_do_not_cross_sentence_punctuation():
+    keywords = extract_keywords("Experience with Python. Java preferred. Strong AWS. Kafka skills")
+
+    assert ("python", "java") not in keywords
+    assert ("aws", "kafka") not in keywords
+    assert all(len(keyword) == 1 for keyword in keywords)
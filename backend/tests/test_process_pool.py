@@ -0,0 +1,76 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from app.core.config import settings
+from app.core.process_pool import CPUPool
+
+
+def echo(payload: bytes) -> bytes:
+    return payload
+
+
+def thread_name(payload: bytes) -> str:
+    return threading.current_thread().name
+
+
+def crash_in_worker(payload: bytes) -> bytes:
+    """Kills the worker process it runs in; returns normally in the app process"""
+    if multiprocessing.parent_process() is not None:
+        os._exit(1)
+    return payload
+
+
+@pytest.fixture
+async def pool(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_ENABLED", True)
+    monkeypatch.setattr(settings, "CPU_POOL_WORKERS", 2)
+    monkeypatch.setattr(settings, "CPU_POOL_INLINE_MAX_BYTES", 0)
+    pool = CPUPool()
+    await pool.start()
+    yield pool
+    await pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_small_payloads_run_inline(pool, monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_INLINE_MAX_BYTES", 1024)
+
+    assert await pool.run(echo, b"small") == b"small"
+    assert pool.stats()["inline"] == 1
+    assert pool.stats()["offloaded"] == 0
+
+
+@pytest.mark.anyio
+async def test_tasks_can_opt_out_of_inlining(pool, monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_INLINE_MAX_BYTES", 1024)
+
+    assert await pool.run(echo, b"small", inline=False) == b"small"
+    assert pool.stats()["inline"] == 0
+    assert pool.stats()["offloaded"] == 1
+
+
+@pytest.mark.anyio
+async def test_without_a_pool_tasks_run_in_a_thread(monkeypatch):
+    monkeypatch.setattr(settings, "CPU_POOL_INLINE_MAX_BYTES", 0)
+    pool = CPUPool()  # Not started
+
+    assert await pool.run(thread_name, b"payload") != threading.current_thread().name
+    assert pool.stats()["threaded"] == 1
+
+
+@pytest.mark.anyio
+async def test_broken_pool_is_replaced_once_for_concurrent_callers(pool):
+    broken = pool._executor
+
+    results = await asyncio.gather(*(pool.run(crash_in_worker, b"%d" % i) for i in range(4)))
+
+    assert results == [b"0", b"1", b"2", b"3"]
+    assert pool.restarts == 1
+    assert pool._executor is not broken
+    assert broken._shutdown_thread
+    # The replacement pool serves new work
+    assert await pool.run(echo, b"payload") == b"payload"
@@ -0,0 +1,66 @@
+import time
+
+from app.services import resume_diff
+from app.services.resume_diff import align_bullets, word_diff
+
+
+def edits(before, after):
+    return [(edit.op, edit.text) for edit in word_diff(before, after)]
+
+
+def test_word_diff_merges_runs_of_one_op():
+    assert edits("Built REST APIs in Flask", "Built scalable REST APIs in FastAPI") == [
+        ("equal", "Built"),
+        ("insert", "scalable"),
+        ("equal", "REST APIs in"),
+        ("delete", "Flask"),
+        ("insert", "FastAPI"),
+    ]
+
+
+def test_word_diff_of_equal_and_empty_texts():
+    assert edits("Same text", "Same text") == [("equal", "Same text")]
+    assert edits("", "New text") == [("insert", "New text")]
+    assert edits("Old text", "") == [("delete", "Old text")]
+
+
+def test_word_diff_is_minimal_and_reproduces_both_sides():
+    before = "a b c a b b a"
+    after = "c b a b a c"
+
+    result = word_diff(before, after)
+
+    kept_before = " ".join(edit.text for edit in result if edit.op != "insert")
+    kept_after = " ".join(edit.text for edit in result if edit.op != "delete")
+    assert kept_before == before
+    assert kept_after == after
+    # The example from Myers' paper: the shortest edit script has 5 edits
+    assert sum(len(edit.text.split()) for edit in result if edit.op != "equal") == 5
+
+
+def test_long_texts_are_one_replacement_and_fast():
+    before = " ".join(f"old{i}" for i in range(2000))
+    after = " ".join(f"new{i}" for i in range(1999))
+
+    started = time.perf_counter()
+    result = edits(f"Intro {before} end", f"Intro {after} end")
+
+    assert time.perf_counter() - started < 0.5
+    assert [op for op, _ in result] == ["equal", "delete", "insert", "equal"]
+
+
+def test_texts_at_the_cap_are_diffed():
+    half = resume_diff.MAX_DIFF_WORDS // 2
+    before = " ".join(f"old{i}" for i in range(half))
+    after = " ".join(f"new{i}" for i in range(half))
+
+    assert [op for op, _ in edits(f"{before} keep", f"{after} keep")] == ["delete", "insert", "equal"]
+
+
+def test_align_bullets_pairs_exact_then_similar_text():
+    before = ["Led a team of 5 engineers", "Wrote unit tests", "Managed the AWS budget"]
+    after = ["Wrote unit tests", "Led a team of five engineers", "Presented at PyCon"]
+
+    pairs = sorted(align_bullets(before, after), key=lambda pair: (pair[0] is None, pair))
+
+    assert pairs == [(0, 1), (1, 0), (2, None), (None, 2)]
@@ -0,0 +1,48 @@
+import pytest
+
+from app.services.skill_taxonomy import skill_taxonomy
+
+
+def skill_names(text):
+    return {skill_taxonomy.name(skill_id) for skill_id in skill_taxonomy.skill_ids(text)}
+
+
+def test_aliases_map_to_canonical_skills():
+    assert skill_taxonomy.canonical_tokens("Ran k8s and Postgres") == ["ran", "kubernetes", "postgresql"]
+
+
+@pytest.mark.parametrize("text", [
+    "Go beyond what customers expect.",
+    "Swift delivery of features.",
+    "Spring 2025 internship",
+    "Each node in the graph",
+    "Improve security and monitoring of our shell",
+    "Write ts and py files",
+    "Knit with yarn",
+    "Ask the oracle about lambda calculus",
+    "Grow our R&D team",
+    "Present to C-level executives",
+])
+def test_ambiguous_names_in_prose_are_not_skills(text):
+    assert skill_names(text) == set()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("We build services in Go and Rust.", {"Go", "Rust"}),
+    ("Languages: Python, go, rust", {"Python", "Go", "Rust"}),
+    ("- Go", {"Go"}),
+    ("Golang", {"Go"}),
+    ("Native apps in Swift and Kotlin.", {"Swift", "Kotlin"}),
+    ("Spring Boot services", {"Spring"}),
+    ("Statistics in R and Python", {"R", "Python"}),
+    ("TS/JS", {"TypeScript", "JavaScript"}),
+    ("Security, monitoring", {"Security", "Observability"}),
+    ("Built on AWS Lambda", {"AWS Lambda"}),
+])
+def test_ambiguous_names_in_skill_context_are_skills(text, expected):
+    assert expected <= skill_names(text)
+
+
+def test_unmatched_ambiguous_alias_keeps_its_token():
+    assert skill_taxonomy.canonical_tokens("Go beyond") == ["go", "beyond"]
+    assert skill_taxonomy.canonical_tokens("TS, Python") == ["typescript", "python"]
@@ -0,0 +1,104 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.core.config import settings
+from app.core.sse import HEARTBEAT, event_stream
+
+
+async def collect(events):
+    return [frame async for frame in event_stream(events)]
+
+
+def payloads(frames):
+    return [
+        orjson.loads(line[len(b"data: "):])
+        for frame in frames for line in frame.split(b"\n") if line.startswith(b"data: ")
+    ]
+
+
+async def source(*items, delay=0.0):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        yield item
+
+
+@pytest.fixture(autouse=True)
+def sse_settings(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_COALESCE_MS", 50)
+    monkeypatch.setattr(settings, "SSE_COALESCE_BYTES", 1024)
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SECONDS", 15)
+    monkeypatch.setattr(settings, "SSE_RETRY_MS", 3000)
+
+
+@pytest.mark.anyio
+async def test_chunks_are_coalesced_and_flushed_before_other_events():
+    frames = await collect(source(
+        {"type": "chunk", "content": "Hel"},
+        {"type": "chunk", "content": 'lo "world"\n'},
+        {"type": "done", "tokens": 3},
+    ))
+
+    assert payloads(frames) == [
+        {"type": "chunk", "content": 'Hello "world"\n'},
+        {"type": "done", "tokens": 3},
+    ]
+
+
+@pytest.mark.anyio
+async def test_frames_are_numbered_and_the_first_sets_retry():
+    frames = await collect(source({"type": "start"}, {"type": "done"}))
+
+    assert frames[0].startswith(b"id: 1\nretry: 3000\ndata: ")
+    assert frames[1].startswith(b"id: 2\ndata: ")
+    assert all(frame.endswith(b"\n\n") and frame.count(b"data: ") == 1 for frame in frames)
+
+
+@pytest.mark.anyio
+async def test_buffer_is_flushed_at_the_byte_limit(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_COALESCE_BYTES", 4)
+
+    frames = await collect(source(*({"type": "chunk", "content": "ab"} for _ in range(4))))
+
+    assert payloads(frames) == [{"type": "chunk", "content": "abab"}] * 2
+
+
+@pytest.mark.anyio
+async def test_buffer_is_flushed_after_the_coalescing_window(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_COALESCE_MS", 10)
+
+    frames = await collect(source({"type": "chunk", "content": "a"}, {"type": "chunk", "content": "b"}, delay=0.05))
+
+    assert payloads(frames) == [{"type": "chunk", "content": "a"}, {"type": "chunk", "content": "b"}]
+
+
+@pytest.mark.anyio
+async def test_heartbeat_while_the_source_is_idle(monkeypatch):
+    monkeypatch.setattr(settings, "SSE_HEARTBEAT_SECONDS", 0.02)
+
+    frames = await collect(source({"type": "done"}, delay=0.07))
+
+    assert frames[:2] == [HEARTBEAT, HEARTBEAT]
+    assert payloads(frames) == [{"type": "done"}]
+
+
+@pytest.mark.anyio
+async def test_closing_the_stream_cancels_the_source():
+    cleaned_up = asyncio.Event()
+
+    async def endless():
+        try:
+            while True:
+                yield {"type": "status"}
+                await asyncio.sleep(10)
+        finally:
+            cleaned_up.set()
+
+    stream = event_stream(endless())
+    assert payloads([await stream.__anext__()]) == [{"type": "status"}]
+
+    await stream.aclose()
+
+    assert cleaned_up.is_set()
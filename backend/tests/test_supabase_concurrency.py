@@ -0,0 +1,82 @@
+"""
+The data layer must not block the event loop: a slow PostgREST query
+should only delay its own request.
+
+PostgREST is stubbed at the HTTP transport (httpx.MockTransport) under a
+real postgrest async client, so the test exercises the same request path
+as production, minus the network.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from app.services.ai_settings_service import AISettingsService
+from app.services.supabase_service import supabase_service
+
+QUERY_SECONDS = 0.5
+TICK_SECONDS = 0.01
+
+
+class StubSupabase:
+    """Just the part of supabase.AsyncClient the services use"""
+
+    def __init__(self, handler):
+        self.postgrest = AsyncPostgrestClient("http://supabase.test/rest/v1")
+        self.postgrest.session = httpx.AsyncClient(
+            base_url="http://supabase.test/rest/v1",
+            transport=httpx.MockTransport(handler)
+        )
+
+    def table(self, name: str):
+        return self.postgrest.from_(name)
+
+
+async def slow_postgrest(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(QUERY_SECONDS)
+    return httpx.Response(200, json=[])
+
+
+@pytest.fixture
+async def stub_supabase():
+    stub = StubSupabase(slow_postgrest)
+    previous, supabase_service._async_client = supabase_service._async_client, stub
+    yield stub
+    supabase_service._async_client = previous
+    await stub.postgrest.session.aclose()
+
+
+async def measure_loop_lag(stop: asyncio.Event) -> float:
+    """Largest delay of a TICK_SECONDS ticker until `stop` is set"""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        worst = max(worst, time.perf_counter() - started - TICK_SECONDS)
+    return worst
+
+
+@pytest.mark.anyio
+async def test_slow_queries_do_not_block_the_event_loop(stub_supabase):
+    settings_service = AISettingsService()
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(measure_loop_lag(stop))
+
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        supabase_service.get_profile("user-1"),
+        supabase_service.get_profile("user-2"),
+        supabase_service.delete_profile("user-3"),
+        settings_service.get_user_settings("user-4"),
+    )
+    elapsed = time.perf_counter() - started
+    stop.set()
+    worst_lag = await ticker
+
+    assert results == [None, None, True, None]
+    # The four queries overlap instead of running one after another...
+    assert elapsed < 2 * QUERY_SECONDS
+    # ...and the loop keeps serving other work while they wait
+    assert worst_lag < 0.1